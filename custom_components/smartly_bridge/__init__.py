@@ -6,8 +6,16 @@ import logging
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from .audit import log_integration_event
-from .const import CONF_CLIENT_ID, CONF_INSTANCE_ID, DOMAIN, RATE_LIMIT, RATE_WINDOW
+from .acl import clear_entity_allowed_cache
+from .audit import AuditLogWriter, log_integration_event, set_audit_writer
+from .const import (
+    CONF_CLIENT_ID,
+    CONF_INSTANCE_ID,
+    DOMAIN,
+    EVENT_RECORDER_HOURLY_STATISTICS_GENERATED,
+    RATE_LIMIT,
+    RATE_WINDOW,
+)
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -91,6 +99,39 @@ def _build_runtime_adapters(
     }
 
 
+def _async_track_entity_registry_updates(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Clear the entity ACL and history metadata caches on entity registry updates."""
+    from homeassistant.core import callback
+    from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
+
+    from .application.history import clear_history_metadata_cache
+
+    @callback
+    def _entity_registry_updated(event: Any) -> None:
+        clear_entity_allowed_cache()
+        clear_history_metadata_cache()
+
+    entry.async_on_unload(
+        hass.bus.async_listen(EVENT_ENTITY_REGISTRY_UPDATED, _entity_registry_updated)
+    )
+
+
+def _async_track_statistics_updates(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Clear cached recorder statistics when the recorder compiles a new hour."""
+    from homeassistant.core import callback
+
+    @callback
+    def _statistics_generated(event: Any) -> None:
+        runtime_adapters = hass.data.get(DOMAIN, {}).get("runtime_adapters", {})
+        history_gateway = runtime_adapters.get("history_gateway")
+        if history_gateway is not None:
+            history_gateway.clear_statistics_cache()
+
+    entry.async_on_unload(
+        hass.bus.async_listen(EVENT_RECORDER_HOURLY_STATISTICS_GENERATED, _statistics_generated)
+    )
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Platform Bridge from a config entry."""
     from .auth import NonceCache, RateLimiter
@@ -107,6 +148,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     nonce_cache = NonceCache()
     await nonce_cache.start()
 
+    # Create audit log writer
+    audit_writer = AuditLogWriter()
+    await audit_writer.start()
+    set_audit_writer(audit_writer)
+
     # Create rate limiter
     rate_limiter = RateLimiter(max_requests=RATE_LIMIT, window_seconds=RATE_WINDOW)
 
@@ -133,6 +179,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         {
             "config_entry": entry,
             "nonce_cache": nonce_cache,
+            "audit_writer": audit_writer,
             "rate_limiter": rate_limiter,
             "push_manager": push_manager,
             "camera_manager": camera_manager,
@@ -153,6 +200,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Register update listener for config entry changes
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
+    # Drop cached entity ACL results whenever labels or entities change
+    _async_track_entity_registry_updates(hass, entry)
+
+    # Serve newly compiled statistics instead of a cached pre-compile result
+    _async_track_statistics_updates(hass, entry)
+
     log_integration_event(
         _LOGGER,
         "setup_complete",
@@ -189,8 +242,15 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if nonce_cache:
         await nonce_cache.stop()
 
+    # Flush and stop audit log writer
+    audit_writer = hass.data[DOMAIN].get("audit_writer")
+    if audit_writer:
+        set_audit_writer(None)
+        await audit_writer.stop()
+
     # Clear domain data
     hass.data.pop(DOMAIN, None)
+    clear_entity_allowed_cache()
 
     log_integration_event(
         _LOGGER, "unload_complete", f"instance={entry.data.get(CONF_INSTANCE_ID)}"
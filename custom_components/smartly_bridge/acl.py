@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
 from .const import ALLOWED_SERVICES, DEFAULT_DOMAIN_ICONS, PLATFORM_CONTROL_LABEL
@@ -16,6 +17,19 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+# is_entity_allowed results for the registry they were computed against.
+# Cleared on entity registry updates via clear_entity_allowed_cache().
+_ALLOWED_CACHE_MAXSIZE = 4096
+_allowed_cache: dict[str, bool] = {}
+_allowed_cache_registry: Any = None
+
+
+def clear_entity_allowed_cache() -> None:
+    """Drop cached is_entity_allowed results."""
+    global _allowed_cache_registry
+    _allowed_cache.clear()
+    _allowed_cache_registry = None
+
 
 def is_entity_allowed(
     hass: HomeAssistant,
@@ -26,17 +40,55 @@ def is_entity_allowed(
 
     An entity is allowed if it has the 'platform_control' label.
     """
-    entry = entity_registry.async_get(entity_id)
-    if entry is None:
-        return False
+    global _allowed_cache_registry
+    if entity_registry is not _allowed_cache_registry:
+        _allowed_cache.clear()
+        _allowed_cache_registry = entity_registry
 
+    allowed = _allowed_cache.get(entity_id)
+    if allowed is not None:
+        return allowed
+
+    entry = entity_registry.async_get(entity_id)
     # Check for smartly_control label
-    if entry.labels and PLATFORM_CONTROL_LABEL in entry.labels:
-        return True
+    allowed = bool(entry is not None and entry.labels and PLATFORM_CONTROL_LABEL in entry.labels)
+
+    if len(_allowed_cache) >= _ALLOWED_CACHE_MAXSIZE:
+        _allowed_cache.clear()
+    _allowed_cache[entity_id] = allowed
+    return allowed
 
-    return False
+
+def partition_allowed_entities(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    entity_registry: EntityRegistry,
+) -> tuple[list[str], list[str]]:
+    """Split entity IDs into (allowed, denied), dropping duplicates.
+
+    Cached decisions are read directly; only cold entries go through
+    is_entity_allowed.
+    """
+    if entity_registry is not _allowed_cache_registry:
+        # Let is_entity_allowed reset the cache for the new registry first.
+        cached: dict[str, bool] = {}
+    else:
+        cached = _allowed_cache
+
+    allowed: list[str] = []
+    denied: list[str] = []
+    for entity_id in dict.fromkeys(entity_ids):
+        decision = cached.get(entity_id)
+        if decision is None:
+            decision = is_entity_allowed(hass, entity_id, entity_registry)
+        if decision:
+            allowed.append(entity_id)
+        else:
+            denied.append(entity_id)
+    return allowed, denied
 
 
+@lru_cache(maxsize=512)
 def is_service_allowed(domain: str, service: str) -> bool:
     """Check if service is in the allowed whitelist."""
     if domain not in ALLOWED_SERVICES:
@@ -87,7 +139,8 @@ def get_allowed_entities(
 
 def get_entity_domain(entity_id: str) -> str:
     """Extract domain from entity_id."""
-    return entity_id.split(".")[0] if "." in entity_id else ""
+    domain, separator, _ = entity_id.partition(".")
+    return domain if separator else ""
 
 
 def filter_entities_by_area(
@@ -5,7 +5,9 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from typing import Any, Callable
 
 from ..acl import (
@@ -31,9 +33,14 @@ from ..const import (
     BRIDGE_CHART_LOOKBACK_HOURS,
     DEFAULT_DOMAIN_ICONS,
     DOMAIN,
+    HISTORY_CACHE_BUCKET_SECONDS,
+    HISTORY_CACHE_MAXSIZE,
+    HISTORY_CACHE_TTL,
     MAX_CONCURRENT_HISTORY_QUERIES,
     PLATFORM_CONTROL_LABEL,
     RAW_DIAGNOSTIC_TTL,
+    STATISTICS_CACHE_MAXSIZE,
+    STATISTICS_CACHE_TTL,
 )
 from ..device_presentation import build_device_card_metadata
 from ..domain.models import CameraSnapshot, CameraStreamInfo, EntityStateSnapshot
@@ -71,6 +78,9 @@ SYNC_REFRESH_DOMAINS = {
 
 _LOGGER = logging.getLogger(__name__)
 
+# Statistic columns requested from the recorder for every statistics query.
+_STATISTIC_TYPES = frozenset({"mean", "min", "max", "sum", "state"})
+
 
 def _entry_labels(entry: Any) -> set[str]:
     """Return string labels from a Home Assistant entity registry entry."""
@@ -557,7 +567,7 @@ class HomeAssistantEntityPolicy:
         state = self._hass.states.get(entity_id)
         if state is None:
             return False
-        attributes = format_numeric_attributes(dict(getattr(state, "attributes", {}) or {}))
+        attributes = format_numeric_attributes(getattr(state, "attributes", None) or {})
         name = str(attributes.get("friendly_name", entity_id))
         if setting_key_for_entity(entity_id, name, domain) is None:
             return False
@@ -574,17 +584,20 @@ class HomeAssistantControlGateway:
 
     def __init__(self, hass: Any, *, sleep_seconds: float = 0.1) -> None:
         self._hass = hass
+        # The state machine lives for the lifetime of hass; keep the public
+        # API (StateMachine internals differ between HA releases).
+        self._states = hass.states
         self._sleep_seconds = sleep_seconds
 
     def get_state(self, entity_id: str) -> EntityStateSnapshot | None:
         """Return the current entity state snapshot."""
-        state = self._hass.states.get(entity_id)
+        state = self._states.get(entity_id)
         if state is None:
             return None
         return EntityStateSnapshot(
             entity_id=entity_id,
             state=state.state,
-            attributes=format_numeric_attributes(dict(state.attributes)),
+            attributes=format_numeric_attributes(state.attributes),
         )
 
     async def call_service(
@@ -592,10 +605,15 @@ class HomeAssistantControlGateway:
     ) -> EntityStateSnapshot | None:
         """Call a service and return the updated entity state."""
         domain = get_entity_domain(entity_id)
+        if service_data:
+            service_call_data = dict(service_data)
+            service_call_data["entity_id"] = entity_id
+        else:
+            service_call_data = {"entity_id": entity_id}
         await self._hass.services.async_call(
             domain,
             action,
-            {"entity_id": entity_id, **service_data},
+            service_call_data,
             blocking=True,
         )
         await asyncio.sleep(self._sleep_seconds)
@@ -637,7 +655,7 @@ class HomeAssistantCommandTargetResolver:
             matched_device_ids.add(source_device_id)
 
             state = self._hass.states.get(entity_id)
-            attributes = format_numeric_attributes(dict(getattr(state, "attributes", {}) or {}))
+            attributes = format_numeric_attributes(getattr(state, "attributes", None) or {})
             metadata = build_device_card_metadata(
                 entity_id,
                 getattr(state, "state", None) if state else None,
@@ -692,7 +710,7 @@ class HomeAssistantCommandTargetResolver:
             state = self._hass.states.get(entity_id)
             if state is None:
                 continue
-            attributes = format_numeric_attributes(dict(getattr(state, "attributes", {}) or {}))
+            attributes = format_numeric_attributes(getattr(state, "attributes", None) or {})
             name = str(attributes.get("friendly_name", entity_id))
             resolved_key = setting_key_for_entity(entity_id, name, domain)
             if setting_key is not None and resolved_key != setting_key:
@@ -1029,7 +1047,7 @@ class HomeAssistantStateSyncGateway:
             if state is None:
                 continue
 
-            attributes = format_numeric_attributes(dict(state.attributes))
+            attributes = format_numeric_attributes(state.attributes)
             name = str(attributes.get("friendly_name", entity_id))
             key = setting_key_for_entity(entity_id, name, domain)
             if key is None:
@@ -1427,6 +1445,96 @@ def _home_assistant_web_rtc_gateway(
     return HomeAssistantWebRTCGateway(hass, webrtc_manager)
 
 
+class RecorderHistoryCache:
+    """Short-lived LRU cache of recorder history windows and statistics.
+
+    Dashboards re-request the same window within seconds, so query bounds are
+    bucketed and recent results are reused instead of hitting the database.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = HISTORY_CACHE_TTL,
+        maxsize: int = HISTORY_CACHE_MAXSIZE,
+        bucket_seconds: int = HISTORY_CACHE_BUCKET_SECONDS,
+    ) -> None:
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._bucket_seconds = bucket_seconds
+        self._entries: OrderedDict[tuple[Any, ...], tuple[float, dict[str, list[Any]]]] = (
+            OrderedDict()
+        )
+
+    def floor_bounds(self, start_time: datetime, end_time: datetime) -> tuple[datetime, datetime]:
+        """Return query bounds floored to the cache bucket.
+
+        Recorder queries run with these bounds, so a cached window holds exactly
+        the rows of its key rather than those of whichever caller filled it.
+        """
+        return self._floor(start_time), self._floor(end_time)
+
+    def _floor(self, value: datetime) -> datetime:
+        bucket = int(value.timestamp() // self._bucket_seconds) * self._bucket_seconds
+        return datetime.fromtimestamp(bucket, tz=value.tzinfo)
+
+    def key(
+        self,
+        entity_ids: list[str],
+        start_time: datetime,
+        end_time: datetime,
+        significant_changes_only: bool,
+        no_attributes: bool,
+        include_start_time_state: bool = True,
+    ) -> tuple[Any, ...]:
+        """Return the cache key for a recorder query."""
+        return (
+            tuple(sorted(entity_ids)),
+            int(start_time.timestamp() // self._bucket_seconds),
+            int(end_time.timestamp() // self._bucket_seconds),
+            significant_changes_only,
+            no_attributes,
+            include_start_time_state,
+        )
+
+    def statistics_key(
+        self,
+        entity_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        period: str,
+    ) -> tuple[Any, ...]:
+        """Return the cache key for a recorder statistics query."""
+        return (
+            entity_id,
+            period,
+            int(start_time.timestamp() // self._bucket_seconds),
+            int(end_time.timestamp() // self._bucket_seconds),
+        )
+
+    def get(self, key: tuple[Any, ...]) -> dict[str, list[Any]] | None:
+        """Return a fresh cached result, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self._ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: tuple[Any, ...], states: dict[str, list[Any]]) -> None:
+        """Store a recorder result, evicting the least recently used window."""
+        self._entries[key] = (time.monotonic(), states)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self._entries.clear()
+
+
 class HomeAssistantHistoryGateway:
     """History gateway backed by Home Assistant Recorder."""
 
@@ -1434,9 +1542,18 @@ class HomeAssistantHistoryGateway:
         self,
         hass: Any,
         semaphore_factory: Callable[[], Any],
+        cache: RecorderHistoryCache | None = None,
+        statistics_cache: RecorderHistoryCache | None = None,
     ) -> None:
         self._hass = hass
         self._semaphore_factory = semaphore_factory
+        self._cache = cache or RecorderHistoryCache()
+        self._statistics_cache = statistics_cache or RecorderHistoryCache(
+            ttl=STATISTICS_CACHE_TTL, maxsize=STATISTICS_CACHE_MAXSIZE
+        )
+        self._statistics_in_flight: dict[tuple[Any, ...], asyncio.Future[Any]] = {}
+        # 每次清除統計快取遞增；清除前發出的查詢結果不再寫回快取
+        self._statistics_generation = 0
 
     async def query_states(
         self,
@@ -1471,44 +1588,114 @@ class HomeAssistantHistoryGateway:
             no_attributes=False,
         )
 
-    async def first_state_with_attributes(self, entity_id: str, start_time: Any) -> Any | None:
-        """Return the first state with attributes near the query start."""
-        from datetime import timedelta
+    async def query_states_with_first_state(
+        self,
+        entity_id: str,
+        start_time: Any,
+        end_time: Any,
+        significant_changes_only: bool,
+    ) -> tuple[list[Any], Any | None]:
+        """Return raw states and the first state with attributes in one executor job."""
+        from homeassistant.components.recorder import history
 
-        states = await self._query_recorder(
-            start_time,
-            start_time + timedelta(seconds=1),
-            [entity_id],
-            significant_changes_only=True,
-            no_attributes=False,
-        )
-        first_state_list = states.get(entity_id, [])
-        if first_state_list:
-            return first_state_list[0]
-        return None
+        hass = self._hass
 
-    async def count_states(
+        def fetch() -> tuple[list[Any], Any | None]:
+            states = history.get_significant_states(
+                hass,
+                start_time,
+                end_time,
+                [entity_id],
+                None,
+                True,
+                significant_changes_only,
+                True,
+                False,
+                True,
+            )
+            try:
+                first_states = history.get_significant_states(
+                    hass,
+                    start_time,
+                    start_time + timedelta(seconds=1),
+                    [entity_id],
+                    None,
+                    True,
+                    True,
+                    True,
+                    False,
+                    True,
+                )
+            except Exception as err:
+                # Metadata continuity is best effort; the page itself still succeeds.
+                _LOGGER.debug("First state query failed for %s: %s", entity_id, err)
+                first_states = {}
+            first_state_list = first_states.get(entity_id) or [None]
+            return states.get(entity_id, []), first_state_list[0]
+
+        return await self._run_recorder_job(fetch)
+
+    async def query_recent_states(
         self,
         entity_id: str,
         start_time: Any,
         end_time: Any,
         significant_changes_only: bool,
-    ) -> int:
-        """Return total state count for an entity."""
-        states = await self._query_recorder(
+    ) -> list[Any]:
+        """Return raw recorder states inside the window, without a start-time state."""
+        from homeassistant.components.recorder import history
+
+        start_time, end_time = self._cache.floor_bounds(start_time, end_time)
+        cache_key = self._cache.key(
+            [entity_id],
+            start_time,
+            end_time,
+            significant_changes_only,
+            False,
+            include_start_time_state=False,
+        )
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached.get(entity_id, [])
+
+        states = await self._run_recorder_job(
+            history.get_significant_states,
+            self._hass,
             start_time,
             end_time,
             [entity_id],
+            None,
+            False,
             significant_changes_only,
-            no_attributes=True,
+            True,
+            False,
+            True,
         )
-        return len(states.get(entity_id, []))
+        self._cache.set(cache_key, states)
+        return states.get(entity_id, [])
+
+    def cached_states(
+        self,
+        entity_id: str,
+        start_time: Any,
+        end_time: Any,
+        significant_changes_only: bool,
+    ) -> list[Any] | None:
+        """Return a still-cached ``query_states`` result without querying, or None."""
+        start_time, end_time = self._cache.floor_bounds(start_time, end_time)
+        cached = self._cache.get(
+            self._cache.key([entity_id], start_time, end_time, significant_changes_only, False)
+        )
+        if cached is None:
+            return None
+        return cached.get(entity_id, [])
 
     def get_current_attributes(self, entity_id: str) -> dict[str, Any] | None:
         """Return current entity attributes."""
         current_state = self._hass.states.get(entity_id)
         if current_state and current_state.attributes:
-            return dict(current_state.attributes)
+            # Callers only read it; HA's ReadOnlyDict is already a dict.
+            return current_state.attributes
         return None
 
     async def query_statistics(
@@ -1522,20 +1709,58 @@ class HomeAssistantHistoryGateway:
         from homeassistant.components.recorder.statistics import statistics_during_period
         from homeassistant.helpers.recorder import get_instance
 
-        stat_types = {"mean", "min", "max", "sum", "state"}
-        recorder_instance = get_instance(self._hass)
-        stat_result = await recorder_instance.async_add_executor_job(
-            statistics_during_period,
-            self._hass,
-            start_time,
-            end_time,
-            {entity_id},
-            period,
-            None,
-            stat_types,
-        )
+        cache_key = self._statistics_cache.statistics_key(entity_id, start_time, end_time, period)
+        cached = self._statistics_cache.get(cache_key)
+        if cached is not None:
+            return cached.get(entity_id, [])
+
+        # 同一查詢進行中時共用其結果，避免重複佔用 recorder executor
+        job = self._statistics_in_flight.get(cache_key)
+        if job is None:
+            recorder_instance = get_instance(self._hass)
+            job = asyncio.ensure_future(
+                recorder_instance.async_add_executor_job(
+                    statistics_during_period,
+                    self._hass,
+                    start_time,
+                    end_time,
+                    {entity_id},
+                    period,
+                    None,
+                    _STATISTIC_TYPES,
+                )
+            )
+            self._statistics_in_flight[cache_key] = job
+            job.add_done_callback(
+                partial(self._statistics_job_done, cache_key, self._statistics_generation)
+            )
+
+        # shield 讓單一請求取消時不會中斷其他等待者共用的查詢
+        stat_result = await asyncio.shield(job)
         return stat_result.get(entity_id, [])
 
+    def _statistics_job_done(
+        self, cache_key: tuple[Any, ...], generation: int, job: asyncio.Future[Any]
+    ) -> None:
+        """Release an in-flight statistics query and cache its result.
+
+        A query started before the cache was last cleared may predate the newly
+        compiled bucket, so its result is returned to its waiters but not cached.
+        """
+        if self._statistics_in_flight.get(cache_key) is job:
+            del self._statistics_in_flight[cache_key]
+        if job.cancelled() or job.exception() is not None:
+            return
+        if generation == self._statistics_generation:
+            self._statistics_cache.set(cache_key, job.result())
+
+    def clear_statistics_cache(self) -> None:
+        """Drop cached statistics so newly compiled buckets are served."""
+        self._statistics_generation += 1
+        # Later requests start a fresh query instead of joining one that predates the clear.
+        self._statistics_in_flight.clear()
+        self._statistics_cache.clear()
+
     async def _query_recorder(
         self,
         start_time: Any,
@@ -1545,21 +1770,35 @@ class HomeAssistantHistoryGateway:
         no_attributes: bool,
     ) -> dict[str, list[Any]]:
         from homeassistant.components.recorder import history
+
+        start_time, end_time = self._cache.floor_bounds(start_time, end_time)
+        cache_key = self._cache.key(
+            entity_ids, start_time, end_time, significant_changes_only, no_attributes
+        )
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        states = await self._run_recorder_job(
+            history.get_significant_states,
+            self._hass,
+            start_time,
+            end_time,
+            entity_ids,
+            None,
+            True,
+            significant_changes_only,
+            True,
+            no_attributes,
+            True,
+        )
+        self._cache.set(cache_key, states)
+        return states
+
+    async def _run_recorder_job(self, job: Callable[..., Any], *args: Any) -> Any:
         from homeassistant.helpers.recorder import get_instance
 
         semaphore = self._semaphore_factory()
         async with semaphore:
             recorder_instance = get_instance(self._hass)
-            return await recorder_instance.async_add_executor_job(
-                history.get_significant_states,
-                self._hass,
-                start_time,
-                end_time,
-                entity_ids,
-                None,
-                True,
-                significant_changes_only,
-                True,
-                no_attributes,
-                True,
-            )
+            return await recorder_instance.async_add_executor_job(job, *args)
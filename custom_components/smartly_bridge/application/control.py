@@ -500,27 +500,22 @@ def _has_valid_source_setting_params(
 
 def _normalize_service_call(command: ControlCommand) -> tuple[str, dict[str, Any]]:
     """Map Smartly-friendly actions to Home Assistant service calls."""
-    if get_entity_domain(command.entity_id) == "climate" and command.action in CLIMATE_ACTIONS:
+    domain = get_entity_domain(command.entity_id)
+    if domain == "climate" and command.action in CLIMATE_ACTIONS:
         service_action = CLIMATE_ACTIONS[command.action]
         return service_action, _normalize_climate_service_data(command.action, command.service_data)
 
-    if (
-        get_entity_domain(command.entity_id) in {"scene", "script"}
-        and command.action in RUN_ACTIONS
-    ):
+    if domain in {"scene", "script"} and command.action in RUN_ACTIONS:
         return RUN_ACTIONS[command.action], command.service_data
 
-    if get_entity_domain(command.entity_id) == "fan" and command.action in FAN_ACTIONS:
+    if domain == "fan" and command.action in FAN_ACTIONS:
         return _normalize_fan_service_call(command.action, command.service_data)
 
-    if get_entity_domain(command.entity_id) == "cover" and command.action in COVER_ACTIONS:
+    if domain == "cover" and command.action in COVER_ACTIONS:
         service_action = COVER_ACTIONS[command.action]
         return service_action, _normalize_cover_service_data(command.action, command.service_data)
 
-    if (
-        get_entity_domain(command.entity_id) != "light"
-        or command.action not in LIGHT_TURN_ON_ACTIONS
-    ):
+    if domain != "light" or command.action not in LIGHT_TURN_ON_ACTIONS:
         return command.action, command.service_data
 
     return "turn_on", _normalize_light_service_data(command.action, command.service_data)
@@ -2,17 +2,24 @@
 
 from __future__ import annotations
 
-import base64
-import json
+import re
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Callable
+from functools import lru_cache, partial
+from itertools import islice
+from typing import Any, Awaitable, Callable, Iterable
 
 from ..const import (
     BRIDGE_CHART_DEVICE_CLASSES,
     DOMAIN_VISUALIZATION_CONFIG,
+    HISTORY_ALIGN_MIN_HOURS,
+    HISTORY_CACHE_BUCKET_SECONDS,
     HISTORY_DEFAULT_LIMIT,
+    HISTORY_EXECUTOR_ROW_THRESHOLD,
     HISTORY_MAX_DURATION_DAYS,
+    HISTORY_METADATA_CACHE_TTL,
+    HISTORY_TAIL_PROBE_HOURS,
     VIZUALIZATION_CONFIG,
 )
 from ..domain.models import BridgeResponse
@@ -21,6 +28,50 @@ from .ports import HistoryGatewayPort
 
 DEFAULT_PAGE_SIZE = 100
 MAX_PAGE_SIZE = 1000
+CURSOR_SEPARATOR = "~"
+HISTORY_FORMAT_ROW = "row"
+HISTORY_FORMAT_COLUMN = "column"
+HISTORY_FORMATS = (HISTORY_FORMAT_ROW, HISTORY_FORMAT_COLUMN)
+TIMESTAMP_ENCODING_ISO = "iso"
+TIMESTAMP_ENCODING_DOD = "dod"
+TIMESTAMP_ENCODINGS = (TIMESTAMP_ENCODING_ISO, TIMESTAMP_ENCODING_DOD)
+BATCH_GROUP_BY_FIELD = "field"
+BATCH_GROUP_BY_ENTITY = "entity"
+BATCH_GROUP_BYS = (BATCH_GROUP_BY_FIELD, BATCH_GROUP_BY_ENTITY)
+STATISTICS_PERIODS = frozenset({"hour", "day", "week", "month"})
+_UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Recorder state values that carry no reading and are passed through as-is.
+_SENTINEL_STATES = frozenset({"", "unknown", "unavailable", None})
+# Characters a float() literal can start with besides Unicode digits and whitespace
+# (signs, a leading point, inf/nan); anything else is text and skips the parse.
+_FLOAT_LEADING_CHARS = frozenset("+-.iInN")
+# Statistic row values copied into the response when present and not None.
+_STATISTIC_VALUE_KEYS = ("mean", "min", "max", "sum", "state")
+
+# entity_id -> (monotonic fetch time, first state with attributes); cursor pages
+# reuse it instead of querying the recorder again on every page.
+_first_state_cache: dict[str, tuple[float, Any]] = {}
+
+# entity_id -> (monotonic build time, (device_class, unit) of the live entity plus whether
+# the source row is numeric, metadata); history requests reuse it while those are unchanged.
+_metadata_cache: dict[str, tuple[float, tuple[Any, Any, bool], dict[str, Any]]] = {}
+
+# Measurement keywords used to guess precision from an entity name, in priority
+# order; "power_factor" precedes "power" so the longer keyword wins.
+_ENTITY_KIND_KEYWORDS = (
+    "current",
+    "voltage",
+    "power_factor",
+    "power",
+    "energy",
+    "temperature",
+    "humidity",
+    "battery",
+    "pressure",
+    "frequency",
+)
+# One scan rules out names without any keyword before the ordered checks.
+_ENTITY_KIND_RE = re.compile("|".join(_ENTITY_KIND_KEYWORDS))
 SMARTLY_API_SCHEMA_VERSION = "2026.06"
 
 
@@ -48,6 +99,8 @@ class SingleHistoryQuery:
     use_pagination: bool
     cursor_data: dict[str, str] | None = None
     first_state_with_attrs: Any | None = None
+    columnar: bool = False
+    dod_timestamps: bool = False
 
 
 @dataclass(frozen=True)
@@ -60,6 +113,9 @@ class BatchHistoryQuery:
     end_time: datetime
     limit: int
     significant_changes_only: bool
+    columnar: bool = False
+    dod_timestamps: bool = False
+    group_by_entity: bool = False
 
 
 @dataclass(frozen=True)
@@ -73,32 +129,51 @@ class StatisticsQuery:
 
 
 def encode_cursor(timestamp: str, last_changed: str) -> str:
-    """Encode cursor data for pagination."""
-    cursor_json = json.dumps({"ts": timestamp, "lc": last_changed}, separators=(",", ":"))
-    return base64.urlsafe_b64encode(cursor_json.encode()).decode()
+    """Encode cursor data for pagination.
+
+    Both fields are ISO 8601 strings, so they are joined with "~", which is
+    URL-unreserved and never part of an ISO timestamp.
+    """
+    return f"{timestamp}{CURSOR_SEPARATOR}{last_changed}"
 
 
 def decode_cursor(cursor: str) -> dict[str, str] | None:
-    """Decode cursor data for pagination."""
-    try:
-        cursor_json = base64.urlsafe_b64decode(cursor.encode()).decode()
-        cursor_data = json.loads(cursor_json)
-        if "ts" in cursor_data and "lc" in cursor_data:
-            return cursor_data
-    except (ValueError, KeyError, json.JSONDecodeError):
-        pass
-    return None
+    """Decode cursor data for pagination.
+
+    Returns None unless both fields parse as ISO 8601, so garbage cursors are
+    rejected instead of silently disabling the cursor filter.
+    """
+    # An unescaped "+" in a timezone offset arrives as a space in query strings.
+    timestamp, separator, last_changed = cursor.replace(" ", "+").partition(CURSOR_SEPARATOR)
+    if not separator or parse_datetime(timestamp) is None or parse_datetime(last_changed) is None:
+        return None
+    return {"ts": timestamp, "lc": last_changed}
 
 
 def parse_datetime(value: str | None) -> datetime | None:
-    """Parse an ISO 8601 datetime string."""
-    if not value:
+    """Parse an ISO 8601 datetime string; values without an offset are UTC."""
+    if not value or not isinstance(value, str):
         return None
+    return _parse_iso_datetime(value)
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_datetime(value: str) -> datetime | None:
+    """Parse one ISO 8601 string; polling clients resend the same bounds."""
     try:
-        normalized = value.replace("Z", "+00:00")
-        return datetime.fromisoformat(normalized)
-    except (ValueError, TypeError):
+        # Python 3.11+ parses a trailing "Z" natively, so no normalising copy.
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
         return None
+    # Naive bounds would be read as local time by the recorder but as UTC by
+    # the planner; settle them once here.
+    return _ensure_timezone(parsed)
+
+
+@lru_cache(maxsize=256)
+def _datetime_iso(value: datetime) -> str:
+    """Return a query bound's ISO string; repeated bounds skip ``isoformat``."""
+    return value.isoformat()
 
 
 class HistoryQueryPlanner:
@@ -111,11 +186,13 @@ class HistoryQueryPlanner:
         max_duration_days: int = HISTORY_MAX_DURATION_DAYS,
         default_page_size: int = DEFAULT_PAGE_SIZE,
         max_page_size: int = MAX_PAGE_SIZE,
+        bucket_seconds: int = HISTORY_CACHE_BUCKET_SECONDS,
     ) -> None:
         self._default_limit = default_limit
-        self._max_duration_days = max_duration_days
+        self._max_duration = timedelta(days=max_duration_days)
         self._default_page_size = default_page_size
         self._max_page_size = max_page_size
+        self._bucket_seconds = bucket_seconds
 
     def validate_time_range(
         self,
@@ -123,7 +200,7 @@ class HistoryQueryPlanner:
         end_time: datetime,
     ) -> BridgeResponse | None:
         """Validate public history time range rules."""
-        if end_time - start_time > timedelta(days=self._max_duration_days):
+        if end_time - start_time > self._max_duration:
             return _history_error_response(
                 "time_range_too_large",
                 status=400,
@@ -139,6 +216,24 @@ class HistoryQueryPlanner:
 
         return None
 
+    def align_time_range(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> tuple[datetime, datetime]:
+        """Floor long ranges to the history bucket so jittered polls share queries.
+
+        Clients computing ``now - 24h`` drift by milliseconds on every poll;
+        aligned bounds let the recorder window cache hit. Ranges up to
+        HISTORY_ALIGN_MIN_HOURS are returned unchanged.
+        """
+        if end_time - start_time <= timedelta(hours=HISTORY_ALIGN_MIN_HOURS):
+            return start_time, end_time
+        return self._floor_to_bucket(start_time), self._floor_to_bucket(end_time)
+
+    def _floor_to_bucket(self, value: datetime) -> datetime:
+        return value.replace(microsecond=0) - timedelta(seconds=value.second % self._bucket_seconds)
+
     def parse_pagination_params(
         self,
         query: dict[str, Any],
@@ -186,19 +281,24 @@ class HistoryQueryPlanner:
         cursor_data: dict[str, str] | None,
         page_size: int,
         use_pagination: bool,
-        state_formatter: Callable[[Any], dict[str, Any]],
+        state_timestamp: Callable[[Any], float],
     ) -> tuple[list[Any], bool]:
         """Filter and trim query results for cursor pagination."""
         if not use_pagination:
             return entity_states, False
 
         if cursor_data:
-            cursor_lc = cursor_data.get("lc")
-            if cursor_lc:
+            cursor_lc = parse_datetime(cursor_data.get("lc"))
+            if cursor_lc is not None:
+                # Compare raw epochs so rows are never formatted just to be filtered.
+                # The cursor's lc went through microsecond ISO formatting, so each
+                # row is rounded the same way; a raw recorder float can sit just
+                # below its own cursor and would otherwise repeat on the next page.
+                cursor_epoch = _ensure_timezone(cursor_lc).timestamp()
                 entity_states = [
                     state
                     for state in entity_states
-                    if state_formatter(state).get("last_changed", "") < cursor_lc
+                    if round(state_timestamp(state), 6) < cursor_epoch
                 ]
 
         has_more = len(entity_states) > page_size
@@ -208,6 +308,13 @@ class HistoryQueryPlanner:
         return entity_states, has_more
 
 
+def _newest_first(states: list[Any], limit: int) -> list[Any]:
+    """Return at most ``limit`` of the newest states, newest first."""
+    if limit <= 0:
+        return []
+    return states[-1 : -limit - 1 : -1]
+
+
 def _ensure_timezone(value: datetime) -> datetime:
     """Ensure a datetime has UTC tzinfo for duration math."""
     if value.tzinfo is None:
@@ -215,13 +322,186 @@ def _ensure_timezone(value: datetime) -> datetime:
     return value
 
 
+def _row_timestamp(row: dict[str, Any], default: float) -> float:
+    """Return a formatted row's last_changed (or last_updated) as epoch seconds."""
+    return _iso_timestamp(row.get("last_changed", row.get("last_updated")), default)
+
+
+def _iso_timestamp(value: Any, default: float) -> float:
+    """Return an ISO 8601 timestamp as epoch seconds, or ``default`` if unparsable."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        return default
+    return _ensure_timezone(parsed).timestamp()
+
+
+def _window_bounds(start_time: datetime, end_time: datetime) -> tuple[float, float, str, str]:
+    """Return (start_ts, end_ts, start_iso, end_iso) for a request window.
+
+    Every entity in a batch shares one window, so its bounds are resolved once.
+    """
+    # Equal instants hash alike across offsets; key on the offsets too so the
+    # ISO strings keep the caller's offset.
+    return _cached_window_bounds(start_time, end_time, start_time.utcoffset(), end_time.utcoffset())
+
+
+@lru_cache(maxsize=32)
+def _cached_window_bounds(
+    start_time: datetime,
+    end_time: datetime,
+    start_offset: timedelta | None,
+    end_offset: timedelta | None,
+) -> tuple[float, float, str, str]:
+    return (
+        _ensure_timezone(start_time).timestamp(),
+        _ensure_timezone(end_time).timestamp(),
+        start_time.isoformat(),
+        end_time.isoformat(),
+    )
+
+
+def _precision(metadata: dict[str, Any] | None) -> tuple[int | None, bool]:
+    """Return (decimal_places, is_numeric) for formatting an entity's rows."""
+    if not metadata:
+        return None, False
+    decimal_places = metadata.get("decimal_places")
+    is_numeric = metadata.get("is_numeric", False)
+    if is_numeric and decimal_places is None:
+        decimal_places = 2
+    return decimal_places, is_numeric
+
+
+def _columns(
+    states: list[Any],
+    last_changed: list[str],
+    last_updated: list[str],
+    attributes: dict[str, Any] | None,
+    dod_timestamps: bool,
+) -> dict[str, Any]:
+    """Assemble the columnar history layout."""
+    columns: dict[str, Any] = {
+        "state": states,
+        "last_changed": _delta_of_delta(last_changed) if dod_timestamps else last_changed,
+        "last_updated": _delta_of_delta(last_updated) if dod_timestamps else last_updated,
+    }
+    if attributes is not None:
+        columns["attributes"] = attributes
+    return columns
+
+
+def _delta_of_delta(iso_values: list[str]) -> dict[str, Any]:
+    """Encode ISO timestamps as epoch milliseconds in delta-of-delta form.
+
+    Steady sampling collapses to runs of zeros. Clients rebuild the series as
+    ``t0`` followed by ``t0 + cumsum(cumsum(dod))``.
+    """
+    if not iso_values:
+        return {"t0": None, "dod": []}
+
+    millis = [
+        round(_ensure_timezone(datetime.fromisoformat(value)).timestamp() * 1000)
+        for value in iso_values
+    ]
+    dod: list[int] = []
+    previous_delta = 0
+    for previous, current in zip(millis, islice(millis, 1, None)):
+        delta = current - previous
+        dod.append(delta - previous_delta)
+        previous_delta = delta
+    return {"t0": millis[0], "dod": dod}
+
+
+@lru_cache(maxsize=4096)
+def _parse_state_value(state: str, decimal_places: int | None) -> str | float:
+    """Parse and round a recorder state string.
+
+    Sensors repeat a small set of readings across long windows, so each
+    distinct string is parsed once instead of once per row.
+    """
+    if state in _SENTINEL_STATES:
+        return state
+    first = state[0]
+    if not (first.isdigit() or first in _FLOAT_LEADING_CHARS or first.isspace()):
+        # "on", "off", "heat", ...: no exception for states that cannot be numbers.
+        return state
+    try:
+        numeric_value = float(state)
+    except ValueError:
+        return state
+    if decimal_places is not None:
+        return round(numeric_value, decimal_places)
+    return numeric_value
+
+
+@lru_cache(maxsize=4096)
+def _statistic_timestamp_iso(timestamp: float) -> str:
+    """Return a statistics bucket boundary as ISO 8601.
+
+    Each bucket's end is the next bucket's start, and polled windows repeat
+    the same boundaries, so each epoch is formatted once.
+    """
+    return _epoch_iso(timestamp)
+
+
+@lru_cache(maxsize=8192)
+def _recorder_timestamp_iso(timestamp: float) -> str:
+    """Return a recorder epoch as ISO 8601.
+
+    Polled windows overlap, so the same rows are re-formatted on every poll;
+    each epoch's string is built once while it stays in the window.
+    """
+    return _epoch_iso(timestamp)
+
+
+def _epoch_iso(timestamp: float) -> str:
+    """Format a UTC epoch exactly like ``datetime.isoformat`` without building a datetime.
+
+    Microseconds are rounded as ``timedelta`` rounds them and omitted when zero.
+    """
+    if timestamp < 0:
+        return (_UTC_EPOCH + timedelta(seconds=timestamp)).isoformat()
+    seconds = int(timestamp)
+    micros = round((timestamp - seconds) * 1_000_000)
+    if micros == 1_000_000:
+        seconds += 1
+        micros = 0
+    year, month, day, hour, minute, second = time.gmtime(seconds)[:6]
+    if micros:
+        return "%04d-%02d-%02dT%02d:%02d:%02d.%06d+00:00" % (
+            year,
+            month,
+            day,
+            hour,
+            minute,
+            second,
+            micros,
+        )
+    return "%04d-%02d-%02dT%02d:%02d:%02d+00:00" % (year, month, day, hour, minute, second)
+
+
+def _compressed_timestamp_iso(timestamp: float, now_iso: str | None = None) -> str:
+    """Return a compressed recorder epoch as ISO 8601, or ``now_iso`` when missing.
+
+    Row loops pass one ``now_iso`` per response so rows without stamps share a
+    single fallback instead of reading the clock per row.
+    """
+    if timestamp:
+        return _recorder_timestamp_iso(timestamp)
+    return now_iso or datetime.now(timezone.utc).isoformat()
+
+
+@lru_cache(maxsize=None)
 def _history_error_response(
     error: str,
     *,
     status: int,
     target: str = "history",
 ) -> BridgeResponse:
-    """Return an API vNext history error response."""
+    """Return an API vNext history error response.
+
+    Error responses are fixed per (error, status, target) and shared between
+    calls; HTTP adapters copy the body before attaching request context.
+    """
     return BridgeResponse(
         {
             "schema_version": SMARTLY_API_SCHEMA_VERSION,
@@ -265,20 +545,89 @@ class HistoryResponseFormatter:
         """Format a State-like object or compressed state dict."""
         if isinstance(state, dict):
             return self._format_compressed_state(state, decimal_places, include_attributes)
+        return self._format_state_object(state, decimal_places, include_attributes)
 
-        result = {
-            "state": self.format_state_value(state.state, decimal_places),
-            "last_changed": state.last_changed.isoformat(),
-            "last_updated": state.last_updated.isoformat(),
-        }
+    def row_formatter(self, first_state: Any) -> Callable[[Any, int | None, bool], dict[str, Any]]:
+        """Return the row formatter for a recorder result, chosen from its first row.
+
+        A recorder result is homogeneous (all compressed dicts or all State
+        objects), so loops dispatch once instead of per row.
+        """
+        if isinstance(first_state, dict):
+            return self._format_compressed_state
+        return self._format_state_object
+
+    def _format_state_object(
+        self,
+        state: Any,
+        decimal_places: int | None,
+        include_attributes: bool,
+    ) -> dict[str, Any]:
+        value, last_changed, last_updated = self._state_object_values(
+            state, partial(self.format_state_value, decimal_places=decimal_places)
+        )
+        result = {"state": value, "last_changed": last_changed, "last_updated": last_updated}
         if include_attributes:
-            attributes = dict(state.attributes)
-            result["attributes"] = format_numeric_attributes(attributes) if attributes else {}
+            result["attributes"] = self._row_attributes(state)
         return result
 
+    def _state_object_values(
+        self,
+        state: Any,
+        format_value: Callable[[Any], Any],
+    ) -> tuple[Any, str, str]:
+        last_changed = state.last_changed
+        last_updated = state.last_updated
+        last_changed_iso = last_changed.isoformat()
+        return (
+            format_value(state.state),
+            last_changed_iso,
+            last_changed_iso if last_updated is last_changed else last_updated.isoformat(),
+        )
+
+    def _row_attributes(self, state: Any) -> dict[str, Any]:
+        """Return a raw row's formatted attributes."""
+        attributes = state.get("a", {}) if isinstance(state, dict) else state.attributes
+        # format_numeric_attributes builds a new dict and never mutates its input.
+        return format_numeric_attributes(attributes) if attributes else {}
+
+    def last_changed_timestamp(self, state: Any) -> float:
+        """Return the last_changed epoch of a State-like object or compressed state dict.
+
+        Compressed rows missing both epochs read as ``0.0``.
+        """
+        if isinstance(state, dict):
+            return state.get("lc") or state.get("lu") or 0.0
+        return state.last_changed.timestamp()
+
+    def state_value_formatter(self, decimal_places: int | None) -> Callable[[Any], Any]:
+        """Return a one-argument ``format_state_value`` for one entity's rows.
+
+        Precision is fixed per entity, so each distinct state string is parsed
+        once into a dict local to the formatting pass; row loops skip the
+        shared LRU and its (state, precision) key per row.
+        """
+        format_state_value = self.format_state_value
+        parsed: dict[str, Any] = {}
+
+        def format_value(state: Any) -> Any:
+            if type(state) is str:
+                value = parsed.get(state)
+                if value is None:
+                    value = parsed[state] = _parse_state_value(state, decimal_places)
+                return value
+            return format_state_value(state, decimal_places)
+
+        return format_value
+
     def format_state_value(self, state: str, decimal_places: int | None) -> str | float:
         """Format a state value with optional numeric precision."""
-        if state in ("", "unknown", "unavailable", None):
+        if type(state) is float:
+            # Compressed recorder rows often already carry native floats.
+            return round(state, decimal_places) if decimal_places is not None else state
+        if type(state) is str:
+            return _parse_state_value(state, decimal_places)
+        if state in _SENTINEL_STATES:
             return state
 
         try:
@@ -300,13 +649,40 @@ class HistoryResponseFormatter:
         if not history_data:
             return []
 
-        result = []
-        start_time_iso = start_time.isoformat()
-        end_time_iso = end_time.isoformat()
+        start_ts, end_ts, _, _ = _window_bounds(start_time, end_time)
+        return self._fill_time_bounds(
+            history_data,
+            start_time,
+            end_time,
+            is_numeric,
+            _row_timestamp(history_data[0], start_ts),
+            _row_timestamp(history_data[-1], end_ts),
+        )
+
+    def _fill_time_bounds(
+        self,
+        history_data: list[dict[str, Any]],
+        start_time: datetime,
+        end_time: datetime,
+        is_numeric: bool,
+        first_ts: float,
+        last_ts: float,
+    ) -> list[dict[str, Any]]:
+        """Fill start/end boundary points given the edge rows' epoch timestamps."""
+        # Compare instants, not strings: request bounds may carry a non-UTC offset.
+        start_ts, end_ts, start_time_iso, end_time_iso = _window_bounds(start_time, end_time)
 
         first_data = history_data[0]
-        first_time = first_data.get("last_changed", first_data.get("last_updated", start_time_iso))
-        if first_time > start_time_iso and is_numeric:
+        last_data = history_data[-1]
+        # A 0.0 epoch marks a row without stamps; it is rendered at now, past the window.
+        fill_start = is_numeric and (not first_ts or first_ts > start_ts)
+        fill_end = 0 < last_ts < end_ts
+        if not fill_start and not fill_end:
+            # Samples already bracket the window: return the rows without a copy.
+            return history_data
+
+        result = []
+        if fill_start:
             result.append(
                 {
                     "state": self._coerce_numeric_fill_value(first_data.get("state")),
@@ -317,9 +693,7 @@ class HistoryResponseFormatter:
 
         result.extend(history_data)
 
-        last_data = history_data[-1]
-        last_time = last_data.get("last_changed", last_data.get("last_updated", end_time_iso))
-        if last_time < end_time_iso:
+        if fill_end:
             result.append(
                 {
                     "state": last_data.get("state"),
@@ -343,36 +717,56 @@ class HistoryResponseFormatter:
         use_pagination: bool,
         metadata: dict[str, Any] | None = None,
         total_count: int | None = None,
+        columnar: bool = False,
+        dod_timestamps: bool = False,
     ) -> dict[str, Any]:
-        """Format a single-entity history response."""
-        decimal_places = metadata.get("decimal_places") if metadata else None
-        is_numeric = metadata.get("is_numeric", False) if metadata else False
-        if is_numeric and decimal_places is None:
-            decimal_places = 2
-
-        if use_pagination:
-            history_data = [
-                self.format_state(state, decimal_places, include_attributes=index == 0)
-                for index, state in enumerate(entity_states)
-            ]
+        """Format a single-entity history response.
+
+        With ``columnar`` the history is filled straight into parallel lists;
+        the cursor and bridge chart read the plain ISO columns before any
+        delta-of-delta encoding.
+        """
+        history: Any
+        if columnar:
+            if use_pagination:
+                decimal_places, _ = _precision(metadata)
+                states, last_changed, last_updated, attributes = self._column_values(
+                    entity_states, decimal_places, len(entity_states)
+                )
+            else:
+                states, last_changed, last_updated, attributes = self._bounded_columns(
+                    entity_states, metadata, start_time, end_time, limit
+                )
+            history = _columns(states, last_changed, last_updated, attributes, dod_timestamps)
+            chart_rows: Iterable[tuple[Any, Any]] = zip(states, last_changed)
+            last_row = (last_updated[-1], last_changed[-1]) if states else None
         else:
-            history_data = [
-                self.format_state(state, decimal_places, include_attributes=index == 0)
-                for index, state in enumerate(entity_states[:limit])
-            ]
-            history_data = self.ensure_time_bounds(
-                history_data,
-                start_time,
-                end_time,
-                is_numeric,
+            if use_pagination:
+                decimal_places, _ = _precision(metadata)
+                history = self._format_rows(entity_states, decimal_places, len(entity_states))
+            else:
+                history = self.format_history(
+                    entity_states,
+                    metadata=metadata,
+                    start_time=start_time,
+                    end_time=end_time,
+                    limit=limit,
+                )
+            states = history
+            chart_rows = (
+                (row.get("state"), row.get("last_changed") or row.get("last_updated"))
+                for row in history
             )
+            last_row = None
+            if history:
+                last_row = (history[-1]["last_updated"], history[-1]["last_changed"])
 
         response_data: dict[str, Any] = {
             "entity_id": entity_id,
-            "history": history_data,
-            "count": len(history_data),
-            "start_time": start_time.isoformat(),
-            "end_time": end_time.isoformat(),
+            "history": history,
+            "count": len(states),
+            "start_time": _datetime_iso(start_time),
+            "end_time": _datetime_iso(end_time),
         }
 
         if use_pagination:
@@ -380,12 +774,8 @@ class HistoryResponseFormatter:
             response_data["has_more"] = has_more
             if total_count is not None:
                 response_data["total_count"] = total_count
-            if has_more and history_data:
-                last_state = history_data[-1]
-                response_data["next_cursor"] = encode_cursor(
-                    last_state["last_updated"],
-                    last_state["last_changed"],
-                )
+            if has_more and last_row is not None:
+                response_data["next_cursor"] = encode_cursor(*last_row)
         else:
             response_data["truncated"] = has_more
 
@@ -398,30 +788,225 @@ class HistoryResponseFormatter:
             if unit:
                 response_data["unit_of_measurement"] = unit
 
-            bridge_chart = self._bridge_chart(history_data, device_class, unit)
+            bridge_chart = self._bridge_chart(chart_rows, device_class, unit)
             if bridge_chart is not None:
                 response_data["bridge_chart"] = bridge_chart
 
         return response_data
 
-    def _bridge_chart(
+    def format_history(
+        self,
+        entity_states: list[Any],
+        *,
+        metadata: dict[str, Any] | None,
+        start_time: datetime,
+        end_time: datetime,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Format up to ``limit`` rows with filled start/end time bounds."""
+        decimal_places, is_numeric = _precision(metadata)
+        history_data = self._format_rows(entity_states, decimal_places, limit)
+        if not history_data:
+            return history_data
+        # Edge timestamps come from the raw rows, not by re-parsing formatted strings.
+        return self._fill_time_bounds(
+            history_data,
+            start_time,
+            end_time,
+            is_numeric,
+            self.last_changed_timestamp(entity_states[0]),
+            self.last_changed_timestamp(entity_states[len(history_data) - 1]),
+        )
+
+    def format_columns(
+        self,
+        entity_states: list[Any],
+        *,
+        metadata: dict[str, Any] | None,
+        start_time: datetime,
+        end_time: datetime,
+        limit: int,
+        dod_timestamps: bool = False,
+    ) -> dict[str, Any]:
+        """Format up to ``limit`` rows straight into the columnar layout.
+
+        Matches ``to_columns(format_history(...))`` without building a dict per
+        sample: rows are read as value tuples and appended to the columns.
+        """
+        states, last_changed, last_updated, attributes = self._bounded_columns(
+            entity_states, metadata, start_time, end_time, limit
+        )
+        return _columns(states, last_changed, last_updated, attributes, dod_timestamps)
+
+    def _column_values(
+        self,
+        entity_states: list[Any],
+        decimal_places: int | None,
+        limit: int,
+    ) -> tuple[list[Any], list[str], list[str], dict[str, Any] | None]:
+        """Read up to ``limit`` rows into parallel state/timestamp lists."""
+        states: list[Any] = []
+        last_changed: list[str] = []
+        last_updated: list[str] = []
+        if not entity_states or limit <= 0:
+            return states, last_changed, last_updated, None
+        rows = islice(entity_states, limit)
+        format_value = self.state_value_formatter(decimal_places)
+        row_values: Iterable[tuple[Any, str, str]]
+        if isinstance(entity_states[0], dict):
+            now_iso = datetime.now(timezone.utc).isoformat()
+            compressed_values = self._compressed_state_values
+            row_values = (compressed_values(state, format_value, now_iso) for state in rows)
+        else:
+            state_values = self._state_object_values
+            row_values = (state_values(state, format_value) for state in rows)
+        for value, changed, updated in row_values:
+            states.append(value)
+            last_changed.append(changed)
+            last_updated.append(updated)
+        return states, last_changed, last_updated, self._row_attributes(entity_states[0])
+
+    def _bounded_columns(
+        self,
+        entity_states: list[Any],
+        metadata: dict[str, Any] | None,
+        start_time: datetime,
+        end_time: datetime,
+        limit: int,
+    ) -> tuple[list[Any], list[str], list[str], dict[str, Any] | None]:
+        """Column counterpart of ``format_history``, including time-bound fills."""
+        decimal_places, is_numeric = _precision(metadata)
+        states, last_changed, last_updated, attributes = self._column_values(
+            entity_states, decimal_places, limit
+        )
+        if states:
+            start_ts, end_ts, start_time_iso, end_time_iso = _window_bounds(start_time, end_time)
+            first_ts = self.last_changed_timestamp(entity_states[0])
+            last_ts = self.last_changed_timestamp(entity_states[len(states) - 1])
+            # A 0.0 epoch marks a row without stamps; it is rendered at now, past the window.
+            fill_start = is_numeric and (not first_ts or first_ts > start_ts)
+            if 0 < last_ts < end_ts:
+                states.append(states[-1])
+                last_changed.append(end_time_iso)
+                last_updated.append(end_time_iso)
+            if fill_start:
+                states.insert(0, self._coerce_numeric_fill_value(states[0]))
+                last_changed.insert(0, start_time_iso)
+                last_updated.insert(0, start_time_iso)
+        return states, last_changed, last_updated, attributes
+
+    def to_columns(
         self,
         history_data: list[dict[str, Any]],
+        dod_timestamps: bool = False,
+    ) -> dict[str, Any]:
+        """Return formatted rows as parallel value lists.
+
+        Only one row carries attributes (a time-bound fill row may precede it),
+        so they are emitted once as a mapping rather than as a column. With
+        ``dod_timestamps`` the timestamp columns are delta-of-delta encoded.
+        """
+        states: list[Any] = []
+        last_changed: list[str] = []
+        last_updated: list[str] = []
+        attributes = None
+        for row in history_data:
+            states.append(row["state"])
+            last_changed.append(row["last_changed"])
+            last_updated.append(row["last_updated"])
+            if attributes is None:
+                attributes = row.get("attributes")
+
+        return _columns(states, last_changed, last_updated, attributes, dod_timestamps)
+
+    def _format_rows(
+        self,
+        entity_states: list[Any],
+        decimal_places: int | None,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Format up to ``limit`` rows; only the first row carries attributes."""
+        if not entity_states or limit <= 0:
+            return []
+        first_state = entity_states[0]
+        rest = islice(entity_states, 1, limit)
+        format_value = self.state_value_formatter(decimal_places)
+        if isinstance(first_state, dict):
+            now_iso = datetime.now(timezone.utc).isoformat()
+            value, last_changed, last_updated = self._compressed_state_values(
+                first_state, format_value, now_iso
+            )
+            history_data = [
+                {
+                    "state": value,
+                    "last_changed": last_changed,
+                    "last_updated": last_updated,
+                    "attributes": self._row_attributes(first_state),
+                }
+            ]
+            self._extend_compressed_rows(history_data, rest, format_value, now_iso)
+        else:
+            history_data = [self._format_state_object(first_state, decimal_places, True)]
+            state_values = self._state_object_values
+            history_data.extend(
+                [
+                    {"state": value, "last_changed": changed, "last_updated": updated}
+                    for value, changed, updated in (
+                        state_values(state, format_value) for state in rest
+                    )
+                ]
+            )
+        return history_data
+
+    def _extend_compressed_rows(
+        self,
+        history_data: list[dict[str, Any]],
+        states: Iterable[dict[str, Any]],
+        format_value: Callable[[Any], Any],
+        now_iso: str,
+    ) -> None:
+        """Append attribute-less compressed rows in one pass.
+
+        Same output as ``_format_compressed_state(..., False)`` per row, with the
+        hot helpers bound locally instead of two method calls per row.
+        """
+        timestamp_iso = _compressed_timestamp_iso
+        append = history_data.append
+        for state in states:
+            get = state.get
+            lu_timestamp = get("lu", 0)
+            lc_timestamp = get("lc", 0) or lu_timestamp
+            last_changed = timestamp_iso(lc_timestamp, now_iso)
+            append(
+                {
+                    "state": format_value(get("s", "unknown")),
+                    "last_changed": last_changed,
+                    "last_updated": (
+                        last_changed
+                        if lu_timestamp == lc_timestamp
+                        else timestamp_iso(lu_timestamp, now_iso)
+                    ),
+                }
+            )
+
+    def _bridge_chart(
+        self,
+        rows: Iterable[tuple[Any, Any]],
         device_class: Any,
         unit: Any,
     ) -> dict[str, Any] | None:
+        """Build chart points from ``(state, timestamp)`` pairs."""
         if device_class not in BRIDGE_CHART_DEVICE_CLASSES:
             return None
 
         decimal_places = get_decimal_places(str(device_class), str(unit or ""))
         points = []
-        for state in history_data:
-            timestamp = state.get("last_changed") or state.get("last_updated")
+        for state_value, timestamp in rows:
             if timestamp is None:
                 continue
 
             try:
-                value = float(state.get("state"))
+                value = float(state_value)
             except (TypeError, ValueError):
                 continue
 
@@ -444,37 +1029,49 @@ class HistoryResponseFormatter:
         decimal_places: int | None,
         include_attributes: bool,
     ) -> dict[str, Any]:
-        lc_timestamp = state.get("lc", 0)
-        lu_timestamp = state.get("lu", 0)
-        if not lc_timestamp:
-            lc_timestamp = lu_timestamp
-
+        value, last_changed, last_updated = self._compressed_state_values(
+            state, partial(self.format_state_value, decimal_places=decimal_places)
+        )
         result: dict[str, Any] = {
-            "state": self.format_state_value(state.get("s", "unknown"), decimal_places),
-            "last_changed": (
-                datetime.fromtimestamp(lc_timestamp, tz=timezone.utc).isoformat()
-                if lc_timestamp
-                else datetime.now(timezone.utc).isoformat()
-            ),
-            "last_updated": (
-                datetime.fromtimestamp(lu_timestamp, tz=timezone.utc).isoformat()
-                if lu_timestamp
-                else datetime.now(timezone.utc).isoformat()
-            ),
+            "state": value,
+            "last_changed": last_changed,
+            "last_updated": last_updated,
         }
 
         if include_attributes:
-            attributes = state.get("a", {})
-            result["attributes"] = format_numeric_attributes(attributes) if attributes else {}
+            result["attributes"] = self._row_attributes(state)
 
         return result
 
+    def _compressed_state_values(
+        self,
+        state: dict[str, Any],
+        format_value: Callable[[Any], Any],
+        now_iso: str | None = None,
+    ) -> tuple[Any, str, str]:
+        lc_timestamp = state.get("lc", 0)
+        lu_timestamp = state.get("lu", 0)
+        if not lc_timestamp:
+            lc_timestamp = lu_timestamp
+
+        # Most rows never changed attributes alone, so both stamps share one string.
+        last_changed = _compressed_timestamp_iso(lc_timestamp, now_iso)
+        return (
+            format_value(state.get("s", "unknown")),
+            last_changed,
+            (
+                last_changed
+                if lu_timestamp == lc_timestamp
+                else _compressed_timestamp_iso(lu_timestamp, now_iso)
+            ),
+        )
+
     def _coerce_numeric_fill_value(self, state: Any) -> float | int:
         """Return a numeric start boundary fill value."""
         try:
             if isinstance(state, (int, float)):
                 return state
-            if state not in ("unknown", "unavailable", None):
+            if state not in _SENTINEL_STATES:
                 return float(state)
         except (ValueError, TypeError):
             pass
@@ -488,17 +1085,16 @@ class HistoryMetadataBuilder:
         self,
         entity_id: str,
         first_state: dict[str, Any],
-        all_states: list[dict[str, Any]] | None = None,
+        all_states: Iterable[dict[str, Any]] | None = None,
         current_attributes: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """Generate metadata from history and optional current state attributes."""
-        domain = entity_id.split(".")[0] if "." in entity_id else "sensor"
         attributes = first_state.get("attributes", {})
         device_class = attributes.get("device_class")
         unit = attributes.get("unit_of_measurement", "")
         state_value = first_state.get("state", "")
 
-        if device_class is None and all_states:
+        if device_class is None and all_states is not None:
             device_class, unit = self._find_device_class(all_states, unit)
 
         if current_attributes:
@@ -511,8 +1107,9 @@ class HistoryMetadataBuilder:
                 attributes["friendly_name"] = current_attributes.get("friendly_name")
 
         is_numeric = self._is_numeric(state_value)
-        visualization = self._visualization(domain, device_class, is_numeric)
-        decimal_places = self._decimal_places(entity_id, device_class, unit, is_numeric)
+        domain, visualization, decimal_places = _metadata_profile(
+            entity_id, device_class, unit, is_numeric
+        )
 
         return {
             "domain": domain,
@@ -526,7 +1123,7 @@ class HistoryMetadataBuilder:
 
     def _find_device_class(
         self,
-        all_states: list[dict[str, Any]],
+        all_states: Iterable[dict[str, Any]],
         unit: str,
     ) -> tuple[str | None, str]:
         for state in all_states:
@@ -537,72 +1134,157 @@ class HistoryMetadataBuilder:
         return None, unit
 
     def _is_numeric(self, state_value: Any) -> bool:
-        try:
-            if state_value not in ("", "unknown", "unavailable", None):
-                float(state_value)
-                return True
-        except (ValueError, TypeError):
-            pass
-        return False
+        return _is_numeric_value(state_value)
 
-    def _visualization(
-        self,
-        domain: str,
-        device_class: str | None,
-        is_numeric: bool,
-    ) -> dict[str, Any]:
-        if device_class and device_class in VIZUALIZATION_CONFIG:
-            return VIZUALIZATION_CONFIG[device_class].copy()
-        if domain in DOMAIN_VISUALIZATION_CONFIG:
-            return DOMAIN_VISUALIZATION_CONFIG[domain].copy()
-        if is_numeric:
-            return {
-                "type": "chart",
-                "chart_type": "line",
-                "color": "#607D8B",
-                "show_points": True,
-                "interpolation": "linear",
-            }
+
+def _is_numeric_value(state_value: Any) -> bool:
+    """Return whether a state value parses as a number."""
+    if type(state_value) is str:
+        # Shares the prefiltered, memoized parse used for row values.
+        return type(_parse_state_value(state_value, None)) is float
+    try:
+        if state_value not in _SENTINEL_STATES:
+            float(state_value)
+            return True
+    except (ValueError, TypeError):
+        pass
+    return False
+
+
+def _visualization(
+    domain: str,
+    device_class: str | None,
+    is_numeric: bool,
+) -> dict[str, Any]:
+    """Return the visualization template for a device class or domain."""
+    if device_class and device_class in VIZUALIZATION_CONFIG:
+        return VIZUALIZATION_CONFIG[device_class]
+    if domain in DOMAIN_VISUALIZATION_CONFIG:
+        return DOMAIN_VISUALIZATION_CONFIG[domain]
+    if is_numeric:
         return {
-            "type": "timeline",
-            "on_color": "#66BB6A",
-            "off_color": "#BDBDBD",
+            "type": "chart",
+            "chart_type": "line",
+            "color": "#607D8B",
+            "show_points": True,
+            "interpolation": "linear",
         }
+    return {
+        "type": "timeline",
+        "on_color": "#66BB6A",
+        "off_color": "#BDBDBD",
+    }
+
+
+def _decimal_places(
+    entity_id: str,
+    device_class: str | None,
+    unit: str,
+    is_numeric: bool,
+) -> int | None:
+    """Return display precision from the device class or entity name."""
+    if not is_numeric:
+        return None
 
-    def _decimal_places(
-        self,
-        entity_id: str,
-        device_class: str | None,
-        unit: str,
-        is_numeric: bool,
-    ) -> int | None:
-        if not is_numeric:
-            return None
+    if device_class:
+        decimal_places = get_decimal_places(device_class, unit)
+        if decimal_places is not None:
+            return decimal_places
 
-        if device_class:
-            decimal_places = get_decimal_places(device_class, unit)
-            if decimal_places is not None:
-                return decimal_places
-
-        entity_name = entity_id.split(".")[-1].lower()
-        for key in [
-            "current",
-            "voltage",
-            "power",
-            "energy",
-            "temperature",
-            "humidity",
-            "battery",
-            "pressure",
-            "power_factor",
-            "frequency",
-        ]:
-            if key in entity_name:
-                decimal_places = get_decimal_places(key, unit)
+    entity_name = entity_id.rpartition(".")[2].lower()
+    if _ENTITY_KIND_RE.search(entity_name) is not None:
+        for keyword in _ENTITY_KIND_KEYWORDS:
+            if keyword in entity_name:
+                decimal_places = get_decimal_places(keyword, unit)
                 if decimal_places is not None:
                     return decimal_places
 
-        return 2
+    return 2
+
+
+@lru_cache(maxsize=2048)
+def _metadata_profile(
+    entity_id: str,
+    device_class: str | None,
+    unit: str,
+    is_numeric: bool,
+) -> tuple[str, dict[str, Any], int | None]:
+    """Return domain, visualization template and precision for an entity class.
+
+    The result only depends on the arguments, so it is cached. Visualization
+    templates are shared with the config tables and every response; they are
+    serialized as-is and never mutated.
+    """
+    domain, separator, _ = entity_id.partition(".")
+    if not separator:
+        domain = "sensor"
+    return (
+        domain,
+        _visualization(domain, device_class, is_numeric),
+        _decimal_places(entity_id, device_class, unit, is_numeric),
+    )
+
+
+def clear_history_metadata_cache() -> None:
+    """Drop cached history metadata and metadata source states."""
+    _metadata_cache.clear()
+    _first_state_cache.clear()
+
+
+def _metadata_signature(
+    current_attributes: dict[str, Any] | None, metadata_source: Any
+) -> tuple[Any, Any, bool]:
+    """Return the live (device_class, unit) and source numeric-ness cached metadata is valid for.
+
+    ``is_numeric`` and ``decimal_places`` follow the source row's value, so a window
+    starting at "unavailable" never pins non-numeric metadata on later numeric polls.
+    """
+    if isinstance(metadata_source, dict):
+        state_value = metadata_source.get("s", "unknown")
+    else:
+        state_value = metadata_source.state
+    is_numeric = _is_numeric_value(state_value)
+    if not current_attributes:
+        return (None, None, is_numeric)
+    return (
+        current_attributes.get("device_class"),
+        current_attributes.get("unit_of_measurement"),
+        is_numeric,
+    )
+
+
+def _cached_metadata(entity_id: str, signature: tuple[Any, Any, bool]) -> dict[str, Any] | None:
+    """Return fresh cached metadata for an entity whose class and unit are unchanged."""
+    cached = _metadata_cache.get(entity_id)
+    if (
+        cached is not None
+        and cached[1] == signature
+        and time.monotonic() - cached[0] < HISTORY_METADATA_CACHE_TTL
+    ):
+        return cached[2]
+    return None
+
+
+def _cached_first_state(entity_id: str) -> Any | None:
+    """Return the cached metadata source state for an entity if still fresh."""
+    cached = _first_state_cache.get(entity_id)
+    if cached is not None and time.monotonic() - cached[0] < HISTORY_METADATA_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _first_state_with_attributes(entity_states: list[Any]) -> Any | None:
+    """Return the first raw state carrying attributes.
+
+    The recorder emits the attribute-bearing start state first, so this
+    normally stops at index 0. Results are homogeneous, so the row type is
+    checked once on the first row.
+    """
+    if not entity_states:
+        return None
+    if isinstance(entity_states[0], dict):
+        return next((state for state in entity_states if state.get("a")), None)
+    return next((state for state in entity_states if getattr(state, "attributes", None)), None)
 
 
 class SingleHistoryUseCase:
@@ -615,57 +1297,70 @@ class SingleHistoryUseCase:
         planner: HistoryQueryPlanner | None = None,
         formatter: HistoryResponseFormatter | None = None,
         metadata_builder: HistoryMetadataBuilder | None = None,
+        executor: Callable[..., Awaitable[Any]] | None = None,
     ) -> None:
         self._gateway = gateway
         self._planner = planner or HistoryQueryPlanner()
         self._formatter = formatter or HistoryResponseFormatter()
         self._metadata_builder = metadata_builder or HistoryMetadataBuilder()
+        self._executor = executor
 
     async def execute(self, query: SingleHistoryQuery) -> BridgeResponse:
         """Execute a single history query."""
-        raw_states = await self._gateway.query_states(
-            query.entity_id,
-            query.start_time,
-            query.end_time,
-            query.significant_changes_only,
-        )
-        entity_states = list(reversed(raw_states))
-
-        first_state_with_attrs = query.first_state_with_attrs
-        if query.use_pagination and query.cursor_data and first_state_with_attrs is None:
-            try:
-                first_state_with_attrs = await self._gateway.first_state_with_attributes(
-                    query.entity_id,
-                    query.start_time,
-                )
-            except Exception:
-                first_state_with_attrs = None
+        raw_states, first_state_with_attrs = await self._fetch_states(query)
+        raw_count = len(raw_states)
 
+        # The recorder already returned the full window, so the first page counts
+        # it directly instead of issuing a second attribute-free query.
         total_count = None
         if query.use_pagination and not query.cursor_data:
-            try:
-                total_count = await self._gateway.count_states(
-                    query.entity_id,
-                    query.start_time,
-                    query.end_time,
-                    query.significant_changes_only,
-                )
-            except Exception:
-                total_count = len(entity_states)
-
-        entity_states, has_more = self._planner.apply_pagination_filter(
+            total_count = raw_count
+
+        if query.use_pagination:
+            entity_states, has_more = self._planner.apply_pagination_filter(
+                list(reversed(raw_states)),
+                query.cursor_data,
+                query.page_size,
+                query.use_pagination,
+                self._formatter.last_changed_timestamp,
+            )
+        else:
+            # Only the newest ``limit`` rows are returned; slice them newest-first
+            # instead of reversing the whole window.
+            entity_states = _newest_first(raw_states, query.limit)
+            has_more = raw_count > query.limit
+
+        # Read live attributes here so formatting never touches the gateway off-loop.
+        current_attributes = (
+            self._gateway.get_current_attributes(query.entity_id) if entity_states else None
+        )
+        format_args = (
+            query,
             entity_states,
-            query.cursor_data,
-            query.page_size,
-            query.use_pagination,
-            self._formatter.format_state,
+            has_more,
+            total_count,
+            first_state_with_attrs,
+            current_attributes,
         )
+        if self._executor is not None and len(entity_states) > HISTORY_EXECUTOR_ROW_THRESHOLD:
+            body = await self._executor(self._format_body, *format_args)
+        else:
+            body = self._format_body(*format_args)
+        return _history_success_response(body)
 
-        if not query.use_pagination:
-            has_more = len(raw_states) > query.limit
-
-        metadata = self._build_metadata(query.entity_id, entity_states, first_state_with_attrs)
-        body = self._formatter.format_response(
+    def _format_body(
+        self,
+        query: SingleHistoryQuery,
+        entity_states: list[Any],
+        has_more: bool,
+        total_count: int | None,
+        first_state_with_attrs: Any | None,
+        current_attributes: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        metadata = self._build_metadata(
+            query.entity_id, entity_states, first_state_with_attrs, current_attributes
+        )
+        return self._formatter.format_response(
             entity_states=entity_states,
             entity_id=query.entity_id,
             start_time=query.start_time,
@@ -676,52 +1371,90 @@ class SingleHistoryUseCase:
             use_pagination=query.use_pagination,
             metadata=metadata,
             total_count=total_count,
+            columnar=query.columnar,
+            dod_timestamps=query.dod_timestamps,
         )
-        return _history_success_response(body)
+
+    async def _fetch_states(self, query: SingleHistoryQuery) -> tuple[list[Any], Any | None]:
+        """Return raw states and, for cursor pages, the metadata source state."""
+        first_state = query.first_state_with_attrs
+        if query.use_pagination and query.cursor_data and first_state is None:
+            first_state = _cached_first_state(query.entity_id)
+            if first_state is None:
+                # Fetch the metadata source with the page in one recorder job.
+                raw_states, first_state = await self._gateway.query_states_with_first_state(
+                    query.entity_id,
+                    query.start_time,
+                    query.end_time,
+                    query.significant_changes_only,
+                )
+                if first_state is not None:
+                    _first_state_cache[query.entity_id] = (time.monotonic(), first_state)
+                return raw_states, first_state
+
+        tail_start = query.end_time - timedelta(hours=HISTORY_TAIL_PROBE_HOURS)
+        if not query.use_pagination and tail_start > query.start_time:
+            # A cached full window answers the poll without probing the recorder.
+            cached_states = self._gateway.cached_states(
+                query.entity_id,
+                query.start_time,
+                query.end_time,
+                query.significant_changes_only,
+            )
+            if cached_states is not None:
+                return cached_states, first_state
+            # Only the newest ``limit`` rows are returned. When the most recent
+            # hours already hold more than that, the older rows of a multi-day
+            # window are never read.
+            recent_states = await self._gateway.query_recent_states(
+                query.entity_id,
+                tail_start,
+                query.end_time,
+                query.significant_changes_only,
+            )
+            if len(recent_states) > query.limit:
+                return recent_states, first_state
+
+        raw_states = await self._gateway.query_states(
+            query.entity_id,
+            query.start_time,
+            query.end_time,
+            query.significant_changes_only,
+        )
+        return raw_states, first_state
 
     def _build_metadata(
         self,
         entity_id: str,
         entity_states: list[Any],
         first_state_with_attrs: Any | None,
+        current_attributes: dict[str, Any] | None,
     ) -> dict[str, Any] | None:
         if not entity_states:
             return None
 
-        formatted_states = [
-            self._formatter.format_state(state, include_attributes=True) for state in entity_states
-        ]
-
-        for state in entity_states:
-            if isinstance(state, dict) and state.get("a"):
-                return self._metadata_builder.build(
-                    entity_id,
-                    self._formatter.format_state(state),
-                    all_states=formatted_states,
-                    current_attributes=self._gateway.get_current_attributes(entity_id),
-                )
-            if not isinstance(state, dict) and getattr(state, "attributes", None):
-                return self._metadata_builder.build(
-                    entity_id,
-                    self._formatter.format_state(state, include_attributes=True),
-                    all_states=formatted_states,
-                    current_attributes=self._gateway.get_current_attributes(entity_id),
-                )
-
-        if first_state_with_attrs is not None:
-            return self._metadata_builder.build(
-                entity_id,
-                self._formatter.format_state(first_state_with_attrs),
-                all_states=formatted_states,
-                current_attributes=self._gateway.get_current_attributes(entity_id),
-            )
-
-        return self._metadata_builder.build(
+        metadata_source = _first_state_with_attributes(entity_states)
+        if metadata_source is None:
+            metadata_source = first_state_with_attrs
+        if metadata_source is None:
+            metadata_source = entity_states[0]
+
+        signature = _metadata_signature(current_attributes, metadata_source)
+        cached = _cached_metadata(entity_id, signature)
+        if cached is not None:
+            return cached
+
+        format_state = self._formatter.row_formatter(entity_states[0])
+        # Lazy: rows are only formatted if the builder must search them for a device_class.
+        all_states = (format_state(state, None, True) for state in entity_states)
+        metadata = self._metadata_builder.build(
             entity_id,
-            self._formatter.format_state(entity_states[0]),
-            all_states=formatted_states,
-            current_attributes=self._gateway.get_current_attributes(entity_id),
+            self._formatter.format_state(metadata_source),
+            all_states=all_states,
+            current_attributes=current_attributes,
         )
+        _metadata_cache[entity_id] = (time.monotonic(), signature, metadata)
+        return metadata
 
 
 class BatchHistoryUseCase:
@@ -733,10 +1466,12 @@ class BatchHistoryUseCase:
         *,
         formatter: HistoryResponseFormatter | None = None,
         metadata_builder: HistoryMetadataBuilder | None = None,
+        executor: Callable[..., Awaitable[Any]] | None = None,
     ) -> None:
         self._gateway = gateway
         self._formatter = formatter or HistoryResponseFormatter()
         self._metadata_builder = metadata_builder or HistoryMetadataBuilder()
+        self._executor = executor
 
     async def execute(self, query: BatchHistoryQuery) -> BridgeResponse:
         """Execute a batch history query."""
@@ -746,97 +1481,128 @@ class BatchHistoryUseCase:
             query.end_time,
             query.significant_changes_only,
         )
+        # Read live attributes here so formatting never touches the gateway off-loop.
+        current_attributes: dict[str, dict[str, Any] | None] = {}
+        row_count = 0
+        for entity_id in query.entity_ids:
+            entity_states = states.get(entity_id)
+            if entity_states:
+                current_attributes[entity_id] = self._gateway.get_current_attributes(entity_id)
+                row_count += len(entity_states)
+        if self._executor is not None and row_count > HISTORY_EXECUTOR_ROW_THRESHOLD:
+            body = await self._executor(self._format_body, query, states, current_attributes)
+        else:
+            body = self._format_body(query, states, current_attributes)
+        return _history_success_response(body)
 
-        history_data: dict[str, list[dict[str, Any]]] = {}
+    def _format_body(
+        self,
+        query: BatchHistoryQuery,
+        states: dict[str, list[Any]],
+        current_attributes: dict[str, dict[str, Any] | None],
+    ) -> dict[str, Any]:
+        history_data: dict[str, Any] = {}
         count_data: dict[str, int] = {}
         truncated_data: dict[str, bool] = {}
         metadata_data: dict[str, dict[str, Any]] = {}
+        results: dict[str, dict[str, Any]] = {}
 
         for entity_id in query.entity_ids:
-            entity_states = states.get(entity_id, [])
-            truncated_data[entity_id] = len(entity_states) > query.limit
-            formatted_states, metadata = self._format_entity_history(
-                entity_id,
-                entity_states,
-                query.limit,
-                query.start_time,
-                query.end_time,
-            )
-            history_data[entity_id] = formatted_states
-            count_data[entity_id] = len(formatted_states)
+            entity_states = states.get(entity_id)
+            if not entity_states:
+                # Nothing recorded in the window: no rows, bounds or metadata to build.
+                entity_states = []
+                metadata = None
+            else:
+                metadata = self._build_metadata(
+                    entity_id, entity_states, current_attributes.get(entity_id)
+                )
+            truncated = len(entity_states) > query.limit
+            newest_states = _newest_first(entity_states, query.limit)
+
+            entity_history: Any
+            if query.columnar:
+                # Columns are filled from per-row tuples; no per-sample dicts.
+                entity_history = self._formatter.format_columns(
+                    newest_states,
+                    metadata=metadata,
+                    start_time=query.start_time,
+                    end_time=query.end_time,
+                    limit=query.limit,
+                    dod_timestamps=query.dod_timestamps,
+                )
+                count = len(entity_history["state"])
+            else:
+                entity_history = self._formatter.format_history(
+                    newest_states,
+                    metadata=metadata,
+                    start_time=query.start_time,
+                    end_time=query.end_time,
+                    limit=query.limit,
+                )
+                count = len(entity_history)
+
+            if query.group_by_entity:
+                entry = {"history": entity_history, "count": count, "truncated": truncated}
+                if metadata:
+                    entry["metadata"] = metadata
+                results[entity_id] = entry
+                continue
+
+            history_data[entity_id] = entity_history
+            count_data[entity_id] = count
+            truncated_data[entity_id] = truncated
             if metadata:
                 metadata_data[entity_id] = metadata
 
+        _, _, start_time_iso, end_time_iso = _window_bounds(query.start_time, query.end_time)
+        window = {
+            "denied_entities": query.denied_entity_ids,
+            "start_time": start_time_iso,
+            "end_time": end_time_iso,
+        }
+        if query.group_by_entity:
+            return {"results": results, **window}
+
         body: dict[str, Any] = {
             "history": history_data,
             "count": count_data,
             "truncated": truncated_data,
-            "denied_entities": query.denied_entity_ids,
-            "start_time": query.start_time.isoformat(),
-            "end_time": query.end_time.isoformat(),
+            **window,
         }
         if metadata_data:
             body["metadata"] = metadata_data
-
-        return _history_success_response(body)
-
-    def _format_entity_history(
-        self,
-        entity_id: str,
-        entity_states: list[Any],
-        limit: int,
-        start_time: datetime,
-        end_time: datetime,
-    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
-        metadata = self._build_metadata(entity_id, entity_states)
-        response = self._formatter.format_response(
-            entity_states=list(reversed(entity_states)),
-            entity_id=entity_id,
-            start_time=start_time,
-            end_time=end_time,
-            limit=limit,
-            page_size=limit,
-            has_more=False,
-            use_pagination=False,
-            metadata=metadata,
-        )
-        return response["history"], metadata
+        return body
 
     def _build_metadata(
         self,
         entity_id: str,
         entity_states: list[Any],
+        current_attributes: dict[str, Any] | None,
     ) -> dict[str, Any] | None:
         if not entity_states:
             return None
 
-        formatted_states = [
-            self._formatter.format_state(state, include_attributes=True) for state in entity_states
-        ]
-        current_attributes = self._gateway.get_current_attributes(entity_id)
-
-        for state in entity_states:
-            if isinstance(state, dict) and state.get("a"):
-                return self._metadata_builder.build(
-                    entity_id,
-                    self._formatter.format_state(state),
-                    all_states=formatted_states,
-                    current_attributes=current_attributes,
-                )
-            if not isinstance(state, dict) and getattr(state, "attributes", None):
-                return self._metadata_builder.build(
-                    entity_id,
-                    self._formatter.format_state(state, include_attributes=True),
-                    all_states=formatted_states,
-                    current_attributes=current_attributes,
-                )
+        metadata_source = _first_state_with_attributes(entity_states)
+        if metadata_source is None:
+            metadata_source = entity_states[0]
+
+        signature = _metadata_signature(current_attributes, metadata_source)
+        cached = _cached_metadata(entity_id, signature)
+        if cached is not None:
+            return cached
 
-        return self._metadata_builder.build(
+        format_state = self._formatter.row_formatter(entity_states[0])
+        # Lazy: rows are only formatted if the builder must search them for a device_class.
+        all_states = (format_state(state, None, True) for state in entity_states)
+        metadata = self._metadata_builder.build(
             entity_id,
-            self._formatter.format_state(entity_states[0]),
-            all_states=formatted_states,
+            self._formatter.format_state(metadata_source),
+            all_states=all_states,
             current_attributes=current_attributes,
         )
+        _metadata_cache[entity_id] = (time.monotonic(), signature, metadata)
+        return metadata
 
 
 class StatisticsUseCase:
@@ -853,28 +1619,37 @@ class StatisticsUseCase:
             query.end_time,
             query.period,
         )
-        statistics_data = [self._format_statistic(stat) for stat in stats]
+        statistics_data = self._format_statistics(stats)
         body = {
             "entity_id": query.entity_id,
             "period": query.period,
             "statistics": statistics_data,
             "count": len(statistics_data),
-            "start_time": query.start_time.isoformat(),
-            "end_time": query.end_time.isoformat(),
+            "start_time": _datetime_iso(query.start_time),
+            "end_time": _datetime_iso(query.end_time),
         }
         return _history_success_response(body)
 
-    def _format_statistic(self, stat: dict[str, Any]) -> dict[str, Any]:
-        stat_entry: dict[str, Any] = {
-            "start": self._timestamp_to_iso(stat.get("start")),
-            "end": self._timestamp_to_iso(stat.get("end")),
-        }
-        for key in ("mean", "min", "max", "sum", "state"):
-            if key in stat and stat[key] is not None:
-                stat_entry[key] = stat[key]
-        return stat_entry
-
-    def _timestamp_to_iso(self, timestamp: Any) -> str | None:
-        if not timestamp:
-            return None
-        return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+    def _format_statistics(self, stats: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Format statistic rows in one loop with the timestamp formatter bound locally.
+
+        Bucket boundaries go through the cached ``_statistic_timestamp_iso``;
+        a bucket's end is the next bucket's start, so most lookups are hits.
+        """
+        timestamp_iso = _statistic_timestamp_iso
+        statistics_data: list[dict[str, Any]] = []
+        append = statistics_data.append
+        for stat in stats:
+            get = stat.get
+            start = get("start")
+            end = get("end")
+            stat_entry: dict[str, Any] = {
+                "start": timestamp_iso(start) if start else None,
+                "end": timestamp_iso(end) if end else None,
+            }
+            for key in _STATISTIC_VALUE_KEYS:
+                value = get(key)
+                if value is not None:
+                    stat_entry[key] = value
+            append(stat_entry)
+        return statistics_data
@@ -320,7 +320,7 @@ def _logical_device_id(entity_id: str) -> str:
 
 def _primary_type_for_snapshot(snapshot: EntityStateSnapshot) -> str:
     """Map existing entity metadata to a Smartly primary type."""
-    domain = snapshot.domain or snapshot.entity_id.split(".", 1)[0]
+    domain = snapshot.domain or snapshot.entity_id.partition(".")[0]
     if snapshot.device_class == "presence_sensor":
         return "presence_sensor"
     if snapshot.device_class == "contact_sensor":
@@ -817,7 +817,7 @@ def _source_ref(snapshot: EntityStateSnapshot, capability: str) -> dict[str, Any
         "source": "home_assistant",
         "source_device_id": snapshot.source_device_id,
         "source_entity_id": snapshot.entity_id,
-        "domain": snapshot.domain or snapshot.entity_id.split(".", 1)[0],
+        "domain": snapshot.domain or snapshot.entity_id.partition(".")[0],
         "role": _source_entity_role(snapshot, capability),
         "capability_types": [capability],
     }
@@ -831,7 +831,7 @@ def _source_entity_role(snapshot: EntityStateSnapshot, capability: str) -> str:
         return "event_source"
     if capability in _WRITABLE_CAPABILITIES:
         return "primary_control"
-    domain = snapshot.domain or snapshot.entity_id.split(".", 1)[0]
+    domain = snapshot.domain or snapshot.entity_id.partition(".")[0]
     if domain in {"sensor", "binary_sensor"}:
         return "sensor"
     return "secondary_control"
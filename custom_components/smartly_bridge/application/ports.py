@@ -255,17 +255,32 @@ class HistoryGatewayPort(Protocol):
     ) -> dict[str, list[Any]]:
         """Return raw history states for multiple entities."""
 
-    async def first_state_with_attributes(self, entity_id: str, start_time: Any) -> Any | None:
-        """Return the first state with attributes for metadata continuity."""
+    async def query_states_with_first_state(
+        self,
+        entity_id: str,
+        start_time: Any,
+        end_time: Any,
+        significant_changes_only: bool,
+    ) -> tuple[list[Any], Any | None]:
+        """Return raw history states and the first state with attributes together."""
+
+    async def query_recent_states(
+        self,
+        entity_id: str,
+        start_time: Any,
+        end_time: Any,
+        significant_changes_only: bool,
+    ) -> list[Any]:
+        """Return raw states recorded inside the window, without a start-time state."""
 
-    async def count_states(
+    def cached_states(
         self,
         entity_id: str,
         start_time: Any,
         end_time: Any,
         significant_changes_only: bool,
-    ) -> int:
-        """Return total state count for a query."""
+    ) -> list[Any] | None:
+        """Return a still-cached ``query_states`` result without querying, or None."""
 
     def get_current_attributes(self, entity_id: str) -> dict[str, Any] | None:
         """Return current entity attributes if available."""
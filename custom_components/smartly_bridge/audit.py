@@ -2,8 +2,105 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+from typing import Any, Callable
+
+from .const import AUDIT_BATCH_SIZE, AUDIT_QUEUE_MAXSIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+_AuditRecord = tuple[Callable[..., None], str, tuple[Any, ...]]
+
+
+class AuditLogWriter:
+    """Bounded audit queue drained by a single background writer task."""
+
+    def __init__(
+        self,
+        maxsize: int = AUDIT_QUEUE_MAXSIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+    ) -> None:
+        """Initialize the audit writer."""
+        self._queue: asyncio.Queue[_AuditRecord] = asyncio.Queue(maxsize=maxsize)
+        self._batch_size = batch_size
+        self._writer_task: asyncio.Task | None = None
+        self._reported_dropped = 0
+        self.dropped = 0
+
+    async def start(self) -> None:
+        """Start the writer task."""
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def stop(self) -> None:
+        """Stop the writer task and flush records still queued."""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        self._write(self._drain())
+
+    def submit(self, log_method: Callable[..., None], msg: str, args: tuple[Any, ...]) -> bool:
+        """Queue an audit record. Returns False if the writer is not running."""
+        if self._writer_task is None:
+            return False
+        try:
+            self._queue.put_nowait((log_method, msg, args))
+        except asyncio.QueueFull:
+            # Never block a request on audit I/O; the writer reports drops.
+            self.dropped += 1
+        return True
+
+    async def _writer_loop(self) -> None:
+        """Write queued records in batches."""
+        while True:
+            batch = [await self._queue.get()]
+            batch.extend(self._drain(self._batch_size - 1))
+            self._write(batch)
+
+    def _drain(self, limit: int | None = None) -> list[_AuditRecord]:
+        """Return queued records without waiting."""
+        records: list[_AuditRecord] = []
+        while limit is None or len(records) < limit:
+            try:
+                records.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return records
+
+    def _write(self, batch: list[_AuditRecord]) -> None:
+        """Emit a batch of records through their original loggers."""
+        for log_method, msg, args in batch:
+            log_method(msg, *args)
+
+        if self.dropped != self._reported_dropped:
+            _LOGGER.warning(
+                "AUDIT_DROPPED: records=%d, total=%d",
+                self.dropped - self._reported_dropped,
+                self.dropped,
+            )
+            self._reported_dropped = self.dropped
+
+
+_audit_writer: AuditLogWriter | None = None
+
+
+def set_audit_writer(writer: AuditLogWriter | None) -> None:
+    """Route control/deny audit records through a background writer."""
+    global _audit_writer
+    _audit_writer = writer
+
+
+def _emit(log_method: Callable[..., None], msg: str, *args: Any) -> None:
+    """Queue an audit record, writing it directly when no writer is running."""
+    writer = _audit_writer
+    if writer is not None and writer.submit(log_method, msg, args):
+        return
+    log_method(msg, *args)
 
 
 def log_control(
@@ -15,13 +112,17 @@ def log_control(
     actor: dict[str, Any] | None = None,
 ) -> None:
     """Log a control action."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     actor_info = ""
     if actor:
         user_id = actor.get("user_id", "unknown")
         role = actor.get("role", "unknown")
         actor_info = f", actor={user_id}/{role}"
 
-    logger.info(
+    _emit(
+        logger.info,
         "CONTROL: client=%s, entity=%s, service=%s, result=%s%s",
         client_id,
         entity_id,
@@ -40,13 +141,17 @@ def log_deny(
     actor: dict[str, Any] | None = None,
 ) -> None:
     """Log a denied action."""
+    if not logger.isEnabledFor(logging.WARNING):
+        return
+
     actor_info = ""
     if actor:
         user_id = actor.get("user_id", "unknown")
         role = actor.get("role", "unknown")
         actor_info = f", actor={user_id}/{role}"
 
-    logger.warning(
+    _emit(
+        logger.warning,
         "DENY: client=%s, entity=%s, service=%s, reason=%s%s",
         client_id,
         entity_id,
@@ -27,7 +27,7 @@ from .const import (
     TRUST_PROXY_AUTO,
     TRUST_PROXY_NEVER,
 )
-from .utils import parse_allowed_networks
+from .utils import compile_allowed_networks
 
 if TYPE_CHECKING:
     pass
@@ -35,6 +35,9 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+# Parsed once; checked on every request in trust_proxy auto mode.
+_PRIVATE_NETWORKS = tuple(ipaddress.ip_network(cidr) for cidr in PRIVATE_IP_RANGES)
+
 
 @dataclass
 class AuthResult:
@@ -102,28 +105,31 @@ class RateLimiter:
         self._max_requests = max_requests
         self._window = window_seconds
         self._requests: dict[str, list[float]] = {}
-        self._lock = asyncio.Lock()
 
-    async def check(self, client_id: str) -> bool:
-        """Check if request is allowed. Returns True if allowed."""
-        async with self._lock:
-            now = time.time()
-            window_start = now - self._window
+    async def check(self, client_id: str, cost: int = 1) -> bool:
+        """Check if request is allowed. Returns True if allowed.
 
-            # Get or create request list for client
-            if client_id not in self._requests:
-                self._requests[client_id] = []
+        ``cost`` charges several requests at once for endpoints whose work
+        grows with the request, e.g. batch history per queried entity.
+        """
+        # check() never awaits, so each call runs atomically on the event loop.
+        now = time.time()
+        window_start = now - self._window
 
-            # Remove old requests outside the window
-            self._requests[client_id] = [t for t in self._requests[client_id] if t > window_start]
+        # Get or create request list for client
+        if client_id not in self._requests:
+            self._requests[client_id] = []
 
-            # Check if under limit
-            if len(self._requests[client_id]) >= self._max_requests:
-                return False
+        # Remove old requests outside the window
+        self._requests[client_id] = [t for t in self._requests[client_id] if t > window_start]
 
-            # Add current request
-            self._requests[client_id].append(now)
-            return True
+        # Check if under limit
+        if len(self._requests[client_id]) + cost > self._max_requests:
+            return False
+
+        # Add current request
+        self._requests[client_id].extend([now] * cost)
+        return True
 
     def get_remaining(self, client_id: str) -> int:
         """Get remaining requests in current window."""
@@ -191,16 +197,9 @@ def _is_private_ip(ip_str: str) -> bool:
     """
     try:
         ip = ipaddress.ip_address(ip_str)
-        for cidr in PRIVATE_IP_RANGES:
-            try:
-                network = ipaddress.ip_network(cidr)
-                if ip in network:
-                    return True
-            except ValueError:
-                continue
-        return False
     except ValueError:
         return False
+    return any(ip in network for network in _PRIVATE_NETWORKS)
 
 
 def _should_trust_proxy(request: web.Request, allowed_cidrs: str) -> bool:
@@ -236,7 +235,7 @@ def _should_trust_proxy(request: web.Request, allowed_cidrs: str) -> bool:
         return False
 
     try:
-        for network in parse_allowed_networks(allowed_cidrs):
+        for network in compile_allowed_networks(allowed_cidrs):
             # If whitelist contains non-private IPs, assume proxy is used
             if not network.is_private:
                 return True
@@ -257,7 +256,7 @@ def check_ip(
     try:
         ip = ipaddress.ip_address(client_ip)
 
-        for network in parse_allowed_networks(allowed_cidrs):
+        for network in compile_allowed_networks(allowed_cidrs):
             if ip in network:
                 return True
 
@@ -42,12 +42,17 @@ RATE_WINDOW = 60  # seconds (1 minute)
 
 # Database query limits
 MAX_CONCURRENT_HISTORY_QUERIES = 5  # 最大並發歷史查詢數
+HISTORY_METADATA_CACHE_TTL = 300  # 5 minutes - cursor page metadata source
 
 # HMAC authentication
 TIMESTAMP_TOLERANCE = 30  # seconds
 NONCE_TTL = 300  # 5 minutes
 RAW_DIAGNOSTIC_TTL = 300  # 5 minutes
 
+# Audit logging
+AUDIT_QUEUE_MAXSIZE = 1024  # pending audit records before new ones are dropped
+AUDIT_BATCH_SIZE = 64  # records written per audit writer wake-up
+
 # Push retry
 PUSH_RETRY_MAX = 3
 PUSH_RETRY_BACKOFF_BASE = 2  # exponential backoff base
@@ -136,7 +141,19 @@ API_PATH_STATISTICS = "/api/smartly/statistics/{entity_id}"
 HISTORY_MAX_DURATION_DAYS = 30  # 最大查詢天數
 HISTORY_DEFAULT_LIMIT = 1000  # 預設最大筆數
 HISTORY_MAX_ENTITIES_BATCH = 50  # 批次查詢最大實體數
+HISTORY_BATCH_ENTITIES_PER_RATE_COST = 10  # 批次查詢每多少個實體額外計一次速率限制
 HISTORY_DEFAULT_HOURS = 24  # 預設查詢時數
+HISTORY_EXECUTOR_ROW_THRESHOLD = 200  # 超過此筆數改在 executor 格式化與序列化
+HISTORY_STREAM_ROW_THRESHOLD = 5000  # 批次歷史超過此筆數改以串流逐實體回應
+HISTORY_CACHE_TTL = 30  # 歷史查詢視窗快取秒數
+HISTORY_CACHE_MAXSIZE = 128  # 最多快取的歷史查詢視窗數
+HISTORY_CACHE_BUCKET_SECONDS = 5  # 查詢起訖時間以此秒數分桶作為快取鍵
+HISTORY_ALIGN_MIN_HOURS = 1  # 超過此時數的查詢，起訖時間向下對齊至快取分桶
+HISTORY_TAIL_PROBE_HOURS = 24  # 長時段有筆數上限時，先查最近此時數的資料
+STATISTICS_CACHE_TTL = 30  # 統計查詢結果快取秒數
+STATISTICS_CACHE_MAXSIZE = 256  # 最多快取的統計查詢數
+# Recorder 完成每小時統計時觸發，用於清除統計快取
+EVENT_RECORDER_HOURLY_STATISTICS_GENERATED = "recorder_hourly_statistics_generated"
 
 # Camera settings
 CAMERA_CACHE_TTL = 10.0  # seconds - snapshot cache time-to-live
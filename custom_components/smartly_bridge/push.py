@@ -196,7 +196,7 @@ class StatePushManager:
 
     async def _bridge_chart_for_state(self, entity_id: str, state: State) -> dict[str, Any] | None:
         """Return recent bridge chart history for an eligible sensor."""
-        attributes = format_numeric_attributes(dict(state.attributes))
+        attributes = format_numeric_attributes(state.attributes)
         device_class = attributes.get("device_class")
         unit = attributes.get("unit_of_measurement")
         fallback_timestamp = state.last_updated.isoformat() if state.last_updated else None
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import ipaddress
 import re
+from collections.abc import Mapping
 from datetime import date, datetime, timezone
+from functools import lru_cache
 from typing import Any
 
 from .const import (
@@ -52,6 +54,18 @@ def parse_allowed_networks(
     return networks
 
 
+@lru_cache(maxsize=32)
+def compile_allowed_networks(
+    allowed_cidrs: str,
+) -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    """Return parsed CIDR ranges, parsing each whitelist string only once.
+
+    The whitelist only changes with the config entry, but every request checks
+    it. Invalid ranges raise ValueError like parse_allowed_networks.
+    """
+    return tuple(parse_allowed_networks(allowed_cidrs))
+
+
 def _wildcard_to_cidr(ip_range: str) -> str:
     """Convert ranges like 10.* or 192.168.* to IPv4 CIDR notation."""
     parts = ip_range.split(".")
@@ -76,7 +90,8 @@ def _wildcard_to_cidr(ip_range: str) -> str:
 
 def signal_attribute_key_for_entity(entity_id: str) -> str | None:
     """Return the signal attribute represented by a diagnostic entity id."""
-    object_id = entity_id.split(".", 1)[-1].lower()
+    domain, separator, object_id = entity_id.partition(".")
+    object_id = (object_id if separator else domain).lower()
     for suffix, key in SIGNAL_ENTITY_SUFFIXES.items():
         if object_id.endswith(suffix):
             return key
@@ -114,32 +129,41 @@ def get_decimal_places(key: str, unit: str = "") -> int | None:
     return None
 
 
-def format_numeric_attributes(attributes: dict[str, Any]) -> dict[str, Any]:
+def format_numeric_attributes(attributes: Mapping[str, Any]) -> dict[str, Any]:
     """Format numeric attributes with configurable decimal places.
 
     Formats common electrical measurements (voltage, current, power, etc.)
     with appropriate decimal places based on units for cleaner API responses.
+    The input mapping is never mutated, so read-only State attributes can be
+    passed without copying.
     """
     unit = attributes.get("unit_of_measurement", "")
 
-    formatted = attributes.copy()
-    _normalize_signal_attributes(formatted)
-
-    for attr in NUMERIC_PRECISION_CONFIG:
-        if attr in formatted and isinstance(formatted[attr], (int, float)):
-            try:
-                decimal_places = get_decimal_places(attr, unit)
-                if decimal_places is not None:
-                    formatted[attr] = round(float(formatted[attr]), decimal_places)
-            except (ValueError, TypeError):
-                pass  # Keep original value if conversion fails
+    signal_attributes = _signal_attributes(attributes)
+    items = {**attributes, **signal_attributes}.items() if signal_attributes else attributes.items()
 
+    # One pass builds the result; the (usually short) attribute dict is walked
+    # rather than the whole precision table.
     return {
-        key: _json_safe_attribute_value(_redacted_attribute_value(key, value))
-        for key, value in formatted.items()
+        key: _json_safe_attribute_value(
+            _redacted_attribute_value(key, _rounded_attribute_value(key, value, unit))
+        )
+        for key, value in items
     }
 
 
+def _rounded_attribute_value(attr: str, value: Any, unit: str) -> Any:
+    """Return a numeric attribute rounded to its configured precision."""
+    if attr in NUMERIC_PRECISION_CONFIG and isinstance(value, (int, float)):
+        try:
+            decimal_places = get_decimal_places(attr, unit)
+            if decimal_places is not None:
+                return round(float(value), decimal_places)
+        except (ValueError, TypeError):
+            pass  # Keep original value if conversion fails
+    return value
+
+
 def _redacted_attribute_value(key: object, value: Any) -> Any:
     """Return an attribute value with obvious secrets and IP addresses redacted."""
     if _is_sensitive_attribute_key(key):
@@ -181,18 +205,20 @@ def _contains_ip_address(value: str) -> bool:
     return True
 
 
-def _normalize_signal_attributes(attributes: dict[str, Any]) -> None:
-    """Expose common signal quality aliases through stable Platform fields."""
+def _signal_attributes(attributes: Mapping[str, Any]) -> dict[str, Any]:
+    """Return stable Platform fields for common signal quality aliases."""
     if "signal_strength" in attributes:
-        attributes.setdefault("signal_unit", _signal_unit_for_key("signal_strength"))
-        return
+        if "signal_unit" in attributes:
+            return {}
+        return {"signal_unit": _signal_unit_for_key("signal_strength")}
 
     for key in ("rssi", "linkquality", "link_quality", "lqi"):
-        if key not in attributes:
-            continue
-        attributes["signal_strength"] = attributes[key]
-        attributes["signal_unit"] = _signal_unit_for_key(key)
-        return
+        if key in attributes:
+            return {
+                "signal_strength": attributes[key],
+                "signal_unit": _signal_unit_for_key(key),
+            }
+    return {}
 
 
 def _signal_unit_for_key(key: str) -> str:
@@ -396,6 +422,11 @@ def _serialize_timestamp(value: Any) -> str | None:
 def _timestamp_key(value: str) -> str:
     """Return a stable key for equivalent ISO timestamps."""
     try:
-        return str(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+        # Recorder timestamps parse natively; only odd "Z" forms need the rewrite.
+        parsed = datetime.fromisoformat(value)
     except ValueError:
-        return value
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+    return str(parsed.timestamp())
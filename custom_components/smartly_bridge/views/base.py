@@ -9,6 +9,13 @@ from ..const import CONF_CLIENT_SECRET, DOMAIN
 if TYPE_CHECKING:
     from aiohttp import web
 
+    from ..auth import AuthResult
+
+
+def auth_client_id(auth_result: AuthResult) -> str:
+    """Return the client id used for rate limiting and audit logs."""
+    return auth_result.client_id or "unknown"
+
 
 class BaseView:
     """Base class for all Smartly Bridge views."""
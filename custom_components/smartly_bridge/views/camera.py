@@ -13,6 +13,7 @@ from typing import Any, Callable
 
 from aiohttp import web
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.helpers.json import json_bytes
 
 from ..acl import is_entity_allowed
 from ..application.camera import (
@@ -64,10 +65,11 @@ def _json_response(
     headers: dict[str, str] | None = None,
 ) -> web.Response:
     """Return a camera JSON response with optional request context."""
-    return web.json_response(
-        _with_request_context(result_body, request),
+    return web.Response(
+        body=json_bytes(_with_request_context(result_body, request)),
         status=status,
         headers=headers,
+        content_type="application/json",
     )
 
 
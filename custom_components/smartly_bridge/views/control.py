@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, Any
 
 from aiohttp import web
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.helpers.json import json_bytes
 
 from ..application.control import (
     SmartlyCommand,
@@ -24,12 +25,16 @@ from ..const import (
     DOMAIN,
     RATE_WINDOW,
 )
+from .base import auth_client_id
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
 _LOGGER = logging.getLogger(__name__)
 
+# Shared 429 headers; aiohttp copies them into each response.
+_RATE_LIMIT_HEADERS = {"Retry-After": str(RATE_WINDOW), "X-RateLimit-Remaining": "0"}
+
 
 def _smartly_command_from_body(body: dict[str, Any]) -> SmartlyCommand | None:
     """Return API vNext SmartlyCommand when the body uses canonical command shape."""
@@ -69,10 +74,12 @@ def _json_response(
     headers: dict[str, str] | None = None,
 ) -> web.Response:
     """Return a control JSON response with optional request context."""
-    return web.json_response(
-        _with_request_context(result_body, request),
+    # Encode with Home Assistant's orjson-backed encoder instead of json.dumps.
+    return web.Response(
+        body=json_bytes(_with_request_context(result_body, request)),
         status=status,
         headers=headers,
+        content_type="application/json",
     )
 
 
@@ -90,51 +97,39 @@ def _smartly_command_executor(
     return runtime_adapters.get("smartly_command_executor")
 
 
-class SmartlyControlView(web.View):
+class SmartlyControlViewWrapper(HomeAssistantView):
     """Handle POST /api/smartly/control requests."""
 
-    def __init__(self, request: web.Request) -> None:
-        """Initialize the view."""
-        super().__init__(request)
-        self.hass: HomeAssistant = request.app["hass"]
-
-    def _get_integration_data(self) -> dict[str, Any] | None:
-        """Get integration config entry data."""
-        if DOMAIN not in self.hass.data:
-            return None
-
-        config_entry = self.hass.data[DOMAIN].get("config_entry")
-        if config_entry:
-            return config_entry.data
-
-        return None
-
-    def _smartly_command_executor(self) -> Any:
-        """Return the setup-created canonical command executor."""
-        return _smartly_command_executor(self.hass)
+    url = API_PATH_CONTROL
+    name = "api:smartly:control"
+    requires_auth = False  # We handle auth ourselves via HMAC
 
-    async def post(self) -> web.Response:
+    async def post(self, request: web.Request) -> web.Response:
         """Handle control request from Platform."""
+        hass: HomeAssistant = request.app["hass"]
+
         # Get integration data
-        data = self._get_integration_data()
-        if data is None:
+        domain_data = hass.data.get(DOMAIN)
+        config_entry = domain_data.get("config_entry") if domain_data else None
+        if not config_entry:
             result = control_error_response("integration_not_configured", status=500)
             return _json_response(
                 result.body,
-                self.request,
+                request,
                 status=result.status,
                 headers=result.headers,
             )
 
+        data = config_entry.data
         client_secret = data.get(CONF_CLIENT_SECRET)
         allowed_cidrs = data.get(CONF_ALLOWED_CIDRS, "")
         trust_proxy_mode = data.get(CONF_TRUST_PROXY, DEFAULT_TRUST_PROXY)
-        nonce_cache = self.hass.data[DOMAIN]["nonce_cache"]
-        rate_limiter: RateLimiter = self.hass.data[DOMAIN]["rate_limiter"]
+        nonce_cache = domain_data["nonce_cache"]
+        rate_limiter: RateLimiter = domain_data["rate_limiter"]
 
         # Verify authentication
         auth_result = await verify_request(
-            self.request,
+            request,
             client_secret,
             nonce_cache,
             allowed_cidrs,
@@ -145,7 +140,7 @@ class SmartlyControlView(web.View):
             error = auth_result.error or "auth_failed"
             log_deny(
                 _LOGGER,
-                client_id=self.request.headers.get("X-Client-Id", "unknown"),
+                client_id=request.headers.get("X-Client-Id", "unknown"),
                 entity_id="",
                 service="",
                 reason=error,
@@ -153,16 +148,18 @@ class SmartlyControlView(web.View):
             result = control_error_response(error, status=401)
             return _json_response(
                 result.body,
-                self.request,
+                request,
                 status=result.status,
                 headers=result.headers,
             )
 
+        client_id = auth_client_id(auth_result)
+
         # Check rate limit
-        if not await rate_limiter.check(auth_result.client_id or ""):
+        if not await rate_limiter.check(client_id):
             log_deny(
                 _LOGGER,
-                client_id=auth_result.client_id or "unknown",
+                client_id=client_id,
                 entity_id="",
                 service="",
                 reason="rate_limited",
@@ -170,30 +167,30 @@ class SmartlyControlView(web.View):
             result = control_error_response("rate_limited", status=429)
             return _json_response(
                 result.body,
-                self.request,
+                request,
                 status=result.status,
-                headers={
-                    "Retry-After": str(RATE_WINDOW),
-                    "X-RateLimit-Remaining": "0",
-                    **result.headers,
-                },
+                headers=(
+                    {**_RATE_LIMIT_HEADERS, **result.headers}
+                    if result.headers
+                    else _RATE_LIMIT_HEADERS
+                ),
             )
 
         # Parse request body
         try:
-            body = await self.request.json()
+            body = await request.json()
         except json.JSONDecodeError:
             result = control_error_response("invalid_json", status=400)
             return _json_response(
                 result.body,
-                self.request,
+                request,
                 status=result.status,
                 headers=result.headers,
             )
 
         smartly_command = _smartly_command_from_body(body)
         if smartly_command is not None:
-            executor = self._smartly_command_executor()
+            executor = _smartly_command_executor(hass)
             if executor is None:
                 result = control_error_response(
                     "smartly_command_executor_unavailable",
@@ -201,18 +198,18 @@ class SmartlyControlView(web.View):
                 )
                 return _json_response(
                     result.body,
-                    self.request,
+                    request,
                     status=result.status,
                     headers=result.headers,
                 )
             result = await _execute_smartly_command(
                 executor,
-                auth_result.client_id or "unknown",
+                client_id,
                 smartly_command,
             )
             return _json_response(
                 result.body,
-                self.request,
+                request,
                 status=result.status,
                 headers=result.headers,
             )
@@ -220,20 +217,7 @@ class SmartlyControlView(web.View):
         result = control_error_response("missing_required_fields", status=400)
         return _json_response(
             result.body,
-            self.request,
+            request,
             status=result.status,
             headers=result.headers,
         )
-
-
-class SmartlyControlViewWrapper(HomeAssistantView):
-    """Wrapper for SmartlyControlView to work with HA's view registration."""
-
-    url = API_PATH_CONTROL
-    name = "api:smartly:control"
-    requires_auth = False  # We handle auth ourselves via HMAC
-
-    async def post(self, request: web.Request) -> web.Response:
-        """Handle POST request."""
-        view = SmartlyControlView(request)
-        return await view.post()
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Any, Callable
 
 from aiohttp import web
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.helpers.json import json_bytes
 
 from ..application.device_events import (
     DeviceEventCommand,
@@ -41,9 +42,13 @@ def _is_valid_timestamp(value: Any) -> bool:
         return False
 
     try:
-        datetime.fromisoformat(value.replace("Z", "+00:00"))
+        datetime.fromisoformat(value)
     except ValueError:
-        return False
+        # Python parses a trailing "Z" natively; keep accepting other "Z" forms.
+        try:
+            datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return False
     return True
 
 
@@ -203,10 +208,11 @@ def _json_response(
     headers: dict[str, str] | None = None,
 ) -> web.Response:
     """Return a device event JSON response with optional request context."""
-    return web.json_response(
-        _with_request_context(result_body, request),
+    return web.Response(
+        body=json_bytes(_with_request_context(result_body, request)),
         status=status,
         headers=headers,
+        content_type="application/json",
     )
 
 
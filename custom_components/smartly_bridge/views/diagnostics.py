@@ -6,6 +6,7 @@ from typing import Any, Callable
 
 from aiohttp import web
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.helpers.json import json_bytes
 
 from ..application.diagnostics import RawDiagnosticFetchUseCase, raw_diagnostic_error_response
 from ..auth import RateLimiter, verify_request
@@ -41,10 +42,12 @@ def _json_response(
     headers: dict[str, str] | None = None,
 ) -> web.Response:
     """Return a raw diagnostic JSON response with optional request context."""
-    return web.json_response(
-        _with_request_context(result_body, request),
+    # Raw diagnostic payloads can be large; encode with HA's orjson encoder.
+    return web.Response(
+        body=json_bytes(_with_request_context(result_body, request)),
         status=status,
         headers=headers,
+        content_type="application/json",
     )
 
 
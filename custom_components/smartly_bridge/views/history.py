@@ -10,15 +10,29 @@ from __future__ import annotations
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Callable
+from functools import partial
+from typing import Any, Awaitable, Callable
 
+import orjson
 from aiohttp import web
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.http import HomeAssistantView
+from homeassistant.helpers.json import json_bytes
 from homeassistant.util import dt as dt_util
 
-from ..acl import is_entity_allowed
+from ..acl import is_entity_allowed, partition_allowed_entities
 from ..application.history import (
+    BATCH_GROUP_BY_ENTITY,
+    BATCH_GROUP_BY_FIELD,
+    BATCH_GROUP_BYS,
+    HISTORY_FORMAT_COLUMN,
+    HISTORY_FORMAT_ROW,
+    HISTORY_FORMATS,
+    STATISTICS_PERIODS,
+    TIMESTAMP_ENCODING_DOD,
+    TIMESTAMP_ENCODING_ISO,
+    TIMESTAMP_ENCODINGS,
     BatchHistoryQuery,
     BatchHistoryUseCase,
     HistoryMetadataBuilder,
@@ -44,26 +58,49 @@ from ..const import (
     CONF_TRUST_PROXY,
     DEFAULT_TRUST_PROXY,
     DOMAIN,
+    HISTORY_BATCH_ENTITIES_PER_RATE_COST,
     HISTORY_DEFAULT_HOURS,
     HISTORY_DEFAULT_LIMIT,
+    HISTORY_EXECUTOR_ROW_THRESHOLD,
     HISTORY_MAX_ENTITIES_BATCH,
+    HISTORY_STREAM_ROW_THRESHOLD,
     MAX_CONCURRENT_HISTORY_QUERIES,
     RATE_WINDOW,
 )
+from .base import auth_client_id
 
 _LOGGER = logging.getLogger(__name__)
 _HISTORY_FORMATTER = HistoryResponseFormatter()
 _HISTORY_METADATA_BUILDER = HistoryMetadataBuilder()
+_HISTORY_PLANNER = HistoryQueryPlanner()
 
-# Semaphore for limiting concurrent database queries
-_history_query_semaphore: asyncio.Semaphore | None = None
+# Static statistics rejections; _json_response copies the envelope before
+# adding request context, so the shared bodies are never mutated.
+_STATISTICS_ENTITY_ID_REQUIRED = _history_error_response(
+    "entity_id_required", status=400, target="statistics.entity_id"
+)
+_STATISTICS_ENTITY_NOT_ALLOWED = _history_error_response(
+    "entity_not_allowed", status=403, target="statistics.entity_id"
+)
+_STATISTICS_INVALID_PERIOD = _history_error_response(
+    "invalid_period", status=400, target="statistics.period"
+)
+
+# Semaphore for limiting concurrent database queries. asyncio primitives bind to
+# the running loop lazily on Python 3.10+, so it is safe to build at import.
+_history_query_semaphore = asyncio.Semaphore(MAX_CONCURRENT_HISTORY_QUERIES)
+
+# Encoded bodies of the shared (memoized) error responses, keyed by identity.
+_ERROR_BODY_CACHE_MAXSIZE = 128
+_encoded_error_bodies: dict[int, tuple[dict[str, Any], bytes]] = {}
+
+# Encoded batch metadata per entity, valid while the use case keeps returning
+# the same cached metadata object.
+_metadata_json_cache: dict[str, tuple[dict[str, Any], orjson.Fragment]] = {}
 
 
 def _get_history_semaphore() -> asyncio.Semaphore:
-    """Get or create the history query semaphore."""
-    global _history_query_semaphore
-    if _history_query_semaphore is None:
-        _history_query_semaphore = asyncio.Semaphore(MAX_CONCURRENT_HISTORY_QUERIES)
+    """Return the history query semaphore."""
     return _history_query_semaphore
 
 
@@ -109,16 +146,252 @@ def _json_response(
     headers: dict[str, str] | None = None,
 ) -> web.Response:
     """Return a history JSON response with optional request context."""
-    return web.json_response(
-        _with_request_context(result_body, request),
+    # History pages can hold thousands of rows; encode with HA's orjson encoder.
+    return web.Response(
+        body=_encode_body(result_body, request, status),
+        status=status,
+        headers=headers,
+        content_type="application/json",
+    )
+
+
+def _encode_body(result_body: dict[str, Any], request: web.Request, status: int) -> bytes:
+    """Encode a response body, reusing the bytes of shared error bodies.
+
+    Rejections come from the memoized ``_history_error_response``; without
+    request correlation headers their encoding never changes.
+    """
+    if status < 400 or "X-Request-Id" in request.headers or "X-Correlation-Id" in request.headers:
+        return json_bytes(_with_request_context(result_body, request))
+    cached = _encoded_error_bodies.get(id(result_body))
+    if cached is not None and cached[0] is result_body:
+        return cached[1]
+    encoded = json_bytes(result_body)
+    if len(_encoded_error_bodies) < _ERROR_BODY_CACHE_MAXSIZE:
+        # Holding the body keeps its id from being reused by another object.
+        _encoded_error_bodies[id(result_body)] = (result_body, encoded)
+    return encoded
+
+
+def _encoded_metadata(entity_id: str, metadata: dict[str, Any]) -> orjson.Fragment:
+    """Return an entity's metadata as pre-encoded JSON for orjson to splice in."""
+    cached = _metadata_json_cache.get(entity_id)
+    if cached is not None and cached[0] is metadata:
+        return cached[1]
+    fragment = orjson.Fragment(json_bytes(metadata))
+    _metadata_json_cache[entity_id] = (metadata, fragment)
+    return fragment
+
+
+def _with_encoded_metadata(result_body: dict[str, Any]) -> dict[str, Any]:
+    """Swap batch metadata for encoded fragments so polling never re-serializes it."""
+    data = result_body.get("data")
+    if not isinstance(data, dict):
+        return result_body
+    results = data.get("results")
+    if isinstance(results, dict):
+        encoded_results = {
+            entity_id: (
+                {**entry, "metadata": _encoded_metadata(entity_id, entry["metadata"])}
+                if "metadata" in entry
+                else entry
+            )
+            for entity_id, entry in results.items()
+        }
+        return {**result_body, "data": {**data, "results": encoded_results}}
+    metadata = data.get("metadata")
+    if isinstance(metadata, dict):
+        encoded = {
+            entity_id: _encoded_metadata(entity_id, entity_metadata)
+            for entity_id, entity_metadata in metadata.items()
+        }
+        return {**result_body, "data": {**data, "metadata": encoded}}
+    return result_body
+
+
+def _history_row_count(result_body: dict[str, Any]) -> int:
+    """Return how many history rows a response body carries."""
+    data = result_body.get("data")
+    if not isinstance(data, dict):
+        return 0
+    results = data.get("results")
+    if isinstance(results, dict):
+        return sum(entry.get("count", 0) for entry in results.values())
+    count = data.get("count")
+    if isinstance(count, dict):
+        return sum(count.values())
+    return count if isinstance(count, int) else 0
+
+
+async def _async_json_response(
+    hass: HomeAssistant,
+    result_body: dict[str, Any],
+    request: web.Request,
+    *,
+    status: int,
+    headers: dict[str, str] | None = None,
+) -> web.Response:
+    """Return a history JSON response, encoding large bodies in the executor."""
+    if _history_row_count(result_body) <= HISTORY_EXECUTOR_ROW_THRESHOLD:
+        return _json_response(result_body, request, status=status, headers=headers)
+
+    # Encoding thousands of rows would block every other request on the loop.
+    body = await hass.async_add_executor_job(
+        json_bytes, _with_request_context(result_body, request)
+    )
+    return web.Response(
+        body=body,
         status=status,
         headers=headers,
+        content_type="application/json",
     )
 
 
-def _single_history_use_case(gateway: Any) -> SingleHistoryUseCase:
+async def _stream_batch_json_response(
+    hass: HomeAssistant,
+    result_body: dict[str, Any],
+    request: web.Request,
+    *,
+    status: int,
+    headers: dict[str, str] | None = None,
+) -> web.StreamResponse:
+    """Stream a batch history response one entity at a time.
+
+    Each entity's rows are encoded in the executor and written as soon as they
+    are ready, so sending overlaps encoding and no single buffer holds the
+    whole payload.
+    """
+    envelope = _with_request_context(result_body, request)
+    data = dict(envelope.pop("data"))
+    # Per-entity payloads live under "history", or "results" with group_by=entity.
+    section = "results" if "results" in data else "history"
+    entities = data.pop(section)
+
+    response = web.StreamResponse(status=status, headers=headers)
+    response.content_type = "application/json"
+    await response.prepare(request)
+
+    await response.write(b'{"data":{"' + section.encode() + b'":{')
+    separator = b""
+    for entity_id, payload in entities.items():
+        encoded_payload = await hass.async_add_executor_job(json_bytes, payload)
+        await response.write(separator + json_bytes(entity_id) + b":" + encoded_payload)
+        separator = b","
+    # Remaining fields are small; splice their encoded members after the entities.
+    await response.write(b"}," + json_bytes(data)[1:] + b"," + json_bytes(envelope)[1:])
+    await response.write_eof()
+    return response
+
+
+async def _authorize_history_request(
+    request: web.Request,
+    hass: Any,
+    *,
+    service: str,
+    target: str,
+) -> AuthResult | web.Response:
+    """Authorize a history API request and return its auth result or an error response."""
+    integration_data = hass.data.get(DOMAIN)
+    config_entry = integration_data.get("config_entry") if integration_data else None
+    if config_entry is None:
+        result = _history_error_response(
+            "integration_not_configured",
+            status=500,
+            target=f"{target}.integration",
+        )
+        return _json_response(result.body, request, status=result.status, headers=result.headers)
+
+    data = config_entry.data
+    client_secret = data.get(CONF_CLIENT_SECRET)
+    if not client_secret:
+        result = _history_error_response(
+            "client_secret_not_configured",
+            status=500,
+            target=f"{target}.config",
+        )
+        return _json_response(result.body, request, status=result.status, headers=result.headers)
+
+    auth_result = await verify_request(
+        request,
+        client_secret,
+        integration_data["nonce_cache"],
+        data.get(CONF_ALLOWED_CIDRS, ""),
+        data.get(CONF_TRUST_PROXY, DEFAULT_TRUST_PROXY),
+    )
+    if not auth_result.success:
+        log_deny(
+            _LOGGER,
+            client_id=request.headers.get("X-Client-Id", "unknown"),
+            entity_id="",
+            service=service,
+            reason=auth_result.error or "auth_failed",
+        )
+        result = _history_error_response(
+            auth_result.error or "auth_failed",
+            status=401,
+            target=f"{target}.auth",
+        )
+        return _json_response(result.body, request, status=result.status, headers=result.headers)
+
+    rate_limiter: RateLimiter = integration_data["rate_limiter"]
+    if not await rate_limiter.check(auth_client_id(auth_result)):
+        return _rate_limited_response(request, auth_result, service=service, target=target)
+
+    return auth_result
+
+
+def _rate_limited_response(
+    request: web.Request,
+    auth_result: AuthResult,
+    *,
+    service: str,
+    target: str,
+) -> web.Response:
+    """Log and return a history API 429 response."""
+    log_deny(
+        _LOGGER,
+        client_id=auth_client_id(auth_result),
+        entity_id="",
+        service=service,
+        reason="rate_limited",
+    )
+    result = _history_error_response(
+        "rate_limited",
+        status=429,
+        target=f"{target}.rate_limit",
+    )
+    return _json_response(
+        result.body,
+        request,
+        status=result.status,
+        headers={
+            **result.headers,
+            "Retry-After": str(RATE_WINDOW),
+            "X-RateLimit-Remaining": "0",
+        },
+    )
+
+
+def _parse_history_layout(history_format: Any, encoding: Any) -> tuple[bool, bool] | None:
+    """Return (columnar, dod_timestamps) for the requested layout, or None if invalid.
+
+    Delta-of-delta timestamps only exist in the columnar layout.
+    """
+    if history_format not in HISTORY_FORMATS or encoding not in TIMESTAMP_ENCODINGS:
+        return None
+    columnar = history_format == HISTORY_FORMAT_COLUMN
+    dod_timestamps = encoding == TIMESTAMP_ENCODING_DOD
+    if dod_timestamps and not columnar:
+        return None
+    return columnar, dod_timestamps
+
+
+def _single_history_use_case(
+    gateway: Any,
+    executor: Callable[..., Awaitable[Any]] | None = None,
+) -> SingleHistoryUseCase:
     """Build the single history application use case."""
-    return SingleHistoryUseCase(gateway)
+    return SingleHistoryUseCase(gateway, executor=executor)
 
 
 async def _query_single_history(
@@ -130,9 +403,12 @@ async def _query_single_history(
     return await use_case_factory(gateway).execute(query)
 
 
-def _batch_history_use_case(gateway: Any) -> BatchHistoryUseCase:
+def _batch_history_use_case(
+    gateway: Any,
+    executor: Callable[..., Awaitable[Any]] | None = None,
+) -> BatchHistoryUseCase:
     """Build the batch history application use case."""
-    return BatchHistoryUseCase(gateway)
+    return BatchHistoryUseCase(gateway, executor=executor)
 
 
 async def _query_batch_history(
@@ -166,7 +442,7 @@ def _encode_cursor(timestamp: str, last_changed: str) -> str:
         last_changed: ISO 8601 last_changed timestamp
 
     Returns:
-        Base64 encoded cursor string
+        Cursor string in ``ts~lc`` form
     """
     return encode_cursor(timestamp, last_changed)
 
@@ -175,7 +451,7 @@ def _decode_cursor(cursor: str) -> dict[str, str] | None:
     """Decode cursor for pagination.
 
     Args:
-        cursor: Base64 encoded cursor string
+        cursor: Cursor string in ``ts~lc`` form
 
     Returns:
         Dict with timestamp and last_changed, or None if invalid
@@ -209,7 +485,7 @@ def _get_entity_metadata(
     if hass is not None:
         current_state = hass.states.get(entity_id)
         if current_state and current_state.attributes:
-            current_attributes = dict(current_state.attributes)
+            current_attributes = current_state.attributes
 
     return _HISTORY_METADATA_BUILDER.build(
         entity_id,
@@ -283,18 +559,7 @@ class SmartlyHistoryView(web.View):
         """Initialize the view."""
         super().__init__(request)
         self.hass: HomeAssistant = request.app["hass"]
-        self._history_planner = HistoryQueryPlanner()
-
-    def _get_integration_data(self) -> dict[str, Any] | None:
-        """Get integration config entry data."""
-        if DOMAIN not in self.hass.data:
-            return None
-
-        config_entry = self.hass.data[DOMAIN].get("config_entry")
-        if config_entry:
-            return config_entry.data
-
-        return None
+        self._history_planner = _HISTORY_PLANNER
 
     def _parse_pagination_params(
         self, query, start_time: datetime, end_time: datetime
@@ -339,94 +604,9 @@ class SmartlyHistoryView(web.View):
             cursor_data,
             page_size,
             use_pagination,
-            _format_state,
+            _HISTORY_FORMATTER.last_changed_timestamp,
         )
 
-    async def _verify_auth_and_rate_limit(
-        self, data: dict[str, Any]
-    ) -> tuple[AuthResult, web.Response | None]:
-        """Verify authentication and rate limit.
-
-        Returns:
-            Tuple of (auth_result, error_response). If error_response is not None, return it.
-            If error_response is None, auth_result will be valid.
-        """
-        client_secret = data.get(CONF_CLIENT_SECRET)
-        if not client_secret:
-            # This should never happen as we check in get(), but handle defensively
-            dummy_auth = AuthResult(success=False, error="client_secret_not_configured")
-            result = _history_error_response(
-                "client_secret_not_configured",
-                status=500,
-                target="history.config",
-            )
-            return dummy_auth, _json_response(
-                result.body,
-                self.request,
-                status=result.status,
-                headers=result.headers,
-            )
-
-        allowed_cidrs = data.get(CONF_ALLOWED_CIDRS, "")
-        trust_proxy_mode = data.get(CONF_TRUST_PROXY, DEFAULT_TRUST_PROXY)
-        nonce_cache = self.hass.data[DOMAIN]["nonce_cache"]
-        rate_limiter: RateLimiter = self.hass.data[DOMAIN]["rate_limiter"]
-
-        # Verify authentication
-        auth_result = await verify_request(
-            self.request,
-            client_secret,
-            nonce_cache,
-            allowed_cidrs,
-            trust_proxy_mode,
-        )
-
-        if not auth_result.success:
-            log_deny(
-                _LOGGER,
-                client_id=self.request.headers.get("X-Client-Id", "unknown"),
-                entity_id="",
-                service="history",
-                reason=auth_result.error or "auth_failed",
-            )
-            result = _history_error_response(
-                auth_result.error or "auth_failed",
-                status=401,
-                target="history.auth",
-            )
-            return auth_result, _json_response(
-                result.body,
-                self.request,
-                status=result.status,
-                headers=result.headers,
-            )
-
-        # Check rate limit
-        if not await rate_limiter.check(auth_result.client_id or ""):
-            log_deny(
-                _LOGGER,
-                client_id=auth_result.client_id or "unknown",
-                entity_id="",
-                service="history",
-                reason="rate_limited",
-            )
-            result = _history_error_response(
-                "rate_limited",
-                status=429,
-                target="history.rate_limit",
-            )
-            return auth_result, _json_response(
-                result.body,
-                self.request,
-                status=result.status,
-                headers={
-                    "Retry-After": str(RATE_WINDOW),
-                    "X-RateLimit-Remaining": "0",
-                },
-            )
-
-        return auth_result, None
-
     def _validate_time_range(self, start_time: datetime, end_time: datetime) -> web.Response | None:
         """Validate time range parameters.
 
@@ -463,32 +643,11 @@ class SmartlyHistoryView(web.View):
 
     async def get(self) -> web.Response:
         """Handle history query request."""
-        # Get integration data
-        data = self._get_integration_data()
-        if data is None:
-            result = _history_error_response(
-                "integration_not_configured",
-                status=500,
-                target="history.integration",
-            )
-            return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
-            )
-
-        if not data.get(CONF_CLIENT_SECRET):
-            result = _history_error_response(
-                "client_secret_not_configured",
-                status=500,
-                target="history.config",
-            )
-            return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
-            )
-
-        # Verify authentication and rate limit
-        auth_result, error_response = await self._verify_auth_and_rate_limit(data)
-        if error_response:
-            return error_response
+        auth_result = await _authorize_history_request(
+            self.request, self.hass, service="history", target="history"
+        )
+        if isinstance(auth_result, web.Response):
+            return auth_result
 
         # Get entity_id from path
         entity_id = self.request.match_info.get("entity_id")
@@ -503,13 +662,11 @@ class SmartlyHistoryView(web.View):
             )
 
         # Check entity access permission
-        from homeassistant.helpers import entity_registry as er
-
         entity_registry = er.async_get(self.hass)
         if not is_entity_allowed(self.hass, entity_id, entity_registry):
             log_deny(
                 _LOGGER,
-                client_id=auth_result.client_id or "unknown",
+                client_id=auth_client_id(auth_result),
                 entity_id=entity_id,
                 service="history",
                 reason="entity_not_allowed",
@@ -535,6 +692,7 @@ class SmartlyHistoryView(web.View):
         # Validate time range
         if error_response := self._validate_time_range(start_time, end_time):
             return error_response
+        start_time, end_time = self._history_planner.align_time_range(start_time, end_time)
 
         # Parse pagination parameters
         cursor_str, cursor_data, page_size, limit, use_pagination = self._parse_pagination_params(
@@ -551,6 +709,21 @@ class SmartlyHistoryView(web.View):
                 result.body, self.request, status=result.status, headers=result.headers
             )
 
+        layout = _parse_history_layout(
+            query.get("format", HISTORY_FORMAT_ROW),
+            query.get("encoding", TIMESTAMP_ENCODING_ISO),
+        )
+        if layout is None:
+            result = _history_error_response(
+                "invalid_format",
+                status=400,
+                target="history.format",
+            )
+            return _json_response(
+                result.body, self.request, status=result.status, headers=result.headers
+            )
+        columnar, dod_timestamps = layout
+
         # Get query parameters
         significant_changes_only = query.get("significant_changes_only", "true").lower() == "true"
 
@@ -578,6 +751,11 @@ class SmartlyHistoryView(web.View):
                     page_size=page_size,
                     use_pagination=use_pagination,
                     cursor_data=cursor_data,
+                    columnar=columnar,
+                    dod_timestamps=dod_timestamps,
+                ),
+                use_case_factory=partial(
+                    _single_history_use_case, executor=self.hass.async_add_executor_job
                 ),
             )
         except asyncio.TimeoutError:
@@ -603,8 +781,8 @@ class SmartlyHistoryView(web.View):
                 result.body, self.request, status=result.status, headers=result.headers
             )
 
-        return _json_response(
-            result.body, self.request, status=result.status, headers=result.headers
+        return await _async_json_response(
+            self.hass, result.body, self.request, status=result.status, headers=result.headers
         )
 
 
@@ -631,18 +809,7 @@ class SmartlyHistoryBatchView(web.View):
         """Initialize the view."""
         super().__init__(request)
         self.hass: HomeAssistant = request.app["hass"]
-        self._history_planner = HistoryQueryPlanner()
-
-    def _get_integration_data(self) -> dict[str, Any] | None:
-        """Get integration config entry data."""
-        if DOMAIN not in self.hass.data:
-            return None
-
-        config_entry = self.hass.data[DOMAIN].get("config_entry")
-        if config_entry:
-            return config_entry.data
-
-        return None
+        self._history_planner = _HISTORY_PLANNER
 
     def _filter_allowed_entities(
         self,
@@ -655,21 +822,17 @@ class SmartlyHistoryBatchView(web.View):
         Returns:
             Tuple of (allowed_entity_ids, denied_entity_ids)
         """
-        allowed_entity_ids = []
-        denied_entity_ids = []
-
-        for eid in entity_ids:
-            if is_entity_allowed(self.hass, eid, entity_registry):
-                allowed_entity_ids.append(eid)
-            else:
-                denied_entity_ids.append(eid)
-                log_deny(
-                    _LOGGER,
-                    client_id=client_id,
-                    entity_id=eid,
-                    service="history_batch",
-                    reason="entity_not_allowed",
-                )
+        allowed_entity_ids, denied_entity_ids = partition_allowed_entities(
+            self.hass, entity_ids, entity_registry
+        )
+        for eid in denied_entity_ids:
+            log_deny(
+                _LOGGER,
+                client_id=client_id,
+                entity_id=eid,
+                service="history_batch",
+                reason="entity_not_allowed",
+            )
 
         return allowed_entity_ids, denied_entity_ids
 
@@ -695,86 +858,15 @@ class SmartlyHistoryBatchView(web.View):
                 result.body, self.request, status=result.status, headers=result.headers
             )
 
-        return start_time, end_time
+        return self._history_planner.align_time_range(start_time, end_time)
 
-    async def post(self) -> web.Response:
+    async def post(self) -> web.StreamResponse:
         """Handle batch history query request."""
-        # Get integration data
-        data = self._get_integration_data()
-        if data is None:
-            result = _history_error_response(
-                "integration_not_configured",
-                status=500,
-                target="history.batch.integration",
-            )
-            return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
-            )
-
-        client_secret = data.get(CONF_CLIENT_SECRET)
-        if not client_secret:
-            result = _history_error_response(
-                "client_secret_not_configured",
-                status=500,
-                target="history.batch.config",
-            )
-            return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
-            )
-        allowed_cidrs = data.get(CONF_ALLOWED_CIDRS, "")
-        trust_proxy_mode = data.get(CONF_TRUST_PROXY, DEFAULT_TRUST_PROXY)
-        nonce_cache = self.hass.data[DOMAIN]["nonce_cache"]
-        rate_limiter: RateLimiter = self.hass.data[DOMAIN]["rate_limiter"]
-
-        # Verify authentication
-        auth_result = await verify_request(
-            self.request,
-            client_secret,
-            nonce_cache,
-            allowed_cidrs,
-            trust_proxy_mode,
+        auth_result = await _authorize_history_request(
+            self.request, self.hass, service="history_batch", target="history.batch"
         )
-
-        if not auth_result.success:
-            log_deny(
-                _LOGGER,
-                client_id=self.request.headers.get("X-Client-Id", "unknown"),
-                entity_id="",
-                service="history_batch",
-                reason=auth_result.error or "auth_failed",
-            )
-            result = _history_error_response(
-                auth_result.error or "auth_failed",
-                status=401,
-                target="history.batch.auth",
-            )
-            return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
-            )
-
-        # Check rate limit
-        if not await rate_limiter.check(auth_result.client_id or ""):
-            log_deny(
-                _LOGGER,
-                client_id=auth_result.client_id or "unknown",
-                entity_id="",
-                service="history_batch",
-                reason="rate_limited",
-            )
-            result = _history_error_response(
-                "rate_limited",
-                status=429,
-                target="history.batch.rate_limit",
-            )
-            return _json_response(
-                result.body,
-                self.request,
-                status=result.status,
-                headers={
-                    "Retry-After": str(RATE_WINDOW),
-                    "X-RateLimit-Remaining": "0",
-                },
-            )
+        if isinstance(auth_result, web.Response):
+            return auth_result
 
         # Parse request body
         try:
@@ -790,7 +882,11 @@ class SmartlyHistoryBatchView(web.View):
             )
 
         entity_ids = body.get("entity_ids", [])
-        if not isinstance(entity_ids, list) or not entity_ids:
+        if (
+            not isinstance(entity_ids, list)
+            or not entity_ids
+            or not all(isinstance(eid, str) for eid in entity_ids)
+        ):
             result = _history_error_response(
                 "entity_ids_required",
                 status=400,
@@ -799,6 +895,8 @@ class SmartlyHistoryBatchView(web.View):
             return _json_response(
                 result.body, self.request, status=result.status, headers=result.headers
             )
+        # Duplicates would be queried and formatted once per occurrence.
+        entity_ids = list(dict.fromkeys(entity_ids))
 
         # Limit batch size
         if len(entity_ids) > HISTORY_MAX_ENTITIES_BATCH:
@@ -811,12 +909,20 @@ class SmartlyHistoryBatchView(web.View):
                 result.body, self.request, status=result.status, headers=result.headers
             )
 
-        # Check entity access permissions
-        from homeassistant.helpers import entity_registry as er
+        # Recorder work grows with the batch, so large batches cost extra requests.
+        extra_cost = len(entity_ids) // HISTORY_BATCH_ENTITIES_PER_RATE_COST
+        rate_limiter: RateLimiter = self.hass.data[DOMAIN]["rate_limiter"]
+        if extra_cost and not await rate_limiter.check(
+            auth_client_id(auth_result), cost=extra_cost
+        ):
+            return _rate_limited_response(
+                self.request, auth_result, service="history_batch", target="history.batch"
+            )
 
+        # Check entity access permissions
         entity_registry = er.async_get(self.hass)
         allowed_entity_ids, denied_entity_ids = self._filter_allowed_entities(
-            entity_ids, entity_registry, auth_result.client_id or "unknown"
+            entity_ids, entity_registry, auth_client_id(auth_result)
         )
 
         if not allowed_entity_ids:
@@ -829,6 +935,32 @@ class SmartlyHistoryBatchView(web.View):
                 result.body, self.request, status=result.status, headers=result.headers
             )
 
+        layout = _parse_history_layout(
+            body.get("format", HISTORY_FORMAT_ROW),
+            body.get("encoding", TIMESTAMP_ENCODING_ISO),
+        )
+        if layout is None:
+            result = _history_error_response(
+                "invalid_format",
+                status=400,
+                target="history.batch.format",
+            )
+            return _json_response(
+                result.body, self.request, status=result.status, headers=result.headers
+            )
+        columnar, dod_timestamps = layout
+
+        group_by = body.get("group_by", BATCH_GROUP_BY_FIELD)
+        if group_by not in BATCH_GROUP_BYS:
+            result = _history_error_response(
+                "invalid_group_by",
+                status=400,
+                target="history.batch.group_by",
+            )
+            return _json_response(
+                result.body, self.request, status=result.status, headers=result.headers
+            )
+
         # Parse time parameters
         time_result = self._parse_time_range(body)
         if isinstance(time_result, web.Response):
@@ -865,6 +997,12 @@ class SmartlyHistoryBatchView(web.View):
                     end_time=end_time,
                     limit=limit,
                     significant_changes_only=True,
+                    columnar=columnar,
+                    dod_timestamps=dod_timestamps,
+                    group_by_entity=group_by == BATCH_GROUP_BY_ENTITY,
+                ),
+                use_case_factory=partial(
+                    _batch_history_use_case, executor=self.hass.async_add_executor_job
                 ),
             )
         except asyncio.TimeoutError:
@@ -884,8 +1022,13 @@ class SmartlyHistoryBatchView(web.View):
                 result.body, self.request, status=result.status, headers=result.headers
             )
 
-        return _json_response(
-            result.body, self.request, status=result.status, headers=result.headers
+        body = _with_encoded_metadata(result.body)
+        if _history_row_count(body) > HISTORY_STREAM_ROW_THRESHOLD:
+            return await _stream_batch_json_response(
+                self.hass, body, self.request, status=result.status, headers=result.headers
+            )
+        return await _async_json_response(
+            self.hass, body, self.request, status=result.status, headers=result.headers
         )
 
 
@@ -896,150 +1039,55 @@ class SmartlyHistoryBatchViewWrapper(HomeAssistantView):
     name = "api:smartly:history:batch"
     requires_auth = False
 
-    async def post(self, request: web.Request) -> web.Response:
+    async def post(self, request: web.Request) -> web.StreamResponse:
         """Handle POST request."""
         view = SmartlyHistoryBatchView(request)
         return await view.post()
 
 
-class SmartlyStatisticsView(web.View):
+class SmartlyStatisticsViewWrapper(HomeAssistantView):
     """Handle GET /api/smartly/statistics/{entity_id} requests.
 
     Query statistical data (mean, min, max, sum) for a single entity.
     """
 
-    def __init__(self, request: web.Request) -> None:
-        """Initialize the view."""
-        super().__init__(request)
-        self.hass: HomeAssistant = request.app["hass"]
-        self._history_planner = HistoryQueryPlanner()
-
-    def _get_integration_data(self) -> dict[str, Any] | None:
-        """Get integration config entry data."""
-        if DOMAIN not in self.hass.data:
-            return None
-
-        config_entry = self.hass.data[DOMAIN].get("config_entry")
-        if config_entry:
-            return config_entry.data
-
-        return None
+    url = API_PATH_STATISTICS
+    name = "api:smartly:statistics"
+    requires_auth = False
 
-    async def get(self) -> web.Response:
+    async def get(self, request: web.Request, entity_id: str) -> web.Response:
         """Handle statistics query request."""
-        # Get integration data
-        data = self._get_integration_data()
-        if data is None:
-            result = _history_error_response(
-                "integration_not_configured",
-                status=500,
-                target="statistics.integration",
-            )
-            return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
-            )
+        hass: HomeAssistant = request.app["hass"]
 
-        client_secret = data.get(CONF_CLIENT_SECRET)
-        if not client_secret:
-            result = _history_error_response(
-                "client_secret_not_configured",
-                status=500,
-                target="statistics.config",
-            )
-            return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
-            )
-        allowed_cidrs = data.get(CONF_ALLOWED_CIDRS, "")
-        trust_proxy_mode = data.get(CONF_TRUST_PROXY, DEFAULT_TRUST_PROXY)
-        nonce_cache = self.hass.data[DOMAIN]["nonce_cache"]
-        rate_limiter: RateLimiter = self.hass.data[DOMAIN]["rate_limiter"]
-
-        # Verify authentication
-        auth_result = await verify_request(
-            self.request,
-            client_secret,
-            nonce_cache,
-            allowed_cidrs,
-            trust_proxy_mode,
+        auth_result = await _authorize_history_request(
+            request, hass, service="statistics", target="statistics"
         )
+        if isinstance(auth_result, web.Response):
+            return auth_result
 
-        if not auth_result.success:
-            log_deny(
-                _LOGGER,
-                client_id=self.request.headers.get("X-Client-Id", "unknown"),
-                entity_id="",
-                service="statistics",
-                reason=auth_result.error or "auth_failed",
-            )
-            result = _history_error_response(
-                auth_result.error or "auth_failed",
-                status=401,
-                target="statistics.auth",
-            )
-            return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
-            )
-
-        # Check rate limit
-        if not await rate_limiter.check(auth_result.client_id or ""):
-            log_deny(
-                _LOGGER,
-                client_id=auth_result.client_id or "unknown",
-                entity_id="",
-                service="statistics",
-                reason="rate_limited",
-            )
-            result = _history_error_response(
-                "rate_limited",
-                status=429,
-                target="statistics.rate_limit",
-            )
-            return _json_response(
-                result.body,
-                self.request,
-                status=result.status,
-                headers={
-                    **result.headers,
-                    "Retry-After": str(RATE_WINDOW),
-                    "X-RateLimit-Remaining": "0",
-                },
-            )
-
-        # Get entity_id from path
-        entity_id = self.request.match_info.get("entity_id")
         if not entity_id:
-            result = _history_error_response(
-                "entity_id_required",
-                status=400,
-                target="statistics.entity_id",
-            )
+            result = _STATISTICS_ENTITY_ID_REQUIRED
             return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
+                result.body, request, status=result.status, headers=result.headers
             )
 
         # Check entity access permission
-        from homeassistant.helpers import entity_registry as er
-
-        entity_registry = er.async_get(self.hass)
-        if not is_entity_allowed(self.hass, entity_id, entity_registry):
+        entity_registry = er.async_get(hass)
+        if not is_entity_allowed(hass, entity_id, entity_registry):
             log_deny(
                 _LOGGER,
-                client_id=auth_result.client_id or "unknown",
+                client_id=auth_client_id(auth_result),
                 entity_id=entity_id,
                 service="statistics",
                 reason="entity_not_allowed",
             )
-            result = _history_error_response(
-                "entity_not_allowed",
-                status=403,
-                target="statistics.entity_id",
-            )
+            result = _STATISTICS_ENTITY_NOT_ALLOWED
             return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
+                result.body, request, status=result.status, headers=result.headers
             )
 
         # Parse query parameters
-        query = self.request.query
+        query = request.query
         now = dt_util.utcnow()
 
         end_time = _parse_datetime(query.get("end_time"))
@@ -1050,29 +1098,25 @@ class SmartlyStatisticsView(web.View):
         if start_time is None:
             start_time = end_time - timedelta(hours=HISTORY_DEFAULT_HOURS)
 
-        result = self._history_planner.validate_time_range(start_time, end_time)
+        result = _HISTORY_PLANNER.validate_time_range(start_time, end_time)
         if result is not None:
             return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
+                result.body, request, status=result.status, headers=result.headers
             )
 
         # Parse period parameter (hour, day, week, month)
         period = query.get("period", "hour")
-        if period not in ("hour", "day", "week", "month"):
-            result = _history_error_response(
-                "invalid_period",
-                status=400,
-                target="statistics.period",
-            )
+        if period not in STATISTICS_PERIODS:
+            result = _STATISTICS_INVALID_PERIOD
             return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
+                result.body, request, status=result.status, headers=result.headers
             )
 
-        gateway = _history_gateway(self.hass)
+        gateway = _history_gateway(hass)
         if gateway is None:
             result = _history_gateway_unavailable_response()
             return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
+                result.body, request, status=result.status, headers=result.headers
             )
 
         try:
@@ -1093,22 +1137,9 @@ class SmartlyStatisticsView(web.View):
                 target="statistics",
             )
             return _json_response(
-                result.body, self.request, status=result.status, headers=result.headers
+                result.body, request, status=result.status, headers=result.headers
             )
 
-        return _json_response(
-            result.body, self.request, status=result.status, headers=result.headers
+        return await _async_json_response(
+            hass, result.body, request, status=result.status, headers=result.headers
         )
-
-
-class SmartlyStatisticsViewWrapper(HomeAssistantView):
-    """HomeAssistant view wrapper for statistics API."""
-
-    url = API_PATH_STATISTICS
-    name = "api:smartly:statistics"
-    requires_auth = False
-
-    async def get(self, request: web.Request, entity_id: str) -> web.Response:
-        """Handle GET request."""
-        view = SmartlyStatisticsView(request)
-        return await view.get()
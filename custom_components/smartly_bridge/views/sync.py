@@ -6,6 +6,7 @@ from typing import Any, Callable
 from aiohttp import web
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
 
 from ..acl import get_allowed_entities  # noqa: F401 - patched by view tests
 from ..application.sync import SyncStatesUseCase, SyncStructureUseCase, sync_error_response
@@ -46,10 +47,12 @@ def _json_response(
     headers: dict[str, str] | None = None,
 ) -> web.Response:
     """Return a sync JSON response with optional vNext request context."""
-    return web.json_response(
-        _with_request_context(result_body, request),
+    # Full structure snapshots are large; encode with the orjson-backed helper.
+    return web.Response(
+        body=json_bytes(_with_request_context(result_body, request)),
         status=status,
         headers=headers,
+        content_type="application/json",
     )
 
 
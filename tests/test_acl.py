@@ -5,12 +5,14 @@ from __future__ import annotations
 from unittest.mock import MagicMock
 
 from custom_components.smartly_bridge.acl import (
+    clear_entity_allowed_cache,
     filter_entities_by_area,
     get_allowed_entities,
     get_entity_domain,
     get_structure,
     is_entity_allowed,
     is_service_allowed,
+    partition_allowed_entities,
 )
 from custom_components.smartly_bridge.const import ALLOWED_SERVICES
 
@@ -33,6 +35,53 @@ class TestIsEntityAllowed:
         result = is_entity_allowed(mock_hass, "light.does_not_exist", mock_entity_registry)
         assert result is False
 
+    def test_result_cached_until_cleared(self, mock_hass):
+        """Test registry lookups are cached until the cache is cleared."""
+        registry = MagicMock()
+        registry.async_get.return_value.labels = {"smartly"}
+
+        assert is_entity_allowed(mock_hass, "light.test_light", registry) is True
+        assert is_entity_allowed(mock_hass, "light.test_light", registry) is True
+        assert registry.async_get.call_count == 1
+
+        clear_entity_allowed_cache()
+        assert is_entity_allowed(mock_hass, "light.test_light", registry) is True
+        assert registry.async_get.call_count == 2
+
+    def test_cache_reset_for_new_registry(self, mock_hass, mock_entity_registry):
+        """Test results cached for one registry are not reused for another."""
+        assert is_entity_allowed(mock_hass, "light.test_light", mock_entity_registry) is True
+
+        other_registry = MagicMock()
+        other_registry.async_get.return_value = None
+        assert is_entity_allowed(mock_hass, "light.test_light", other_registry) is False
+
+
+class TestPartitionAllowedEntities:
+    """Tests for partition_allowed_entities function."""
+
+    def test_splits_and_deduplicates_entities(self, mock_hass, mock_entity_registry):
+        """Test allowed and denied IDs keep request order without duplicates."""
+        allowed, denied = partition_allowed_entities(
+            mock_hass,
+            ["light.test_light", "light.hidden_light", "light.test_light"],
+            mock_entity_registry,
+        )
+
+        assert allowed == ["light.test_light"]
+        assert denied == ["light.hidden_light"]
+
+    def test_reads_cached_decisions(self, mock_hass):
+        """Test warm entities skip the registry lookup."""
+        clear_entity_allowed_cache()
+        registry = MagicMock()
+        registry.async_get.return_value.labels = {"smartly"}
+
+        partition_allowed_entities(mock_hass, ["light.test_light"], registry)
+        partition_allowed_entities(mock_hass, ["light.test_light"], registry)
+
+        assert registry.async_get.call_count == 1
+
 
 class TestIsServiceAllowed:
     """Tests for is_service_allowed function."""
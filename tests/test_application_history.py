@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import base64
 import json
+from dataclasses import replace
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
@@ -18,10 +21,16 @@ from custom_components.smartly_bridge.application.history import (
     SingleHistoryUseCase,
     StatisticsQuery,
     StatisticsUseCase,
+    _datetime_iso,
+    _epoch_iso,
+    _parse_state_value,
+    _recorder_timestamp_iso,
+    clear_history_metadata_cache,
     decode_cursor,
     encode_cursor,
     parse_datetime,
 )
+from custom_components.smartly_bridge.const import VIZUALIZATION_CONFIG
 
 
 def _fixture(name: str) -> dict:
@@ -46,6 +55,12 @@ def test_parse_datetime_accepts_iso8601_and_rejects_invalid_values() -> None:
     parsed = parse_datetime("2026-01-10T10:00:00+00:00")
 
     assert parsed == datetime(2026, 1, 10, 10, 0, tzinfo=timezone.utc)
+    assert parse_datetime("2026-01-10T10:00:00Z") == parsed
+    assert parse_datetime("2026-01-10T10:00:00") == parsed
+    assert parse_datetime("2026-01-10T10:00:00").tzinfo is timezone.utc
+    assert parse_datetime("2026-01-10T18:00:00+08:00").utcoffset() == timedelta(hours=8)
+    assert parse_datetime("2026-01-10T10:00:00Z") is parse_datetime("2026-01-10T10:00:00Z")
+    assert parse_datetime(["2026-01-10T10:00:00Z"]) is None
     assert parse_datetime(None) is None
     assert parse_datetime("not-a-date") is None
 
@@ -100,6 +115,19 @@ def test_time_range_too_large_response_matches_api_vnext_fixture() -> None:
     assert result.body == _fixture("history-time-range-error.json")
 
 
+def test_align_time_range_floors_long_ranges_to_bucket() -> None:
+    """Long ranges snap to the cache bucket; short ranges keep exact bounds."""
+    planner = HistoryQueryPlanner(bucket_seconds=5)
+    end_time = datetime(2026, 1, 2, 0, 0, 7, 250000, tzinfo=timezone.utc)
+
+    start, end = planner.align_time_range(end_time - timedelta(hours=24), end_time)
+    assert start == datetime(2026, 1, 1, 0, 0, 5, tzinfo=timezone.utc)
+    assert end == datetime(2026, 1, 2, 0, 0, 5, tzinfo=timezone.utc)
+
+    short_start = end_time - timedelta(minutes=30)
+    assert planner.align_time_range(short_start, end_time) == (short_start, end_time)
+
+
 def test_parse_pagination_params_clamps_page_size_and_uses_page_extra_limit() -> None:
     """Pagination requests fetch one extra record to detect has_more."""
     planner = HistoryQueryPlanner(default_limit=500, default_page_size=100, max_page_size=1000)
@@ -129,15 +157,30 @@ def test_parse_pagination_params_keeps_unpaginated_short_ranges_unlimited() -> N
     assert pagination.use_pagination is False
 
 
+def test_cursor_is_raw_delimited_token() -> None:
+    """Cursors are plain delimited tokens; base64 JSON payloads are rejected."""
+    cursor = encode_cursor("2026-01-01T02:00:00+00:00", "2026-01-01T01:00:00+00:00")
+
+    assert cursor == "2026-01-01T02:00:00+00:00~2026-01-01T01:00:00+00:00"
+    assert decode_cursor(cursor.replace("+", " ")) == {
+        "ts": "2026-01-01T02:00:00+00:00",
+        "lc": "2026-01-01T01:00:00+00:00",
+    }
+    assert decode_cursor("~2026-01-01T01:00:00+00:00") is None
+    assert decode_cursor("a~b") is None
+    assert decode_cursor("2026-01-01T02:00:00+00:00~not-a-time") is None
+    assert decode_cursor(base64.urlsafe_b64encode(b'{"ts":"a","lc":"b"}').decode()) is None
+
+
 def test_cursor_round_trip_and_pagination_filter() -> None:
     """Cursor pagination keeps only rows older than the cursor and detects more rows."""
     planner = HistoryQueryPlanner()
     cursor = encode_cursor("2026-01-01T02:00:00+00:00", "2026-01-01T02:00:00+00:00")
     cursor_data = decode_cursor(cursor)
     states = [
-        {"last_changed": "2026-01-01T03:00:00+00:00"},
-        {"last_changed": "2026-01-01T01:00:00+00:00"},
-        {"last_changed": "2026-01-01T00:30:00+00:00"},
+        {"s": "3", "lc": 1767236400},
+        {"s": "1", "lc": 1767229200},
+        {"s": "0", "lc": 1767227400},
     ]
 
     filtered, has_more = planner.apply_pagination_filter(
@@ -145,13 +188,59 @@ def test_cursor_round_trip_and_pagination_filter() -> None:
         cursor_data,
         page_size=1,
         use_pagination=True,
-        state_formatter=lambda state: state,
+        state_timestamp=HistoryResponseFormatter().last_changed_timestamp,
     )
 
-    assert filtered == [{"last_changed": "2026-01-01T01:00:00+00:00"}]
+    assert filtered == [{"s": "1", "lc": 1767229200}]
     assert has_more is True
 
 
+def test_pagination_filter_compares_cursor_as_instant() -> None:
+    """A cursor carrying a non-UTC offset filters by instant, not by string order."""
+    planner = HistoryQueryPlanner()
+    states = [{"s": "2", "lc": 1767229200}, {"s": "1", "lc": 1767225600}]
+
+    filtered, has_more = planner.apply_pagination_filter(
+        states,
+        {"ts": "ignored", "lc": "2026-01-01T09:00:00+08:00"},
+        page_size=10,
+        use_pagination=True,
+        state_timestamp=HistoryResponseFormatter().last_changed_timestamp,
+    )
+
+    assert filtered == [{"s": "1", "lc": 1767225600}]
+    assert has_more is False
+
+
+def test_pagination_filter_excludes_cursor_row_with_sub_microsecond_epoch() -> None:
+    """A raw recorder float just below its rounded cursor does not repeat on the next page."""
+    planner = HistoryQueryPlanner()
+    formatter = HistoryResponseFormatter()
+    cursor_row = {"s": "2", "lc": 1767225600.1234567}
+    older_row = {"s": "1", "lc": 1767225600.1234561}
+    cursor_lc = formatter.format_state(cursor_row)["last_changed"]
+    assert cursor_row["lc"] < parse_datetime(cursor_lc).timestamp()
+
+    filtered, has_more = planner.apply_pagination_filter(
+        [cursor_row, older_row],
+        decode_cursor(encode_cursor(cursor_lc, cursor_lc)),
+        page_size=10,
+        use_pagination=True,
+        state_timestamp=formatter.last_changed_timestamp,
+    )
+
+    assert filtered == [older_row]
+    assert has_more is False
+
+
+def test_last_changed_timestamp_reads_missing_epochs_as_zero() -> None:
+    """Compressed rows without lc or lu get a fixed epoch instead of the clock."""
+    formatter = HistoryResponseFormatter()
+
+    assert formatter.last_changed_timestamp({"s": "1"}) == 0.0
+    assert formatter.last_changed_timestamp({"s": "1", "lu": 1767225600.5}) == 1767225600.5
+
+
 def test_format_state_formats_compressed_state_and_attributes() -> None:
     """Compressed recorder rows are serialized without framework objects."""
     formatter = HistoryResponseFormatter()
@@ -172,6 +261,237 @@ def test_format_state_formats_compressed_state_and_attributes() -> None:
     assert result["last_changed"].startswith("2026-01-01T00:00:00")
 
 
+def test_format_state_value_handles_native_numbers() -> None:
+    """Native recorder numbers format like their string forms."""
+    formatter = HistoryResponseFormatter()
+
+    assert formatter.format_state_value(21.456, 1) == 21.5
+    assert formatter.format_state_value(21.456, None) == 21.456
+    assert formatter.format_state_value(21, None) == 21.0
+    assert isinstance(formatter.format_state_value(21, None), float)
+    assert formatter.format_state_value("21.456", 1) == 21.5
+
+
+def test_format_state_value_parses_repeated_strings_once() -> None:
+    """Repeated state strings reuse one parse; text states pass through."""
+    formatter = HistoryResponseFormatter()
+    _parse_state_value.cache_clear()
+
+    assert [formatter.format_state_value("21.456", 1) for _ in range(3)] == [21.5] * 3
+    assert _parse_state_value.cache_info().misses == 1
+    assert formatter.format_state_value("21.456", None) == 21.456
+    assert formatter.format_state_value("on", 1) == "on"
+    assert formatter.format_state_value("unavailable", 1) == "unavailable"
+
+
+def test_state_value_formatter_matches_format_state_value() -> None:
+    """The per-entity formatter memoizes strings without changing any value."""
+    formatter = HistoryResponseFormatter()
+    values = ["21.456", "21.456", "on", "unknown", "", " 7 ", "nan", 3.14159, 2, None]
+
+    for decimal_places in (None, 0, 2):
+        format_value = formatter.state_value_formatter(decimal_places)
+        for value in values:
+            expected = formatter.format_state_value(value, decimal_places)
+            result = format_value(value)
+            assert type(result) is type(expected)
+            assert result == expected or result != result
+
+
+def test_parse_state_value_prefilter_matches_float_syntax() -> None:
+    """Text states skip float(); anything float() accepts is still parsed."""
+    for state in ("on", "heat", "e5", "1.5", "-2", "+4", ".5", " 3", "1_000", "inf", "١٢"):
+        try:
+            expected: str | float = float(state)
+        except ValueError:
+            expected = state
+        assert _parse_state_value.__wrapped__(state, None) == expected
+
+
+def test_row_formatter_matches_format_state_for_both_row_kinds() -> None:
+    """The once-dispatched row formatter formats like format_state."""
+    formatter = HistoryResponseFormatter()
+    compressed = {"s": "21.456", "lc": 1767225600, "lu": 1767225600, "a": {"unit": "x"}}
+    state_object = SimpleNamespace(
+        state="21.456",
+        attributes={"unit": "x"},
+        last_changed=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        last_updated=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+
+    for state in (compressed, state_object):
+        format_row = formatter.row_formatter(state)
+        assert format_row(state, 1, True) == formatter.format_state(state, 1, True)
+        assert format_row(state, None, False) == formatter.format_state(state, None, False)
+
+
+def test_format_history_compressed_rows_match_format_state() -> None:
+    """The batched compressed-row pass formats like format_state per row."""
+    formatter = HistoryResponseFormatter()
+    rows = [
+        {"s": "21.456", "lc": 1767225600, "lu": 1767225600, "a": {"unit": "x"}},
+        {"s": "22.5", "lc": 1767225660, "lu": 1767225690.5},
+        {"s": "unavailable", "lu": 1767225720},
+        {"s": 23.04, "lc": 1767225780, "lu": 1767225780},
+    ]
+    start_time = datetime.fromtimestamp(1767225600, tz=timezone.utc)
+    end_time = datetime.fromtimestamp(1767225780, tz=timezone.utc)
+
+    result = formatter.format_history(
+        rows, metadata=None, start_time=start_time, end_time=end_time, limit=10
+    )
+
+    assert result == [
+        formatter.format_state(row, None, index == 0) for index, row in enumerate(rows)
+    ]
+
+
+def test_format_history_state_objects_carry_attributes_on_first_row_only() -> None:
+    """State-object rows after the first skip the attribute path entirely."""
+    formatter = HistoryResponseFormatter()
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        SimpleNamespace(
+            state=str(20 + index),
+            attributes={"unit": "x"},
+            last_changed=start_time + timedelta(minutes=index),
+            last_updated=start_time + timedelta(minutes=index, seconds=30),
+        )
+        for index in range(3)
+    ]
+
+    result = formatter.format_history(
+        rows,
+        metadata=None,
+        start_time=start_time,
+        end_time=rows[-1].last_changed,
+        limit=10,
+    )
+
+    assert result == [
+        formatter.format_state(row, None, index == 0) for index, row in enumerate(rows)
+    ]
+    assert [("attributes" in row) for row in result] == [True, False, False]
+
+
+def test_last_changed_timestamp_matches_formatted_state() -> None:
+    """Pagination reads the last_changed epoch without formatting the whole row."""
+    formatter = HistoryResponseFormatter()
+    changed = {"s": "1", "lc": 1767225600.5, "lu": 1767225660}
+    updated_only = {"s": "1", "lu": 1767225660}
+
+    for state in (changed, updated_only):
+        formatted = datetime.fromisoformat(formatter.format_state(state)["last_changed"])
+        assert formatter.last_changed_timestamp(state) == formatted.timestamp()
+
+
+def test_compressed_timestamps_match_datetime_isoformat() -> None:
+    """Compressed epochs serialize exactly like datetime.fromtimestamp().isoformat()."""
+    formatter = HistoryResponseFormatter()
+
+    for timestamp in (1767225600, 1767225600.5, 1767225600.1234565, 1767225600.9999996):
+        expected = datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+        assert formatter.format_state({"s": "1", "lc": timestamp})["last_changed"] == expected
+
+
+def test_epoch_iso_matches_datetime_isoformat_across_rounding_and_dates() -> None:
+    """The gmtime-based formatter agrees with datetime for carries, leap days and negatives."""
+    samples = [-1.5, 0, 951782400.25, 1709164800.0000005, 1767225599.9999995]
+    samples += [1767225600 + step / 7 for step in range(200)]
+    for timestamp in samples:
+        expected = datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=timestamp)
+        assert _epoch_iso(timestamp) == expected.isoformat()
+
+
+def test_compressed_timestamps_format_repeated_epochs_once() -> None:
+    """Re-polled rows reuse the cached ISO string for their epoch."""
+    formatter = HistoryResponseFormatter()
+    _recorder_timestamp_iso.cache_clear()
+    row = {"s": "1", "lc": 1767225600.5, "lu": 1767225660}
+
+    first = formatter.format_state(row)
+    assert formatter.format_state(row) == first
+    assert _recorder_timestamp_iso.cache_info().misses == 2
+
+
+def test_compressed_rows_without_stamps_share_one_fallback_time() -> None:
+    """Rows missing both epochs fall back to a single now per formatting pass."""
+    formatter = HistoryResponseFormatter()
+    rows = [{"s": str(value)} for value in range(3)]
+    kwargs = {
+        "metadata": None,
+        "start_time": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        "end_time": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        "limit": 3,
+    }
+
+    history = formatter.format_history(rows, **kwargs)
+    columns = formatter.format_columns(rows, **kwargs)
+
+    assert len({row["last_changed"] for row in history}) == 1
+    assert {row["last_updated"] for row in history} == {history[0]["last_changed"]}
+    assert len(set(columns["last_changed"])) == 1
+
+
+def test_ensure_time_bounds_compares_instants_across_offsets() -> None:
+    """Request bounds with a non-UTC offset are compared as instants, not strings."""
+    formatter = HistoryResponseFormatter()
+    taipei = timezone(timedelta(hours=8))
+    start_time = datetime(2026, 1, 1, 8, tzinfo=taipei)
+    end_time = start_time + timedelta(hours=2)
+    row_time = datetime(2026, 1, 1, 1, tzinfo=timezone.utc).isoformat()
+    history = [{"state": 10.0, "last_changed": row_time, "last_updated": row_time}]
+
+    result = formatter.ensure_time_bounds(history, start_time, end_time, is_numeric=True)
+
+    assert [row["last_changed"] for row in result] == [
+        start_time.isoformat(),
+        row_time,
+        end_time.isoformat(),
+    ]
+
+
+def test_ensure_time_bounds_keeps_offset_of_equal_windows() -> None:
+    """Cached window bounds keep each caller's offset for the same instants."""
+    formatter = HistoryResponseFormatter()
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end_time = start_time + timedelta(hours=2)
+    row_time = (start_time + timedelta(hours=1)).isoformat()
+    history = [{"state": 10.0, "last_changed": row_time, "last_updated": row_time}]
+    taipei = timezone(timedelta(hours=8))
+
+    for window_start, window_end in (
+        (start_time, end_time),
+        (start_time.astimezone(taipei), end_time.astimezone(taipei)),
+    ):
+        result = formatter.ensure_time_bounds(history, window_start, window_end, is_numeric=True)
+        assert result[0]["last_changed"] == window_start.isoformat()
+        assert result[-1]["last_changed"] == window_end.isoformat()
+
+
+def test_format_history_bounds_match_ensure_time_bounds_on_formatted_rows() -> None:
+    """Bounds checked on raw row epochs match the check on formatted rows."""
+    formatter = HistoryResponseFormatter()
+    taipei = timezone(timedelta(hours=8))
+    start_time = datetime(2026, 1, 1, 7, tzinfo=taipei)
+    end_time = start_time + timedelta(hours=3)
+    rows = [{"s": "10", "lu": 1767225600}, {"s": "11", "lc": 1767229200, "lu": 1767229260}]
+    metadata = {"is_numeric": True, "decimal_places": 1}
+
+    for limit in (1, 2):
+        expected = formatter.ensure_time_bounds(
+            [formatter.format_state(row, 1, index == 0) for index, row in enumerate(rows[:limit])],
+            start_time,
+            end_time,
+            is_numeric=True,
+        )
+        result = formatter.format_history(
+            rows, metadata=metadata, start_time=start_time, end_time=end_time, limit=limit
+        )
+        assert result == expected
+        assert len(result) == limit + 2
+
+
 def test_ensure_time_bounds_fills_numeric_edges() -> None:
     """Non-paginated numeric history includes start/end boundary points."""
     formatter = HistoryResponseFormatter()
@@ -199,6 +519,21 @@ def test_ensure_time_bounds_fills_numeric_edges() -> None:
     assert result[-1]["last_changed"] == end_time.isoformat()
 
 
+def test_ensure_time_bounds_returns_bracketing_rows_unchanged() -> None:
+    """Rows that already cover both bounds are returned as-is without a copy."""
+    formatter = HistoryResponseFormatter()
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end_time = start_time + timedelta(hours=2)
+    start_iso = start_time.isoformat()
+    end_iso = end_time.isoformat()
+    history = [
+        {"state": 10.0, "last_changed": start_iso, "last_updated": start_iso},
+        {"state": 12.0, "last_changed": end_iso, "last_updated": end_iso},
+    ]
+
+    assert formatter.ensure_time_bounds(history, start_time, end_time, is_numeric=True) is history
+
+
 def test_format_response_adds_pagination_cursor() -> None:
     """Paginated history responses include has_more and next_cursor."""
     formatter = HistoryResponseFormatter()
@@ -231,6 +566,50 @@ def test_format_response_adds_pagination_cursor() -> None:
     }
 
 
+def test_format_response_columnar_matches_row_layout() -> None:
+    """Columnar responses keep the cursor, count and chart of the row layout."""
+    formatter = HistoryResponseFormatter()
+    start_time = datetime(2026, 6, 26, 6, 0, tzinfo=timezone.utc)
+    end_time = start_time + timedelta(minutes=30)
+    kwargs = {
+        "entity_states": [
+            {"s": "24.923", "lc": 1782454800, "lu": 1782454800},
+            {"s": "24.789", "lc": 1782454200, "lu": 1782454260},
+            {"s": "24.567", "lc": 1782453600, "lu": 1782453600},
+        ],
+        "entity_id": "sensor.temperature",
+        "start_time": start_time,
+        "end_time": end_time,
+        "limit": 3,
+        "page_size": 3,
+        "has_more": True,
+        "metadata": {
+            "device_class": "temperature",
+            "unit_of_measurement": "°C",
+            "is_numeric": True,
+            "decimal_places": 1,
+        },
+    }
+
+    for use_pagination in (True, False):
+        rows = formatter.format_response(use_pagination=use_pagination, **kwargs)
+        columns = formatter.format_response(use_pagination=use_pagination, columnar=True, **kwargs)
+
+        history = columns.pop("history")
+        assert history == formatter.to_columns(rows.pop("history"))
+        assert columns == rows
+        assert "bridge_chart" in columns
+
+    encoded = formatter.format_response(
+        use_pagination=True, columnar=True, dod_timestamps=True, **kwargs
+    )
+    assert encoded["history"]["last_changed"]["t0"] == 1782454800000
+    assert decode_cursor(encoded["next_cursor"]) == {
+        "ts": "2026-06-26T06:00:00+00:00",
+        "lc": "2026-06-26T06:00:00+00:00",
+    }
+
+
 def test_format_response_adds_environment_bridge_chart() -> None:
     """Environment sensor history responses include compact chart points."""
     formatter = HistoryResponseFormatter()
@@ -326,6 +705,78 @@ def test_metadata_builder_uses_history_device_class_for_numeric_sensor() -> None
     assert metadata["visualization"]["type"] == "chart"
 
 
+def test_metadata_builder_stops_searching_rows_at_first_device_class() -> None:
+    """History rows are consumed lazily and only until a device_class is found."""
+    builder = HistoryMetadataBuilder()
+    consumed: list[int] = []
+
+    def rows():
+        for index, attributes in enumerate(({}, {"device_class": "power"}, {})):
+            consumed.append(index)
+            yield {"state": "1", "attributes": attributes}
+
+    metadata = builder.build("sensor.load", {"state": "1", "attributes": {}}, all_states=rows())
+
+    assert metadata["device_class"] == "power"
+    assert consumed == [0, 1]
+
+
+def test_metadata_builder_shares_visualization_templates() -> None:
+    """Visualization templates are handed out read-only instead of copied per call."""
+    builder = HistoryMetadataBuilder()
+    first_state = {"state": "21.5", "attributes": {"device_class": "temperature"}}
+    template = dict(VIZUALIZATION_CONFIG["temperature"])
+
+    first = builder.build("sensor.kitchen_temperature", first_state)
+    second = builder.build("sensor.kitchen_temperature", first_state)
+
+    assert first["visualization"] is second["visualization"]
+    assert first["visualization"] is VIZUALIZATION_CONFIG["temperature"]
+    assert VIZUALIZATION_CONFIG["temperature"] == template
+
+
+def test_metadata_builder_detects_numeric_states_like_float() -> None:
+    """Numeric detection accepts what float() accepts and rejects text states."""
+    builder = HistoryMetadataBuilder()
+
+    for state, expected in (
+        ("21.5", True),
+        ("1e3", True),
+        (" 7", True),
+        (21, True),
+        ("on", False),
+        ("", False),
+        ("unavailable", False),
+        (None, False),
+    ):
+        metadata = builder.build("sensor.probe", {"state": state, "attributes": {}})
+        assert metadata["is_numeric"] is expected, state
+
+
+def test_metadata_builder_infers_precision_from_entity_name() -> None:
+    """Entity names without a device class use the longest measurement keyword."""
+    builder = HistoryMetadataBuilder()
+
+    power_factor = builder.build("sensor.plug_power_factor", {"state": "0.9", "attributes": {}})
+    voltage = builder.build("sensor.plug_voltage", {"state": "220.1", "attributes": {}})
+
+    assert power_factor["decimal_places"] == 3
+    assert voltage["decimal_places"] == 2
+
+
+def test_metadata_builder_checks_name_keywords_in_priority_order() -> None:
+    """Names with several keywords follow keyword priority, not position in the name."""
+    builder = HistoryMetadataBuilder()
+
+    for entity_id, expected in (
+        ("sensor.battery_temperature", 1),
+        ("sensor.voltage_current", 3),
+        ("sensor.energy_current", 3),
+    ):
+        metadata = builder.build(entity_id, {"state": "1.23456", "attributes": {}})
+        assert metadata["decimal_places"] == expected, entity_id
+
+
 def test_metadata_builder_uses_carbon_dioxide_visualization() -> None:
     """CO2 device class gets air quality visualization and precision."""
     builder = HistoryMetadataBuilder()
@@ -377,7 +828,8 @@ def test_metadata_builder_uses_timeline_for_non_numeric_unknown_domain() -> None
 class FakeHistoryGateway:
     """Fake history gateway."""
 
-    def __init__(self, *, fail_count: bool = False, fail_first_state: bool = False) -> None:
+    def __init__(self, *, missing_first_state: bool = False) -> None:
+        self.calls: list[str] = []
         self.states = [
             {
                 "s": "10",
@@ -392,8 +844,9 @@ class FakeHistoryGateway:
             "unit_of_measurement": "°C",
             "friendly_name": "Room Temperature",
         }
-        self.fail_count = fail_count
-        self.fail_first_state = fail_first_state
+        self.missing_first_state = missing_first_state
+        self.recent_states: list[dict] = []
+        self.cached_window: list[dict] | None = None
 
     async def query_states(
         self,
@@ -402,27 +855,39 @@ class FakeHistoryGateway:
         end_time: datetime,
         significant_changes_only: bool,
     ) -> list[dict]:
+        self.calls.append("query_states")
         return self.states
 
-    async def first_state_with_attributes(
+    async def query_recent_states(
         self,
         entity_id: str,
         start_time: datetime,
-    ) -> dict | None:
-        if self.fail_first_state:
-            raise RuntimeError("metadata query failed")
-        return self.states[0]
+        end_time: datetime,
+        significant_changes_only: bool,
+    ) -> list[dict]:
+        self.calls.append("query_recent_states")
+        return self.recent_states
+
+    def cached_states(
+        self,
+        entity_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        significant_changes_only: bool,
+    ) -> list[dict] | None:
+        return self.cached_window
 
-    async def count_states(
+    async def query_states_with_first_state(
         self,
         entity_id: str,
         start_time: datetime,
         end_time: datetime,
         significant_changes_only: bool,
-    ) -> int:
-        if self.fail_count:
-            raise RuntimeError("count query failed")
-        return len(self.states)
+    ) -> tuple[list[dict], dict | None]:
+        self.calls.append("query_states_with_first_state")
+        if self.missing_first_state:
+            return self.states, None
+        return self.states, self.states[0]
 
     def get_current_attributes(self, entity_id: str) -> dict | None:
         return self.current_attributes
@@ -533,6 +998,118 @@ async def test_single_history_use_case_formats_gateway_states() -> None:
     assert result.body["errors"] == []
 
 
+@pytest.mark.asyncio
+async def test_single_history_use_case_reads_recent_rows_when_they_fill_limit() -> None:
+    """Multi-day windows skip the full recorder read when the tail fills ``limit``."""
+    end_time = datetime(2026, 1, 4, tzinfo=timezone.utc)
+    gateway = FakeHistoryGateway()
+    gateway.recent_states = [
+        {"s": str(value), "lc": end_time.timestamp() - 60 * (3 - value)} for value in range(3)
+    ]
+    query = SingleHistoryQuery(
+        entity_id="sensor.temperature",
+        start_time=end_time - timedelta(days=3),
+        end_time=end_time,
+        significant_changes_only=True,
+        limit=2,
+        page_size=100,
+        use_pagination=False,
+    )
+
+    result = await SingleHistoryUseCase(gateway).execute(query)
+
+    assert gateway.calls == ["query_recent_states"]
+    assert {row["state"] for row in result.body["data"]["history"]} == {1.0, 2.0}
+    assert result.body["data"]["truncated"] is True
+
+    gateway = FakeHistoryGateway()
+    gateway.recent_states = gateway.states[1:]
+    result = await SingleHistoryUseCase(gateway).execute(query)
+
+    assert gateway.calls == ["query_recent_states", "query_states"]
+    assert result.body["data"]["truncated"] is False
+
+
+@pytest.mark.asyncio
+async def test_single_history_use_case_serves_cached_window_without_probing() -> None:
+    """A cached full window answers a multi-day query without any recorder read."""
+    end_time = datetime(2026, 1, 4, tzinfo=timezone.utc)
+    gateway = FakeHistoryGateway()
+    gateway.cached_window = gateway.states
+    query = SingleHistoryQuery(
+        entity_id="sensor.temperature",
+        start_time=end_time - timedelta(days=3),
+        end_time=end_time,
+        significant_changes_only=True,
+        limit=1000,
+        page_size=100,
+        use_pagination=False,
+    )
+
+    result = await SingleHistoryUseCase(gateway).execute(query)
+    uncached = await SingleHistoryUseCase(FakeHistoryGateway()).execute(query)
+
+    assert gateway.calls == []
+    assert result.body["data"] == uncached.body["data"]
+
+
+@pytest.mark.asyncio
+async def test_single_history_use_case_formats_long_windows_in_executor(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Windows above the row threshold are formatted through the injected executor."""
+    monkeypatch.setattr(
+        "custom_components.smartly_bridge.application.history.HISTORY_EXECUTOR_ROW_THRESHOLD", 1
+    )
+    jobs: list[str] = []
+
+    async def executor(job, *args):
+        jobs.append(job.__name__)
+        return job(*args)
+
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    query = SingleHistoryQuery(
+        entity_id="sensor.temperature",
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=2),
+        significant_changes_only=True,
+        limit=999999,
+        page_size=100,
+        use_pagination=False,
+    )
+    inline = await SingleHistoryUseCase(FakeHistoryGateway()).execute(query)
+    offloaded = await SingleHistoryUseCase(FakeHistoryGateway(), executor=executor).execute(query)
+
+    assert jobs == ["_format_body"]
+    assert offloaded.body == inline.body
+
+
+@pytest.mark.asyncio
+async def test_single_history_use_case_limits_to_newest_states() -> None:
+    """Unpaginated single history keeps only the newest ``limit`` states."""
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end_time = start_time + timedelta(hours=2)
+    use_case = SingleHistoryUseCase(FakeHistoryGateway())
+
+    result = await use_case.execute(
+        SingleHistoryQuery(
+            entity_id="sensor.temperature",
+            start_time=start_time,
+            end_time=end_time,
+            significant_changes_only=True,
+            limit=1,
+            page_size=100,
+            use_pagination=False,
+        )
+    )
+
+    assert result.status == 200
+    data = result.body["data"]
+    assert data["truncated"] is True
+    assert [row["state"] for row in data["history"]] == [11.0, 11.0, 11.0]
+    assert data["metadata"]["device_class"] == "temperature"
+
+
 @pytest.mark.asyncio
 async def test_single_history_response_matches_api_vnext_fixture() -> None:
     """Single history full response matches the API vNext envelope contract."""
@@ -589,6 +1166,259 @@ async def test_batch_history_use_case_formats_multiple_entities() -> None:
     assert result.body["errors"] == []
 
 
+@pytest.mark.asyncio
+async def test_batch_history_use_case_returns_columnar_history() -> None:
+    """Columnar batch history carries the same values as the row layout."""
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end_time = start_time + timedelta(hours=2)
+    use_case = BatchHistoryUseCase(FakeBatchHistoryGateway())
+    rows_query = BatchHistoryQuery(
+        entity_ids=["sensor.temperature", "binary_sensor.door"],
+        denied_entity_ids=[],
+        start_time=start_time,
+        end_time=end_time,
+        limit=999999,
+        significant_changes_only=True,
+    )
+
+    rows = (await use_case.execute(rows_query)).body["data"]
+    columns = (await use_case.execute(replace(rows_query, columnar=True))).body["data"]
+
+    assert columns["count"] == rows["count"]
+    for entity_id, entity_rows in rows["history"].items():
+        entity_columns = columns["history"][entity_id]
+        assert entity_columns["state"] == [row["state"] for row in entity_rows]
+        assert entity_columns["last_changed"] == [row["last_changed"] for row in entity_rows]
+        assert entity_columns["last_updated"] == [row["last_updated"] for row in entity_rows]
+        attributes = next(row["attributes"] for row in entity_rows if "attributes" in row)
+        assert entity_columns["attributes"] == attributes
+
+
+@pytest.mark.asyncio
+async def test_batch_history_use_case_formats_large_batches_in_executor(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Batches above the row threshold are formatted through the injected executor."""
+    monkeypatch.setattr(
+        "custom_components.smartly_bridge.application.history.HISTORY_EXECUTOR_ROW_THRESHOLD", 2
+    )
+    jobs: list[str] = []
+
+    async def executor(job, *args):
+        jobs.append(job.__name__)
+        return job(*args)
+
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    query = BatchHistoryQuery(
+        entity_ids=["sensor.temperature", "binary_sensor.door"],
+        denied_entity_ids=[],
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=2),
+        limit=999999,
+        significant_changes_only=True,
+    )
+    inline = await BatchHistoryUseCase(FakeBatchHistoryGateway()).execute(query)
+    offloaded = await BatchHistoryUseCase(FakeBatchHistoryGateway(), executor=executor).execute(
+        query
+    )
+
+    assert jobs == ["_format_body"]
+    assert offloaded.body == inline.body
+
+
+@pytest.mark.asyncio
+async def test_single_history_use_case_reuses_metadata_until_cleared(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Single history reuses cached metadata until the cache is cleared."""
+    monkeypatch.setattr("custom_components.smartly_bridge.application.history._metadata_cache", {})
+    builds: list[str] = []
+
+    class CountingMetadataBuilder(HistoryMetadataBuilder):
+        def build(self, entity_id, first_state, all_states=None, current_attributes=None):
+            builds.append(entity_id)
+            return super().build(entity_id, first_state, all_states, current_attributes)
+
+    use_case = SingleHistoryUseCase(
+        FakeHistoryGateway(), metadata_builder=CountingMetadataBuilder()
+    )
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    query = SingleHistoryQuery(
+        entity_id="sensor.temperature",
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=2),
+        significant_changes_only=True,
+        limit=999999,
+        page_size=100,
+        use_pagination=False,
+    )
+
+    first = await use_case.execute(query)
+    second = await use_case.execute(query)
+    assert builds == ["sensor.temperature"]
+    assert second.body["data"]["metadata"] == first.body["data"]["metadata"]
+
+    clear_history_metadata_cache()
+    await use_case.execute(query)
+    assert builds == ["sensor.temperature", "sensor.temperature"]
+
+
+@pytest.mark.asyncio
+async def test_single_history_metadata_is_rebuilt_when_source_turns_numeric(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A window starting at "unavailable" does not pin non-numeric metadata."""
+    monkeypatch.setattr("custom_components.smartly_bridge.application.history._metadata_cache", {})
+    gateway = FakeHistoryGateway()
+    gateway.states[0]["s"] = "unavailable"
+    use_case = SingleHistoryUseCase(gateway)
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    query = SingleHistoryQuery(
+        entity_id="sensor.temperature",
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=2),
+        significant_changes_only=True,
+        limit=999999,
+        page_size=100,
+        use_pagination=False,
+    )
+
+    first = await use_case.execute(query)
+    assert first.body["data"]["metadata"]["is_numeric"] is False
+
+    gateway.states[0]["s"] = "21.456"
+    second = await use_case.execute(query)
+
+    assert second.body["data"]["metadata"]["is_numeric"] is True
+    assert second.body["data"]["metadata"]["decimal_places"] == 1
+    assert second.body["data"]["history"][-1]["state"] == 21.5
+
+
+@pytest.mark.asyncio
+async def test_batch_history_use_case_reuses_metadata_until_unit_changes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Batch metadata is cached per entity and rebuilt when the live unit changes."""
+    monkeypatch.setattr("custom_components.smartly_bridge.application.history._metadata_cache", {})
+    builds: list[str] = []
+
+    class CountingMetadataBuilder(HistoryMetadataBuilder):
+        def build(self, entity_id, first_state, all_states=None, current_attributes=None):
+            builds.append(entity_id)
+            return super().build(entity_id, first_state, all_states, current_attributes)
+
+    gateway = FakeBatchHistoryGateway()
+    use_case = BatchHistoryUseCase(gateway, metadata_builder=CountingMetadataBuilder())
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    query = BatchHistoryQuery(
+        entity_ids=["sensor.temperature"],
+        denied_entity_ids=[],
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=2),
+        limit=999999,
+        significant_changes_only=True,
+    )
+
+    await use_case.execute(query)
+    await use_case.execute(query)
+    assert builds == ["sensor.temperature"]
+
+    gateway.current_attributes["sensor.temperature"]["unit_of_measurement"] = "°F"
+    result = await use_case.execute(query)
+
+    assert builds == ["sensor.temperature", "sensor.temperature"]
+    assert result.body["data"]["metadata"]["sensor.temperature"]["device_class"] == "temperature"
+
+
+@pytest.mark.asyncio
+async def test_batch_history_metadata_is_rebuilt_when_source_turns_numeric(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Cached batch metadata is keyed on whether the source row is numeric."""
+    monkeypatch.setattr("custom_components.smartly_bridge.application.history._metadata_cache", {})
+    gateway = FakeBatchHistoryGateway()
+    gateway.states["sensor.temperature"][0]["s"] = "unavailable"
+    use_case = BatchHistoryUseCase(gateway)
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    query = BatchHistoryQuery(
+        entity_ids=["sensor.temperature"],
+        denied_entity_ids=[],
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=2),
+        limit=999999,
+        significant_changes_only=True,
+    )
+
+    first = await use_case.execute(query)
+    assert first.body["data"]["metadata"]["sensor.temperature"]["is_numeric"] is False
+
+    gateway.states["sensor.temperature"][0]["s"] = "21.456"
+    second = await use_case.execute(query)
+
+    metadata = second.body["data"]["metadata"]["sensor.temperature"]
+    assert metadata["is_numeric"] is True
+    assert metadata["decimal_places"] == 1
+
+
+def test_format_columns_matches_transposed_rows_for_both_row_kinds() -> None:
+    """Dict-free columns equal to_columns over the bounded row layout."""
+    formatter = HistoryResponseFormatter()
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end_time = start_time + timedelta(hours=3)
+    metadata = {"is_numeric": True, "decimal_places": 1}
+    compressed = [
+        {"s": "21.46", "lc": 1767229200, "lu": 1767229200, "a": {"unit": "x"}},
+        {"s": "unavailable", "lc": 1767232800, "lu": 1767232810},
+    ]
+    state_objects = [
+        SimpleNamespace(
+            state=row["s"],
+            attributes=row.get("a", {}),
+            last_changed=datetime.fromtimestamp(row["lc"], tz=timezone.utc),
+            last_updated=datetime.fromtimestamp(row["lu"], tz=timezone.utc),
+        )
+        for row in compressed
+    ]
+
+    kwargs = {
+        "metadata": metadata,
+        "start_time": start_time,
+        "end_time": end_time,
+        "limit": 1000,
+    }
+    for entity_states in (compressed, state_objects, []):
+        rows = formatter.format_history(entity_states, **kwargs)
+        for dod_timestamps in (False, True):
+            assert formatter.format_columns(
+                entity_states, dod_timestamps=dod_timestamps, **kwargs
+            ) == formatter.to_columns(rows, dod_timestamps)
+    assert len(formatter.format_columns(compressed, **kwargs)["state"]) == 4
+
+
+def test_to_columns_encodes_timestamps_as_delta_of_delta() -> None:
+    """Delta-of-delta columns rebuild the original epoch milliseconds."""
+    formatter = HistoryResponseFormatter()
+    times = [
+        "2026-01-01T00:00:00+00:00",
+        "2026-01-01T00:00:10+00:00",
+        "2026-01-01T00:00:20+00:00",
+        "2026-01-01T00:00:35.500000+00:00",
+    ]
+    rows = [{"state": 1.0, "last_changed": value, "last_updated": value} for value in times]
+
+    columns = formatter.to_columns(rows, dod_timestamps=True)
+
+    encoded = columns["last_changed"]
+    assert encoded == {"t0": 1767225600000, "dod": [10000, 0, 5500]}
+    rebuilt = [encoded["t0"]]
+    delta = 0
+    for step in encoded["dod"]:
+        delta += step
+        rebuilt.append(rebuilt[-1] + delta)
+    assert rebuilt == [round(datetime.fromisoformat(value).timestamp() * 1000) for value in times]
+    assert columns["last_updated"] == encoded
+
+
 @pytest.mark.asyncio
 async def test_batch_history_response_matches_api_vnext_fixture() -> None:
     """Batch history full response matches the API vNext envelope contract."""
@@ -611,6 +1441,62 @@ async def test_batch_history_response_matches_api_vnext_fixture() -> None:
     assert result.body == _fixture("history-batch.json")
 
 
+@pytest.mark.asyncio
+async def test_batch_history_use_case_groups_results_by_entity() -> None:
+    """group_by_entity nests history, count, truncated and metadata per entity."""
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end_time = start_time + timedelta(hours=2)
+    query = BatchHistoryQuery(
+        entity_ids=["sensor.temperature", "binary_sensor.door"],
+        denied_entity_ids=["light.hidden"],
+        start_time=start_time,
+        end_time=end_time,
+        limit=1000,
+        significant_changes_only=True,
+    )
+    use_case = BatchHistoryUseCase(FakeBatchHistoryGateway())
+
+    by_field = (await use_case.execute(query)).body["data"]
+    result = await use_case.execute(replace(query, group_by_entity=True))
+
+    assert result.status == 200
+    _assert_vnext_only_top_level(result.body)
+    data = result.body["data"]
+    assert set(data) == {"results", "denied_entities", "start_time", "end_time"}
+    assert data["denied_entities"] == ["light.hidden"]
+    for entity_id, entry in data["results"].items():
+        assert entry["history"] == by_field["history"][entity_id]
+        assert entry["count"] == by_field["count"][entity_id]
+        assert entry["truncated"] == by_field["truncated"][entity_id]
+    temperature = data["results"]["sensor.temperature"]
+    assert temperature["metadata"] == by_field["metadata"]["sensor.temperature"]
+
+
+@pytest.mark.asyncio
+async def test_batch_history_use_case_skips_entities_without_states() -> None:
+    """Entities with no recorded rows return empty history without metadata."""
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end_time = start_time + timedelta(hours=2)
+    use_case = BatchHistoryUseCase(FakeBatchHistoryGateway())
+
+    result = await use_case.execute(
+        BatchHistoryQuery(
+            entity_ids=["sensor.temperature", "sensor.missing"],
+            denied_entity_ids=[],
+            start_time=start_time,
+            end_time=end_time,
+            limit=1000,
+            significant_changes_only=True,
+        )
+    )
+
+    data = result.body["data"]
+    assert data["history"]["sensor.missing"] == []
+    assert data["count"]["sensor.missing"] == 0
+    assert data["truncated"]["sensor.missing"] is False
+    assert "sensor.missing" not in data["metadata"]
+
+
 @pytest.mark.asyncio
 async def test_batch_history_use_case_marks_truncated_entities() -> None:
     """Batch history marks entities truncated when raw rows exceed the limit."""
@@ -676,6 +1562,27 @@ async def test_statistics_use_case_formats_recorder_statistics() -> None:
     assert result.body["errors"] == []
 
 
+@pytest.mark.asyncio
+async def test_statistics_use_case_reuses_bound_iso_strings() -> None:
+    """Repeated statistics bounds are formatted to ISO strings once."""
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    query = StatisticsQuery(
+        entity_id="sensor.energy",
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=2),
+        period="hour",
+    )
+    use_case = StatisticsUseCase(FakeStatisticsGateway())
+    _datetime_iso.cache_clear()
+
+    first = await use_case.execute(query)
+    second = await use_case.execute(query)
+
+    assert second.body["data"]["start_time"] == first.body["data"]["start_time"]
+    assert second.body["data"]["end_time"] == "2026-01-01T02:00:00+00:00"
+    assert _datetime_iso.cache_info().misses == 2
+
+
 @pytest.mark.asyncio
 async def test_statistics_response_matches_api_vnext_fixture() -> None:
     """Statistics full response matches the API vNext envelope contract."""
@@ -724,11 +1631,12 @@ async def test_single_history_use_case_counts_first_paginated_page() -> None:
 
 
 @pytest.mark.asyncio
-async def test_single_history_use_case_falls_back_when_count_fails() -> None:
-    """Count failures do not fail the first paginated page."""
+async def test_single_history_use_case_counts_without_second_query() -> None:
+    """First-page total_count comes from the fetched window, not a second recorder call."""
     start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
     end_time = start_time + timedelta(hours=2)
-    use_case = SingleHistoryUseCase(FakeHistoryGateway(fail_count=True))
+    gateway = FakeHistoryGateway()
+    use_case = SingleHistoryUseCase(gateway)
 
     result = await use_case.execute(
         SingleHistoryQuery(
@@ -745,14 +1653,20 @@ async def test_single_history_use_case_falls_back_when_count_fails() -> None:
     assert result.status == 200
     _assert_vnext_only_top_level(result.body)
     assert result.body["data"]["total_count"] == 2
+    assert gateway.calls == ["query_states"]
 
 
 @pytest.mark.asyncio
-async def test_single_history_use_case_ignores_first_state_metadata_failure() -> None:
-    """Cursor pages still return data when the metadata continuity query fails."""
+async def test_single_history_use_case_ignores_missing_first_state_metadata(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Cursor pages still return data when no metadata continuity state is found."""
+    monkeypatch.setattr(
+        "custom_components.smartly_bridge.application.history._first_state_cache", {}
+    )
     start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
     end_time = start_time + timedelta(hours=2)
-    use_case = SingleHistoryUseCase(FakeHistoryGateway(fail_first_state=True))
+    use_case = SingleHistoryUseCase(FakeHistoryGateway(missing_first_state=True))
 
     result = await use_case.execute(
         SingleHistoryQuery(
@@ -770,3 +1684,32 @@ async def test_single_history_use_case_ignores_first_state_metadata_failure() ->
     assert result.status == 200
     _assert_vnext_only_top_level(result.body)
     assert result.body["data"]["entity_id"] == "sensor.temperature"
+
+
+@pytest.mark.asyncio
+async def test_single_history_use_case_caches_first_state_across_cursor_pages(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The first cursor page fetches the metadata source with its rows; later pages reuse it."""
+    monkeypatch.setattr(
+        "custom_components.smartly_bridge.application.history._first_state_cache", {}
+    )
+    start_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    gateway = FakeHistoryGateway()
+    use_case = SingleHistoryUseCase(gateway)
+    query = SingleHistoryQuery(
+        entity_id="sensor.temperature",
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=2),
+        significant_changes_only=True,
+        limit=2,
+        page_size=2,
+        use_pagination=True,
+        cursor_data={"lc": "2026-01-01T00:00:01+00:00", "ts": "ignored"},
+    )
+
+    await use_case.execute(query)
+    result = await use_case.execute(query)
+
+    assert result.status == 200
+    assert gateway.calls == ["query_states_with_first_state", "query_states"]
@@ -8,6 +8,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from custom_components.smartly_bridge.audit import (
+    AuditLogWriter,
     log_auth_fail,
     log_control,
     log_deny,
@@ -15,6 +16,7 @@ from custom_components.smartly_bridge.audit import (
     log_push_fail,
     log_push_success,
     log_rate_limit,
+    set_audit_writer,
 )
 
 
@@ -55,6 +57,22 @@ class TestLogControl:
 
         mock_logger.info.assert_called_once()
 
+    def test_log_control_skipped_when_disabled(self, mock_logger):
+        """Test nothing is formatted or queued when INFO is filtered out."""
+        mock_logger.isEnabledFor.return_value = False
+
+        log_control(
+            mock_logger,
+            client_id="client_123",
+            entity_id="light.living_room",
+            service="light.turn_on",
+            result="success",
+            actor={"user_id": "user_1", "role": "admin"},
+        )
+
+        mock_logger.isEnabledFor.assert_called_once_with(logging.INFO)
+        mock_logger.info.assert_not_called()
+
 
 class TestLogDeny:
     """Tests for log_deny function."""
@@ -172,3 +190,52 @@ class TestLogIntegrationEvent:
         )
 
         mock_logger.info.assert_called_once()
+
+
+class TestAuditLogWriter:
+    """Tests for the background audit log writer."""
+
+    @pytest.mark.asyncio
+    async def test_records_written_by_writer(self, mock_logger):
+        """Test control/deny records are queued and flushed on stop."""
+        writer = AuditLogWriter()
+        await writer.start()
+        set_audit_writer(writer)
+        try:
+            log_control(mock_logger, "client_123", "light.x", "light.turn_on", "success")
+            log_deny(mock_logger, "client_123", "light.x", "light.turn_on", "denied")
+            mock_logger.info.assert_not_called()
+        finally:
+            set_audit_writer(None)
+            await writer.stop()
+
+        mock_logger.info.assert_called_once()
+        mock_logger.warning.assert_called_once()
+        assert "CONTROL" in mock_logger.info.call_args[0][0]
+        assert "DENY" in mock_logger.warning.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_overflow_drops_records(self, mock_logger):
+        """Test records beyond the queue bound are dropped, not blocked on."""
+        writer = AuditLogWriter(maxsize=2)
+        await writer.start()
+        set_audit_writer(writer)
+        try:
+            for _ in range(5):
+                log_control(mock_logger, "client_123", "light.x", "light.turn_on", "success")
+        finally:
+            set_audit_writer(None)
+            await writer.stop()
+
+        assert writer.dropped == 3
+        assert mock_logger.info.call_count == 2
+
+    def test_writes_directly_when_not_started(self, mock_logger):
+        """Test records bypass a writer that is not running."""
+        set_audit_writer(AuditLogWriter())
+        try:
+            log_control(mock_logger, "client_123", "light.x", "light.turn_on", "success")
+        finally:
+            set_audit_writer(None)
+
+        mock_logger.info.assert_called_once()
@@ -14,6 +14,7 @@ from custom_components.smartly_bridge.auth import (
     compute_signature,
     verify_signature,
 )
+from custom_components.smartly_bridge.utils import compile_allowed_networks
 
 
 class TestComputeSignature:
@@ -211,6 +212,16 @@ class TestCheckIp:
         assert check_ip("192.168.1.100", "192.168.1.100/32") is True
         assert check_ip("192.168.1.101", "192.168.1.100/32") is False
 
+    def test_check_ip_parses_whitelist_once(self):
+        """Test the CIDR whitelist is parsed once and reused."""
+        compile_allowed_networks.cache_clear()
+        cidrs = "10.0.0.0/8,192.168.*"
+
+        assert check_ip("10.1.2.3", cidrs) is True
+        assert check_ip("192.168.5.5", cidrs) is True
+        assert check_ip("8.8.8.8", cidrs) is False
+        assert compile_allowed_networks.cache_info().misses == 1
+
 
 class TestNonceCache:
     """Tests for NonceCache class."""
@@ -277,6 +288,18 @@ class TestRateLimiter:
         # Should be blocked
         assert await limiter.check("client1") is False
 
+    @pytest.mark.asyncio
+    async def test_rate_limiter_charges_cost(self):
+        """Test a weighted request consumes several slots or is rejected whole."""
+        limiter = RateLimiter(max_requests=5, window_seconds=60)
+
+        assert await limiter.check("client1", cost=3) is True
+        assert limiter.get_remaining("client1") == 2
+        assert await limiter.check("client1", cost=3) is False
+        assert limiter.get_remaining("client1") == 2
+        assert await limiter.check("client1", cost=2) is True
+        assert await limiter.check("client1") is False
+
     @pytest.mark.asyncio
     async def test_rate_limiter_separate_clients(self):
         """Test rate limiting is per-client."""
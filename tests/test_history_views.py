@@ -4,24 +4,33 @@ from __future__ import annotations
 
 import asyncio
 import json
-from datetime import datetime, timedelta
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from types import ModuleType
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from aiohttp import web
+from homeassistant.helpers.json import json_bytes
 
 from custom_components.smartly_bridge.adapters.home_assistant import (
     HomeAssistantHistoryGateway,
+    RecorderHistoryCache,
     _home_assistant_history_gateway,
 )
 from custom_components.smartly_bridge.application.history import (
     BatchHistoryQuery,
     SingleHistoryQuery,
+    SingleHistoryUseCase,
     StatisticsQuery,
+    _history_error_response,
 )
 from custom_components.smartly_bridge.auth import AuthResult, NonceCache, RateLimiter
 from custom_components.smartly_bridge.const import (
     DOMAIN,
+    HISTORY_EXECUTOR_ROW_THRESHOLD,
     HISTORY_MAX_ENTITIES_BATCH,
     RATE_WINDOW,
 )
@@ -29,9 +38,16 @@ from custom_components.smartly_bridge.domain.models import BridgeResponse
 from custom_components.smartly_bridge.views.history import (
     SmartlyHistoryBatchView,
     SmartlyHistoryView,
-    SmartlyStatisticsView,
+    SmartlyStatisticsViewWrapper,
+    _async_json_response,
+    _authorize_history_request,
     _format_state,
+    _history_row_count,
+    _json_response,
     _parse_datetime,
+    _parse_history_layout,
+    _stream_batch_json_response,
+    _with_encoded_metadata,
 )
 
 FIXTURE_DIR = Path(__file__).parent / "fixtures" / "api-vnext"
@@ -41,6 +57,51 @@ def _api_vnext_fixture(name: str) -> dict:
     return json.loads((FIXTURE_DIR / name).read_text())
 
 
+class FakeRecorder:
+    """Recorder instance that runs executor jobs inline and records their arguments."""
+
+    def __init__(self) -> None:
+        self.jobs: list[tuple] = []
+
+    async def async_add_executor_job(self, job, *args):
+        self.jobs.append(args)
+        return job(*args)
+
+
+class PendingRecorder:
+    """Recorder instance whose executor jobs stay pending until the test resolves them."""
+
+    def __init__(self) -> None:
+        self.jobs: list[asyncio.Future] = []
+
+    def async_add_executor_job(self, job, *args):
+        future = asyncio.get_running_loop().create_future()
+        self.jobs.append(future)
+        return future
+
+
+@contextmanager
+def _stub_recorder(recorder, get_significant_states=None, statistics_during_period=None):
+    """Expose fake recorder history/statistics modules to the lazy gateway imports."""
+    history = ModuleType("homeassistant.components.recorder.history")
+    history.get_significant_states = get_significant_states
+    statistics = ModuleType("homeassistant.components.recorder.statistics")
+    statistics.statistics_during_period = statistics_during_period
+    package = ModuleType("homeassistant.components.recorder")
+    package.history = history
+    package.statistics = statistics
+    modules = {
+        "homeassistant.components.recorder": package,
+        "homeassistant.components.recorder.history": history,
+        "homeassistant.components.recorder.statistics": statistics,
+    }
+    with (
+        patch.dict(sys.modules, modules),
+        patch("homeassistant.helpers.recorder.get_instance", create=True, return_value=recorder),
+    ):
+        yield
+
+
 class FakeRuntimeHistoryGateway:
     """History gateway used to verify setup runtime wiring."""
 
@@ -55,6 +116,7 @@ class FakeRuntimeHistoryGateway:
             },
             {"s": "11", "lc": 1767229200, "lu": 1767229200, "a": {}},
         ]
+        self.cached_window: list[dict] | None = None
 
     async def query_states(
         self,
@@ -66,6 +128,25 @@ class FakeRuntimeHistoryGateway:
         self.calls.append("query_states")
         return self.states
 
+    async def query_recent_states(
+        self,
+        entity_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        significant_changes_only: bool,
+    ) -> list[dict]:
+        self.calls.append("query_recent_states")
+        return []
+
+    def cached_states(
+        self,
+        entity_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        significant_changes_only: bool,
+    ) -> list[dict] | None:
+        return self.cached_window
+
     async def query_batch_states(
         self,
         entity_ids: list[str],
@@ -76,23 +157,15 @@ class FakeRuntimeHistoryGateway:
         self.calls.append("query_batch_states")
         return {entity_id: self.states for entity_id in entity_ids}
 
-    async def first_state_with_attributes(
-        self,
-        entity_id: str,
-        start_time: datetime,
-    ) -> dict | None:
-        self.calls.append("first_state_with_attributes")
-        return self.states[0]
-
-    async def count_states(
+    async def query_states_with_first_state(
         self,
         entity_id: str,
         start_time: datetime,
         end_time: datetime,
         significant_changes_only: bool,
-    ) -> int:
-        self.calls.append("count_states")
-        return len(self.states)
+    ) -> tuple[list[dict], dict | None]:
+        self.calls.append("query_states_with_first_state")
+        return self.states, self.states[0]
 
     def get_current_attributes(self, entity_id: str) -> dict | None:
         self.calls.append("get_current_attributes")
@@ -125,6 +198,186 @@ def test_home_assistant_history_gateway_factory_builds_runtime_gateway(mock_hass
     assert isinstance(gateway, HomeAssistantHistoryGateway)
 
 
+def test_recorder_history_cache_buckets_window_and_evicts_lru() -> None:
+    """Recorder history cache reuses bucketed windows and bounds its size."""
+    cache = RecorderHistoryCache(ttl=30, maxsize=2, bucket_seconds=5)
+    start = datetime(2026, 1, 1, 0, 0, 0)
+    end = datetime(2026, 1, 1, 1, 0, 0)
+    key = cache.key(["sensor.b", "sensor.a"], start, end, True, False)
+    cache.set(key, {"sensor.a": []})
+
+    nearby = cache.key(
+        ["sensor.a", "sensor.b"],
+        start + timedelta(seconds=2),
+        end + timedelta(seconds=2),
+        True,
+        False,
+    )
+    assert cache.get(nearby) == {"sensor.a": []}
+    assert cache.get(cache.key(["sensor.a", "sensor.b"], start, end, False, False)) is None
+
+    cache.set(("second",), {})
+    cache.set(("third",), {})
+    assert cache.get(("second",)) == {}
+    assert cache.get(key) is None
+
+
+def test_recorder_history_cache_expires_entries() -> None:
+    """Recorder history cache drops windows older than its TTL."""
+    cache = RecorderHistoryCache(ttl=30)
+    with patch(
+        "custom_components.smartly_bridge.adapters.home_assistant.time.monotonic",
+        side_effect=[100.0, 129.0, 131.0],
+    ):
+        cache.set(("window",), {"sensor.a": []})
+        assert cache.get(("window",)) == {"sensor.a": []}
+        assert cache.get(("window",)) is None
+
+
+def test_recorder_history_cache_keys_statistics_by_entity_period_and_bucket() -> None:
+    """Statistics queries share a cache entry within a bucket until cleared."""
+    cache = RecorderHistoryCache(ttl=30, bucket_seconds=5)
+    start = datetime(2026, 1, 1, 0, 0, 0)
+    end = datetime(2026, 1, 1, 6, 0, 0)
+    key = cache.statistics_key("sensor.energy", start, end, "hour")
+    cache.set(key, {"sensor.energy": [{"start": 1767225600}]})
+
+    nearby = cache.statistics_key(
+        "sensor.energy", start + timedelta(seconds=2), end + timedelta(seconds=2), "hour"
+    )
+    assert cache.get(nearby) == {"sensor.energy": [{"start": 1767225600}]}
+    assert cache.get(cache.statistics_key("sensor.energy", start, end, "day")) is None
+
+    cache.clear()
+    assert cache.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_gateway_queries_recorder_with_bucket_floored_bounds() -> None:
+    """Callers sharing a cache bucket share a result fetched for the bucket's bounds."""
+    start = datetime(2026, 1, 1, 0, 0, 2, 500000, tzinfo=timezone.utc)
+    end = start + timedelta(minutes=30)
+    recorder = FakeRecorder()
+    gateway = HomeAssistantHistoryGateway(MagicMock(), lambda: asyncio.Semaphore(1))
+
+    with _stub_recorder(recorder, lambda *args: {"sensor.a": [{"s": "1"}]}):
+        first = await gateway.query_states("sensor.a", start, end, True)
+        second = await gateway.query_states(
+            "sensor.a", start + timedelta(seconds=2), end + timedelta(seconds=1), True
+        )
+
+    assert len(recorder.jobs) == 1
+    assert recorder.jobs[0][1:3] == (
+        datetime(2026, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+        datetime(2026, 1, 1, 0, 30, 0, tzinfo=timezone.utc),
+    )
+    assert second is first
+
+
+@pytest.mark.asyncio
+async def test_gateway_cached_window_skips_tail_probe_recorder_job() -> None:
+    """A repeated multi-day poll is answered from the window cache with no recorder job."""
+    end_time = datetime(2026, 1, 4, tzinfo=timezone.utc)
+    rows = [{"s": "10", "lc": end_time.timestamp() - 3600, "lu": end_time.timestamp() - 3600}]
+    recorder = FakeRecorder()
+    gateway = HomeAssistantHistoryGateway(MagicMock(), lambda: asyncio.Semaphore(1))
+    use_case = SingleHistoryUseCase(gateway)
+    query = SingleHistoryQuery(
+        entity_id="sensor.energy",
+        start_time=end_time - timedelta(days=3),
+        end_time=end_time,
+        significant_changes_only=True,
+        limit=1000,
+        page_size=100,
+        use_pagination=False,
+    )
+
+    with _stub_recorder(recorder, lambda *args: {"sensor.energy": rows}):
+        first = await use_case.execute(query)
+        assert len(recorder.jobs) == 2
+        second = await use_case.execute(query)
+
+    assert len(recorder.jobs) == 2
+    assert second.body["data"]["history"] == first.body["data"]["history"]
+
+
+def _statistics_gateway() -> HomeAssistantHistoryGateway:
+    return HomeAssistantHistoryGateway(MagicMock(), lambda: asyncio.Semaphore(1))
+
+
+_STATISTICS_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+_STATISTICS_END = _STATISTICS_START + timedelta(hours=6)
+_STATISTICS_ROWS = {"sensor.energy": [{"start": 1767225600, "sum": 1.0}]}
+
+
+@pytest.mark.asyncio
+async def test_gateway_concurrent_statistics_queries_share_one_job() -> None:
+    """Identical statistics requests in flight await one recorder job."""
+    recorder = PendingRecorder()
+    gateway = _statistics_gateway()
+
+    with _stub_recorder(recorder, statistics_during_period=MagicMock()):
+        first = asyncio.ensure_future(
+            gateway.query_statistics("sensor.energy", _STATISTICS_START, _STATISTICS_END, "hour")
+        )
+        second = asyncio.ensure_future(
+            gateway.query_statistics("sensor.energy", _STATISTICS_START, _STATISTICS_END, "hour")
+        )
+        await asyncio.sleep(0)
+        assert len(recorder.jobs) == 1
+
+        recorder.jobs[0].set_result(_STATISTICS_ROWS)
+        assert await first == _STATISTICS_ROWS["sensor.energy"]
+        assert await second == _STATISTICS_ROWS["sensor.energy"]
+
+
+@pytest.mark.asyncio
+async def test_gateway_cancelled_statistics_waiter_leaves_shared_job_running() -> None:
+    """Cancelling one waiter does not cancel the query another request awaits."""
+    recorder = PendingRecorder()
+    gateway = _statistics_gateway()
+
+    with _stub_recorder(recorder, statistics_during_period=MagicMock()):
+        cancelled = asyncio.ensure_future(
+            gateway.query_statistics("sensor.energy", _STATISTICS_START, _STATISTICS_END, "hour")
+        )
+        waiting = asyncio.ensure_future(
+            gateway.query_statistics("sensor.energy", _STATISTICS_START, _STATISTICS_END, "hour")
+        )
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+
+        assert not recorder.jobs[0].cancelled()
+        recorder.jobs[0].set_result(_STATISTICS_ROWS)
+        assert await waiting == _STATISTICS_ROWS["sensor.energy"]
+        assert cancelled.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_gateway_statistics_query_started_before_clear_is_not_cached() -> None:
+    """A result fetched before the hourly clear is served but not written back."""
+    recorder = PendingRecorder()
+    gateway = _statistics_gateway()
+
+    with _stub_recorder(recorder, statistics_during_period=MagicMock()):
+        stale = asyncio.ensure_future(
+            gateway.query_statistics("sensor.energy", _STATISTICS_START, _STATISTICS_END, "hour")
+        )
+        await asyncio.sleep(0)
+        gateway.clear_statistics_cache()
+        recorder.jobs[0].set_result(_STATISTICS_ROWS)
+        assert await stale == _STATISTICS_ROWS["sensor.energy"]
+
+        fresh = asyncio.ensure_future(
+            gateway.query_statistics("sensor.energy", _STATISTICS_START, _STATISTICS_END, "hour")
+        )
+        await asyncio.sleep(0)
+        assert len(recorder.jobs) == 2
+        recorder.jobs[1].set_result({"sensor.energy": []})
+        assert await fresh == []
+
+
 def test_history_read_gateway_resolver_uses_runtime_gateway(mock_hass) -> None:
     """History read gateway resolver returns the setup-created runtime port."""
     from custom_components.smartly_bridge.views.history import _history_read_gateway
@@ -403,6 +656,108 @@ class TestHelperFunctions:
         assert "last_changed" in result
         assert "last_updated" in result
 
+    def test_parse_history_layout(self):
+        """Layouts parse to (columnar, dod_timestamps); dod requires columns."""
+        assert _parse_history_layout("row", "iso") == (False, False)
+        assert _parse_history_layout("column", "iso") == (True, False)
+        assert _parse_history_layout("column", "dod") == (True, True)
+        assert _parse_history_layout("row", "dod") is None
+        assert _parse_history_layout("table", "iso") is None
+        assert _parse_history_layout(["column"], "iso") is None
+
+    def test_history_row_count(self):
+        """Row count covers single, batch and error bodies."""
+        assert _history_row_count({"data": {"count": 3}}) == 3
+        assert _history_row_count({"data": {"count": {"a": 2, "b": 5}}}) == 7
+        grouped = {"data": {"results": {"a": {"count": 2}, "b": {"count": 5}}}}
+        assert _history_row_count(grouped) == 7
+        assert _history_row_count({"errors": [{"code": "history_query_failed"}]}) == 0
+
+    def test_json_response_reuses_encoded_shared_error_bodies(self):
+        """Shared rejections encode once; request context still gets its own body."""
+        result = _history_error_response("invalid_period", status=400, target="statistics.period")
+        again = _history_error_response("invalid_period", status=400, target="statistics.period")
+        assert again is result
+        plain = MagicMock(headers={})
+        traced = MagicMock(headers={"X-Request-Id": "req-1"})
+
+        first = _json_response(result.body, plain, status=result.status)
+        second = _json_response(result.body, plain, status=result.status)
+        with_context = _json_response(result.body, traced, status=result.status)
+
+        assert second.body is first.body
+        assert json.loads(first.body) == result.body
+        assert json.loads(with_context.body) == {**result.body, "request_id": "req-1"}
+
+    @pytest.mark.asyncio
+    async def test_async_json_response_encodes_large_body_in_executor(self, mock_hass):
+        """Bodies above the row threshold are encoded off the event loop."""
+        mock_hass.async_add_executor_job = AsyncMock(return_value=b'{"data":{}}')
+        request = MagicMock()
+        request.headers = {}
+        small = {"data": {"count": HISTORY_EXECUTOR_ROW_THRESHOLD}}
+        large = {"data": {"count": HISTORY_EXECUTOR_ROW_THRESHOLD + 1}}
+
+        await _async_json_response(mock_hass, small, request, status=200)
+        mock_hass.async_add_executor_job.assert_not_called()
+
+        response = await _async_json_response(mock_hass, large, request, status=200)
+        mock_hass.async_add_executor_job.assert_awaited_once()
+        assert response.body == b'{"data":{}}'
+
+    @pytest.mark.asyncio
+    async def test_stream_batch_json_response_writes_each_entity(self, mock_hass):
+        """Streamed batch bodies decode to the same envelope, one write per entity."""
+        from aiohttp.test_utils import make_mocked_request
+
+        async def run_inline(func, *args):
+            return func(*args)
+
+        mock_hass.async_add_executor_job = AsyncMock(side_effect=run_inline)
+        writer = MagicMock()
+        writer.write = AsyncMock()
+        writer.write_headers = AsyncMock()
+        writer.write_eof = AsyncMock()
+        writer.drain = AsyncMock()
+        request = make_mocked_request(
+            "POST", "/api/smartly/history/batch", headers={"X-Request-Id": "req-1"}, writer=writer
+        )
+        body = {
+            "schema_version": "1.0",
+            "data": {
+                "history": {"sensor.a": [{"state": 1.0}], "sensor.b": [{"state": "on"}]},
+                "count": {"sensor.a": 1, "sensor.b": 1},
+            },
+            "warnings": [],
+            "errors": [],
+        }
+
+        response = await _stream_batch_json_response(mock_hass, body, request, status=200)
+
+        assert response.content_type == "application/json"
+        assert mock_hass.async_add_executor_job.await_count == 2
+        streamed = b"".join(call.args[0] for call in writer.write.await_args_list)
+        assert json.loads(streamed) == {**body, "request_id": "req-1"}
+
+    def test_with_encoded_metadata_reuses_fragments_per_metadata_object(self):
+        """Batch metadata encodes once per cached object and splices into the body."""
+        metadata = {"is_numeric": True, "unit_of_measurement": "°C"}
+        grouped = {"data": {"results": {"sensor.a": {"count": 0, "metadata": metadata}}}}
+        flat = {"data": {"count": {"sensor.a": 0}, "metadata": {"sensor.a": metadata}}}
+
+        encoded_grouped = _with_encoded_metadata(grouped)
+        encoded_flat = _with_encoded_metadata(flat)
+
+        assert json.loads(json_bytes(encoded_grouped)) == grouped
+        assert json.loads(json_bytes(encoded_flat)) == flat
+        fragment = encoded_flat["data"]["metadata"]["sensor.a"]
+        assert encoded_grouped["data"]["results"]["sensor.a"]["metadata"] is fragment
+        assert grouped["data"]["results"]["sensor.a"]["metadata"] is metadata
+
+        rebuilt = {"data": {"metadata": {"sensor.a": dict(metadata, decimal_places=1)}}}
+        assert _with_encoded_metadata(rebuilt)["data"]["metadata"]["sensor.a"] is not fragment
+        assert _with_encoded_metadata({"data": {"history": {}}}) == {"data": {"history": {}}}
+
 
 class TestSmartlyHistoryView:
     """Tests for SmartlyHistoryView."""
@@ -492,19 +847,42 @@ class TestSmartlyHistoryView:
         assert data == _api_vnext_fixture("history-client-secret-not-configured.json")
 
     @pytest.mark.asyncio
-    async def test_auth_helper_client_secret_missing_returns_api_vnext_envelope(self, mock_request):
-        """Test defensive auth helper client-secret failure returns API vNext envelope."""
-        view = SmartlyHistoryView(mock_request)
+    async def test_auth_helper_client_secret_missing_returns_api_vnext_envelope(
+        self, mock_request, mock_hass
+    ):
+        """Test shared auth helper client-secret failure returns API vNext envelope."""
+        mock_hass.data[DOMAIN]["config_entry"].data = {"allowed_cidrs": ""}
 
-        auth_result, response = await view._verify_auth_and_rate_limit({"allowed_cidrs": ""})
+        response = await _authorize_history_request(
+            mock_request, mock_hass, service="history", target="history"
+        )
 
-        assert auth_result.success is False
-        assert auth_result.error == "client_secret_not_configured"
-        assert response is not None
+        assert isinstance(response, web.Response)
         assert response.status == 500
         data = json.loads(response.body)
         assert data == _api_vnext_fixture("history-client-secret-not-configured.json")
 
+    @pytest.mark.asyncio
+    async def test_auth_helper_rate_limits_anonymous_clients_as_unknown(
+        self, mock_request, mock_hass
+    ):
+        """Anonymous callers share the control view's "unknown" rate-limit bucket."""
+        rate_limiter = MagicMock()
+        rate_limiter.check = AsyncMock(return_value=True)
+        mock_hass.data[DOMAIN]["rate_limiter"] = rate_limiter
+
+        with patch(
+            "custom_components.smartly_bridge.views.history.verify_request",
+            new_callable=AsyncMock,
+            return_value=AuthResult(success=True, client_id=None),
+        ):
+            auth_result = await _authorize_history_request(
+                mock_request, mock_hass, service="history", target="history"
+            )
+
+        assert isinstance(auth_result, AuthResult)
+        rate_limiter.check.assert_awaited_once_with("unknown")
+
     @pytest.mark.asyncio
     async def test_auth_failure(self, mock_request):
         """Test authentication failure."""
@@ -999,6 +1377,27 @@ class TestSmartlyHistoryBatchView:
             data = json.loads(response.body)
             assert data["errors"][0]["code"] == "ENTITY_IDS_REQUIRED"
 
+    @pytest.mark.asyncio
+    async def test_non_string_entity_ids_rejected(self, mock_request, mock_hass):
+        """Test entity_ids entries must be strings."""
+        mock_request.json = AsyncMock(return_value={"entity_ids": ["sensor.a", {"id": 1}]})
+
+        with patch(
+            "custom_components.smartly_bridge.views.history.verify_request",
+            new_callable=AsyncMock,
+        ) as mock_verify:
+            mock_verify.return_value = AuthResult(success=True, client_id="test")
+
+            rate_limiter = mock_hass.data[DOMAIN]["rate_limiter"]
+            rate_limiter.check = AsyncMock(return_value=True)
+
+            view = SmartlyHistoryBatchView(mock_request)
+            response = await view.post()
+
+            assert response.status == 400
+            data = json.loads(response.body)
+            assert data["errors"][0]["code"] == "ENTITY_IDS_REQUIRED"
+
     @pytest.mark.asyncio
     async def test_entity_ids_required_returns_api_vnext_envelope(self, mock_request, mock_hass):
         """Test missing entity IDs returns API vNext envelope."""
@@ -1264,8 +1663,15 @@ class TestSmartlyHistoryBatchView:
                     assert data == _api_vnext_fixture("history-batch-query-failure.json")
 
 
+async def _get_statistics(request) -> web.Response:
+    """Dispatch a statistics request the way Home Assistant routes the path."""
+    return await SmartlyStatisticsViewWrapper().get(
+        request, request.match_info.get("entity_id", "")
+    )
+
+
 class TestSmartlyStatisticsView:
-    """Tests for SmartlyStatisticsView."""
+    """Tests for SmartlyStatisticsViewWrapper."""
 
     @pytest.fixture
     def mock_hass(self):
@@ -1310,8 +1716,7 @@ class TestSmartlyStatisticsView:
         """Test missing integration data returns API vNext envelope."""
         mock_hass.data = {}
 
-        view = SmartlyStatisticsView(mock_request)
-        response = await view.get()
+        response = await _get_statistics(mock_request)
 
         assert response.status == 500
         data = json.loads(response.body)
@@ -1327,8 +1732,7 @@ class TestSmartlyStatisticsView:
             "trust_proxy": "off",
         }
 
-        view = SmartlyStatisticsView(mock_request)
-        response = await view.get()
+        response = await _get_statistics(mock_request)
 
         assert response.status == 500
         data = json.loads(response.body)
@@ -1343,8 +1747,7 @@ class TestSmartlyStatisticsView:
         ) as mock_verify:
             mock_verify.return_value = AuthResult(success=False, error="invalid_signature")
 
-            view = SmartlyStatisticsView(mock_request)
-            response = await view.get()
+            response = await _get_statistics(mock_request)
 
             assert response.status == 401
             data = json.loads(response.body)
@@ -1362,8 +1765,7 @@ class TestSmartlyStatisticsView:
             rate_limiter = mock_hass.data[DOMAIN]["rate_limiter"]
             rate_limiter.check = AsyncMock(return_value=False)
 
-            view = SmartlyStatisticsView(mock_request)
-            response = await view.get()
+            response = await _get_statistics(mock_request)
 
             assert response.status == 429
             assert response.headers["Retry-After"] == "60"
@@ -1385,8 +1787,7 @@ class TestSmartlyStatisticsView:
             rate_limiter = mock_hass.data[DOMAIN]["rate_limiter"]
             rate_limiter.check = AsyncMock(return_value=True)
 
-            view = SmartlyStatisticsView(mock_request)
-            response = await view.get()
+            response = await _get_statistics(mock_request)
 
             assert response.status == 400
             data = json.loads(response.body)
@@ -1408,8 +1809,7 @@ class TestSmartlyStatisticsView:
                 "custom_components.smartly_bridge.views.history.is_entity_allowed",
                 return_value=False,
             ):
-                view = SmartlyStatisticsView(mock_request)
-                response = await view.get()
+                response = await _get_statistics(mock_request)
 
                 assert response.status == 403
                 data = json.loads(response.body)
@@ -1433,13 +1833,39 @@ class TestSmartlyStatisticsView:
                 "custom_components.smartly_bridge.views.history.is_entity_allowed",
                 return_value=True,
             ):
-                view = SmartlyStatisticsView(mock_request)
-                response = await view.get()
+                response = await _get_statistics(mock_request)
 
                 assert response.status == 400
                 data = json.loads(response.body)
                 assert data == _api_vnext_fixture("statistics-invalid-period.json")
 
+    @pytest.mark.asyncio
+    async def test_prebuilt_rejection_keeps_request_context_per_response(
+        self, mock_request, mock_hass
+    ):
+        """Shared rejection bodies never carry one request's ids into the next."""
+        mock_request.query = {"period": "invalid"}
+        mock_request.headers = {"X-Client-Id": "test_client", "X-Request-Id": "req-1"}
+
+        with (
+            patch(
+                "custom_components.smartly_bridge.views.history.verify_request",
+                new_callable=AsyncMock,
+                return_value=AuthResult(success=True, client_id="test"),
+            ),
+            patch("custom_components.smartly_bridge.views.history.er.async_get"),
+            patch(
+                "custom_components.smartly_bridge.views.history.is_entity_allowed",
+                return_value=True,
+            ),
+        ):
+            first = json.loads((await _get_statistics(mock_request)).body)
+            mock_request.headers = {"X-Client-Id": "test_client"}
+            second = json.loads((await _get_statistics(mock_request)).body)
+
+        assert first["request_id"] == "req-1"
+        assert second == _api_vnext_fixture("statistics-invalid-period.json")
+
     @pytest.mark.asyncio
     async def test_successful_statistics_query(self, mock_request, mock_hass):
         """Test successful statistics query."""
@@ -1479,8 +1905,7 @@ class TestSmartlyStatisticsView:
                     "homeassistant.helpers.recorder.get_instance",
                     return_value=mock_recorder,
                 ):
-                    view = SmartlyStatisticsView(mock_request)
-                    response = await view.get()
+                    response = await _get_statistics(mock_request)
 
                     assert response.status == 200
                     data = json.loads(response.body)
@@ -1511,7 +1936,7 @@ class TestSmartlyStatisticsView:
             mock_verify.return_value = AuthResult(success=True, client_id="test")
             mock_hass.data[DOMAIN]["rate_limiter"].check = AsyncMock(return_value=True)
 
-            response = await SmartlyStatisticsView(mock_request).get()
+            response = await _get_statistics(mock_request)
 
         assert response.status == 200
         data = json.loads(response.body)
@@ -1541,7 +1966,7 @@ class TestSmartlyStatisticsView:
             mock_verify.return_value = AuthResult(success=True, client_id="test")
             mock_hass.data[DOMAIN]["rate_limiter"].check = AsyncMock(return_value=True)
 
-            response = await SmartlyStatisticsView(mock_request).get()
+            response = await _get_statistics(mock_request)
 
         assert response.status == 500
         assert json.loads(response.body) == _api_vnext_fixture(
@@ -1573,8 +1998,7 @@ class TestSmartlyStatisticsView:
                 ) as mock_execute:
                     mock_execute.side_effect = RuntimeError("statistics recorder unavailable")
 
-                    view = SmartlyStatisticsView(mock_request)
-                    response = await view.get()
+                    response = await _get_statistics(mock_request)
 
                     assert response.status == 500
                     data = json.loads(response.body)
@@ -1762,10 +2186,9 @@ class TestCursorPagination:
             }
             mock_states.append(mock_state)
 
+        # Cursor pages may fetch rows and the metadata state in one job; run it inline.
         mock_recorder = MagicMock()
-        mock_recorder.async_add_executor_job = AsyncMock(
-            return_value={"sensor.temperature": mock_states}
-        )
+        mock_recorder.async_add_executor_job = AsyncMock(side_effect=lambda job, *args: job(*args))
 
         with patch(
             "custom_components.smartly_bridge.views.history.verify_request",
@@ -1780,9 +2203,15 @@ class TestCursorPagination:
                 "custom_components.smartly_bridge.views.history.is_entity_allowed",
                 return_value=True,
             ):
-                with patch(
-                    "homeassistant.helpers.recorder.get_instance",
-                    return_value=mock_recorder,
+                with (
+                    patch(
+                        "homeassistant.helpers.recorder.get_instance",
+                        return_value=mock_recorder,
+                    ),
+                    patch(
+                        "homeassistant.components.recorder.history.get_significant_states",
+                        return_value={"sensor.temperature": mock_states},
+                    ),
                 ):
                     view = SmartlyHistoryView(mock_request)
                     response = await view.get()
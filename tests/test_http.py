@@ -209,7 +209,7 @@ class TestControlEndpoint:
     @pytest.mark.asyncio
     async def test_control_not_configured_response_includes_vnext_error_envelope(self):
         """Control setup failures expose API vNext error envelope fields."""
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         request = MagicMock()
         request.headers = {}
@@ -218,7 +218,7 @@ class TestControlEndpoint:
         request.app = {"hass": MagicMock()}
         request.app["hass"].data = {}
 
-        response = await SmartlyControlView(request).post()
+        response = await SmartlyControlViewWrapper().post(request)
 
         assert response.status == 500
         assert_control_error_body(
@@ -231,7 +231,7 @@ class TestControlEndpoint:
     async def test_control_missing_headers(self):
         """Test control endpoint rejects request without auth headers."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         # Create mock request without headers
         request = MagicMock()
@@ -256,8 +256,8 @@ class TestControlEndpoint:
             }
         }
 
-        view = SmartlyControlView(request)
-        response = await view.post()
+        view = SmartlyControlViewWrapper()
+        response = await view.post(request)
 
         assert response.status == 401
 
@@ -268,7 +268,7 @@ class TestControlEndpoint:
         import uuid
 
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         # Create mock request with invalid signature
         request = MagicMock()
@@ -301,8 +301,8 @@ class TestControlEndpoint:
             }
         }
 
-        view = SmartlyControlView(request)
-        response = await view.post()
+        view = SmartlyControlViewWrapper()
+        response = await view.post(request)
 
         assert response.status == 401
 
@@ -310,7 +310,7 @@ class TestControlEndpoint:
     async def test_control_auth_failure_response_includes_vnext_error_envelope(self):
         """Control auth failures expose API vNext error envelope fields."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         request = MagicMock()
         request.headers = {
@@ -345,7 +345,7 @@ class TestControlEndpoint:
                 error="invalid_signature",
             )
 
-            response = await SmartlyControlView(request).post()
+            response = await SmartlyControlViewWrapper().post(request)
 
         assert response.status == 401
         assert_control_error_body(
@@ -358,7 +358,7 @@ class TestControlEndpoint:
     async def test_control_rate_limited(self):
         """Test control endpoint enforces rate limiting."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         # Create rate limiter that's exhausted
         rate_limiter = RateLimiter(max_requests=0, window_seconds=60)
@@ -398,8 +398,8 @@ class TestControlEndpoint:
         with patch("custom_components.smartly_bridge.views.control.verify_request") as mock_verify:
             mock_verify.return_value = MagicMock(success=True, client_id="test_client")
 
-            view = SmartlyControlView(request)
-            response = await view.post()
+            view = SmartlyControlViewWrapper()
+            response = await view.post(request)
 
         assert response.status == 429
         assert response.headers["Retry-After"] == "60"
@@ -864,7 +864,7 @@ class TestControlEndpointFullFlow:
         """Test control endpoint with invalid JSON."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
         from custom_components.smartly_bridge.const import DOMAIN
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         nonce_cache = NonceCache()
         await nonce_cache.start()
@@ -908,8 +908,8 @@ class TestControlEndpointFullFlow:
         with patch("custom_components.smartly_bridge.views.control.verify_request") as mock_verify:
             mock_verify.return_value = MagicMock(success=True, client_id="test_client", error=None)
 
-            view = SmartlyControlView(mock_request)
-            response = await view.post()
+            view = SmartlyControlViewWrapper()
+            response = await view.post(mock_request)
 
             assert response.status == 400
             body = json.loads(response.text)
@@ -922,7 +922,7 @@ class TestControlEndpointFullFlow:
         """Test control endpoint with missing entity_id."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
         from custom_components.smartly_bridge.const import DOMAIN
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         nonce_cache = NonceCache()
         await nonce_cache.start()
@@ -968,8 +968,8 @@ class TestControlEndpointFullFlow:
         with patch("custom_components.smartly_bridge.views.control.verify_request") as mock_verify:
             mock_verify.return_value = MagicMock(success=True, client_id="test_client", error=None)
 
-            view = SmartlyControlView(mock_request)
-            response = await view.post()
+            view = SmartlyControlViewWrapper()
+            response = await view.post(mock_request)
 
             assert response.status == 400
             body = json.loads(response.text)
@@ -986,7 +986,7 @@ class TestControlEndpointFullFlow:
         """Entity/action control bodies are no longer accepted by Phase 6."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
         from custom_components.smartly_bridge.const import DOMAIN
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         mock_hass.data[DOMAIN] = {
             "config_entry": mock_config_entry,
@@ -1012,7 +1012,7 @@ class TestControlEndpointFullFlow:
         with patch("custom_components.smartly_bridge.views.control.verify_request") as mock_verify:
             mock_verify.return_value = MagicMock(success=True, client_id="test_client", error=None)
 
-            response = await SmartlyControlView(mock_request).post()
+            response = await SmartlyControlViewWrapper().post(mock_request)
 
         assert response.status == 400
         assert_control_error_body(
@@ -1029,7 +1029,7 @@ class TestControlEndpointFullFlow:
         """Entity/action bodies are rejected before runtime use-case lookup."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
         from custom_components.smartly_bridge.const import DOMAIN
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         mock_hass.data[DOMAIN] = {
             "config_entry": mock_config_entry,
@@ -1054,7 +1054,7 @@ class TestControlEndpointFullFlow:
         with patch("custom_components.smartly_bridge.views.control.verify_request") as mock_verify:
             mock_verify.return_value = MagicMock(success=True, client_id="test_client", error=None)
 
-            response = await SmartlyControlView(mock_request).post()
+            response = await SmartlyControlViewWrapper().post(mock_request)
 
         assert response.status == 400
         assert_control_error_body(
@@ -1071,7 +1071,7 @@ class TestControlEndpointFullFlow:
         """Control responses echo optional request correlation headers."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
         from custom_components.smartly_bridge.const import DOMAIN
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         executor = FakeSmartlyCommandExecutor()
         mock_hass.data[DOMAIN] = {
@@ -1104,7 +1104,7 @@ class TestControlEndpointFullFlow:
         with patch("custom_components.smartly_bridge.views.control.verify_request") as mock_verify:
             mock_verify.return_value = MagicMock(success=True, client_id="test_client", error=None)
 
-            response = await SmartlyControlView(mock_request).post()
+            response = await SmartlyControlViewWrapper().post(mock_request)
 
         assert response.status == 200
         payload = json.loads(response.body)
@@ -1120,7 +1120,7 @@ class TestControlEndpointFullFlow:
         """API vNext command path executes through setup-created runtime adapters."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
         from custom_components.smartly_bridge.const import DOMAIN
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         executor = FakeSmartlyCommandExecutor()
         mock_hass.data[DOMAIN] = {
@@ -1150,7 +1150,7 @@ class TestControlEndpointFullFlow:
         with patch("custom_components.smartly_bridge.views.control.verify_request") as mock_verify:
             mock_verify.return_value = MagicMock(success=True, client_id="test_client", error=None)
 
-            response = await SmartlyControlView(mock_request).post()
+            response = await SmartlyControlViewWrapper().post(mock_request)
 
         assert response.status == 200
         payload = json.loads(response.body)
@@ -1175,7 +1175,7 @@ class TestControlEndpointFullFlow:
         """API vNext command path fails when setup did not create the executor."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
         from custom_components.smartly_bridge.const import DOMAIN
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         mock_hass.data[DOMAIN] = {
             "config_entry": mock_config_entry,
@@ -1202,7 +1202,7 @@ class TestControlEndpointFullFlow:
         with patch("custom_components.smartly_bridge.views.control.verify_request") as mock_verify:
             mock_verify.return_value = MagicMock(success=True, client_id="test_client", error=None)
 
-            response = await SmartlyControlView(mock_request).post()
+            response = await SmartlyControlViewWrapper().post(mock_request)
 
         assert response.status == 500
         assert_control_error_body(
@@ -1219,7 +1219,7 @@ class TestControlEndpointFullFlow:
         """API vNext commands resolve logical devices before calling Home Assistant."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
         from custom_components.smartly_bridge.const import DOMAIN
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         nonce_cache = NonceCache()
         await nonce_cache.start()
@@ -1276,7 +1276,7 @@ class TestControlEndpointFullFlow:
                     success=True, client_id="test_client", error=None
                 )
 
-                response = await SmartlyControlView(mock_request).post()
+                response = await SmartlyControlViewWrapper().post(mock_request)
 
         assert response.status == 200
         assert json.loads(response.body) == _api_vnext_fixture(
@@ -1298,7 +1298,7 @@ class TestControlEndpointFullFlow:
         """Canonical button press commands resolve and call Home Assistant button.press."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
         from custom_components.smartly_bridge.const import DOMAIN
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         nonce_cache = NonceCache()
         await nonce_cache.start()
@@ -1355,7 +1355,7 @@ class TestControlEndpointFullFlow:
                     success=True, client_id="test_client", error=None
                 )
 
-                response = await SmartlyControlView(mock_request).post()
+                response = await SmartlyControlViewWrapper().post(mock_request)
 
         assert response.status == 200
         assert json.loads(response.body) == _api_vnext_fixture(
@@ -1378,7 +1378,7 @@ class TestControlEndpointFullFlow:
         """API vNext numeric settings resolve regular and helper number siblings."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
         from custom_components.smartly_bridge.const import DOMAIN
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         nonce_cache = NonceCache()
         await nonce_cache.start()
@@ -1464,7 +1464,7 @@ class TestControlEndpointFullFlow:
                     success=True, client_id="test_client", error=None
                 )
 
-                response = await SmartlyControlView(mock_request).post()
+                response = await SmartlyControlViewWrapper().post(mock_request)
 
         assert response.status == 200
         payload = json.loads(response.body)
@@ -1486,7 +1486,7 @@ class TestControlEndpointFullFlow:
         """API vNext numeric setting keys select the matching sibling number."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
         from custom_components.smartly_bridge.const import DOMAIN
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         nonce_cache = NonceCache()
         await nonce_cache.start()
@@ -1587,7 +1587,7 @@ class TestControlEndpointFullFlow:
                     success=True, client_id="test_client", error=None
                 )
 
-                response = await SmartlyControlView(mock_request).post()
+                response = await SmartlyControlViewWrapper().post(mock_request)
 
         assert response.status == 200
         payload = json.loads(response.body)
@@ -1610,7 +1610,7 @@ class TestControlEndpointFullFlow:
         """API vNext option settings resolve regular and helper select siblings."""
         from custom_components.smartly_bridge.auth import NonceCache, RateLimiter
         from custom_components.smartly_bridge.const import DOMAIN
-        from custom_components.smartly_bridge.views.control import SmartlyControlView
+        from custom_components.smartly_bridge.views.control import SmartlyControlViewWrapper
 
         nonce_cache = NonceCache()
         await nonce_cache.start()
@@ -1693,7 +1693,7 @@ class TestControlEndpointFullFlow:
                     success=True, client_id="test_client", error=None
                 )
 
-                response = await SmartlyControlView(mock_request).post()
+                response = await SmartlyControlViewWrapper().post(mock_request)
 
         assert response.status == 200
         payload = json.loads(response.body)
@@ -1910,6 +1910,21 @@ class TestFormatNumericAttributes:
         assert result["signal_strength"] == -58
         assert result["signal_unit"] == "dBm"
 
+    def test_read_only_mapping_is_not_mutated(self):
+        """Test read-only attribute mappings are formatted without being changed."""
+        from types import MappingProxyType
+
+        from custom_components.smartly_bridge.utils import format_numeric_attributes
+
+        attrs = {"rssi": -58, "voltage": 220.123456, "unit_of_measurement": "V"}
+
+        result = format_numeric_attributes(MappingProxyType(attrs))
+
+        assert result["signal_strength"] == -58
+        assert result["signal_unit"] == "dBm"
+        assert result["voltage"] == 220.12
+        assert attrs == {"rssi": -58, "voltage": 220.123456, "unit_of_measurement": "V"}
+
     def test_air_quality_sensors(self):
         """Test air quality sensor formatting."""
         from custom_components.smartly_bridge.utils import format_numeric_attributes
@@ -410,6 +410,22 @@ class TestStatePushManager:
         assert points[0] == {"at": "2026-06-26T04:00:00+00:00", "value": 24.0}
         assert points[-1] == {"at": "2026-06-26T06:00:00+00:00", "value": 30.0}
 
+    def test_bridge_chart_fallback_dedupes_equivalent_timestamps(self):
+        """A "Z" fallback timestamp matches the same instant from history."""
+        base_time = datetime(2026, 6, 26, 4, 0, 0, tzinfo=timezone.utc)
+        states = [{"s": "24.0", "lu": int(base_time.timestamp())}]
+
+        result = build_bridge_chart_from_states(
+            states,
+            "temperature",
+            "°C",
+            fallback_state="24.0",
+            fallback_timestamp="2026-06-26T04:00:00Z",
+        )
+
+        assert result is not None
+        assert result["points"] == [{"at": "2026-06-26T04:00:00+00:00", "value": 24.0}]
+
     @pytest.mark.asyncio
     async def test_stop_flushes_events(self, push_manager):
         """Test that stop flushes pending events."""